@@ -0,0 +1,209 @@
+"""
+Бенчмарк конвеєра кліків ClickerEngine на NullBackend.
+
+Працює без дисплея (жодного реального кліку). Для кожної пари CPS/рандомність
+вимірює досягнутий CPS, перцентилі інтервалів, дрейф, CPU, затримки старту
+та зупинки і вартість кліку. Результати зберігаються в JSON для порівняння
+між версіями.
+
+З --virtual той самий run() двигуна виконується у віртуальному часі
+(src/simulation.py): інтервали там ідеальні, тож прогін міряє чисту
+вартість циклу двигуна (cpu_per_click_us) без шуму ОС і без сну.
+
+Запуск:
+    python -m benchmarks.bench_engine --duration 5 --cps 10 100 200
+    python -m benchmarks.bench_engine --virtual --duration 600
+    python -m benchmarks.bench_engine --compare benchmarks/results/old.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from src.engine import ClickerEngine, NullBackend
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+DEFAULT_CPS_LIST = [10.0, 50.0, 100.0, 200.0]
+DEFAULT_RANDOMNESS_LIST = [0.0, 20.0]
+DEFAULT_DURATION = 3.0
+
+
+def percentile(sorted_values, pct):
+    """Перцентиль (найближчий ранг) з уже відсортованого списку"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_case(cps, randomness, duration, engine_factory=None):
+    """
+    Один прогін: старт, клікання duration секунд, стоп.
+
+    Args:
+        engine_factory: fn(backend) -> ClickerEngine (для порівняння налаштувань)
+
+    Returns:
+        dict: виміряні метрики
+    """
+    backend = NullBackend()
+    engine = engine_factory(backend) if engine_factory else ClickerEngine(backend)
+    engine.update_settings("target_cps", cps)
+    engine.update_settings("randomness_pct", randomness)
+    engine.start()
+    time.sleep(0.05)
+
+    cpu_start = time.process_time()
+    start_ns = time.perf_counter_ns()
+    engine.start_clicking()
+    time.sleep(duration)
+    engine.stop_clicking()
+    stop_ns = time.perf_counter_ns()
+    cpu = time.process_time() - cpu_start
+    stats = engine.get_stats()
+
+    exit_start = time.perf_counter_ns()
+    engine.stop_engine()
+    engine.join()
+    exit_ns = time.perf_counter_ns() - exit_start
+
+    return summarize(backend, stats, cps, randomness, duration, start_ns, stop_ns, cpu, exit_ns)
+
+
+def run_virtual_case(cps, randomness, duration):
+    """
+    Той самий прогін у віртуальному часі: duration секунд симуляції
+    без сну. CPU - реальний час процесу на весь прогін.
+    """
+    from src.simulation import Simulation
+
+    sim = Simulation({"target_cps": cps, "randomness_pct": randomness})
+    stop_ns = sim.ns(duration)
+    sim.at(0, sim.engine.start_clicking)
+    sim.at(duration, sim.engine.stop_clicking)
+    stats = {}
+    sim.at(duration, lambda: stats.update(sim.engine.get_stats()))
+
+    cpu_start = time.process_time()
+    sim.run(duration)
+    cpu = time.process_time() - cpu_start
+    return summarize(sim.backend, stats, cps, randomness, duration, 0, stop_ns, cpu, 0)
+
+
+def summarize(backend, stats, cps, randomness, duration, start_ns, stop_ns, cpu, exit_ns):
+    """Метрики прогону з записаних NullBackend кліків (спільні для обох режимів)"""
+    stamps = [t for t, _ in backend.clicks]
+    clicks = len(stamps)
+    intervals = sorted((b - a) / 1e6 for a, b in zip(stamps, stamps[1:]))
+    span_ns = stamps[-1] - stamps[0] if clicks > 1 else 0
+    late_clicks = sum(1 for t in stamps if t > stop_ns)
+
+    return {
+        "target_cps": cps,
+        "randomness_pct": randomness,
+        "duration_s": duration,
+        "clicks": clicks,
+        "achieved_cps": (clicks - 1) * 1e9 / span_ns if span_ns else 0.0,
+        "interval_p50_ms": percentile(intervals, 50),
+        "interval_p99_ms": percentile(intervals, 99),
+        "interval_max_ms": intervals[-1] if intervals else 0.0,
+        "drift_ms": (span_ns / 1e6) - (clicks - 1) * 1000.0 / cps if clicks > 1 else 0.0,
+        "jitter_ms": stats["jitter_ms"],
+        "cpu_pct": 100.0 * cpu / (duration or 1.0),
+        "cpu_per_click_us": cpu * 1e6 / clicks if clicks else 0.0,
+        "start_latency_ms": (stamps[0] - start_ns) / 1e6 if clicks else None,
+        "clicks_after_stop": late_clicks,
+        "exit_latency_ms": exit_ns / 1e6,
+        "backend_cost_us": backend.cost_ns / 1e3,
+    }
+
+
+def run_suite(cps_list, randomness_list, duration, engine_factory=None, virtual=False):
+    """Прогін усіх комбінацій CPS/рандомності"""
+    results = []
+    for cps in cps_list:
+        for randomness in randomness_list:
+            if virtual:
+                result = run_virtual_case(cps, randomness, duration)
+            else:
+                result = run_case(cps, randomness, duration, engine_factory)
+            results.append(result)
+            print(format_result(result))
+    return results
+
+
+def format_result(r):
+    """Короткий рядок для консолі"""
+    return (
+        f"[Bench] {r['target_cps']:7.1f} CPS ±{r['randomness_pct']:4.0f}% -> "
+        f"{r['achieved_cps']:7.2f} CPS | p50 {r['interval_p50_ms']:.3f} ms "
+        f"p99 {r['interval_p99_ms']:.3f} ms max {r['interval_max_ms']:.3f} ms | "
+        f"drift {r['drift_ms']:+.2f} ms | CPU {r['cpu_pct']:.1f}% | "
+        f"start {r['start_latency_ms'] or 0:.3f} ms"
+    )
+
+
+def metadata():
+    """Оточення прогону (для чесного порівняння між машинами)"""
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def save_results(results, path=None, name="engine"):
+    """Зберігає результати в JSON, повертає шлях до файлу"""
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": metadata(), "results": results}, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def compare(results, baseline_path):
+    """Друкує різницю ключових метрик відносно попереднього JSON"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    index = {(r["target_cps"], r["randomness_pct"]): r for r in baseline}
+    for r in results:
+        old = index.get((r["target_cps"], r["randomness_pct"]))
+        if old is None:
+            continue
+        print(
+            f"[Bench] {r['target_cps']:7.1f} CPS ±{r['randomness_pct']:4.0f}%: "
+            f"achieved {r['achieved_cps'] - old['achieved_cps']:+.2f} CPS, "
+            f"p99 {r['interval_p99_ms'] - old['interval_p99_ms']:+.3f} ms, "
+            f"CPU {r['cpu_pct'] - old['cpu_pct']:+.1f}%"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк ClickerEngine (NullBackend)")
+    parser.add_argument("--cps", type=float, nargs="+", default=DEFAULT_CPS_LIST)
+    parser.add_argument("--randomness", type=float, nargs="+", default=DEFAULT_RANDOMNESS_LIST)
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION,
+                        help="тривалість кожного прогону (секунди)")
+    parser.add_argument("--output", help="шлях до JSON (за замовчуванням benchmarks/results/)")
+    parser.add_argument("--compare", help="JSON попереднього прогону для порівняння")
+    parser.add_argument("--virtual", action="store_true",
+                        help="віртуальний час (src.simulation): лише вартість циклу двигуна")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.cps, args.randomness, args.duration, virtual=args.virtual)
+    path = save_results(results, args.output, name="engine-virtual" if args.virtual else "engine")
+    print(f"[Bench] Результати збережено: {path}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Бенчмарк налаштувань потоку кліків (src/realtime.py): вплив кожної опції
+на p99 та максимум інтервалів між кліками.
+
+Кожна опція проганяється через той самий run_case, що й bench_engine
+(NullBackend, без дисплея), і порівнюється з прогоном без опцій. Фонове
+навантаження (--load) - потоки, що плодять циклічне сміття: вони
+змагаються за GIL і змушують GC запускатися посеред серії.
+Опції, які не вдалося застосувати (права, платформа), позначаються.
+
+Запуск:
+    python -m benchmarks.bench_realtime
+    python -m benchmarks.bench_realtime --cps 200 500 --duration 5 --load 2
+    sudo python -m benchmarks.bench_realtime --options baseline fifo all
+"""
+import argparse
+import os
+import sys
+import threading
+
+from benchmarks.bench_engine import run_case, save_results
+from src.config import REALTIME_FIFO_PRIORITY, REALTIME_TIMER_SLACK_NS
+from src.engine import ClickerEngine
+from src.realtime import RealtimeOptions
+
+DEFAULT_CPS_LIST = [200.0]
+DEFAULT_DURATION = 3.0
+DEFAULT_LOAD = 1
+
+
+def _last_cpu():
+    if hasattr(os, "sched_getaffinity"):
+        return max(os.sched_getaffinity(0))
+    return (os.cpu_count() or 1) - 1
+
+
+# Назва -> фабрика RealtimeOptions (None - прогін без опцій)
+OPTIONS = {
+    "baseline": lambda: None,
+    "affinity": lambda: RealtimeOptions(cpus=[_last_cpu()]),
+    "fifo": lambda: RealtimeOptions(fifo_priority=REALTIME_FIFO_PRIORITY),
+    "nice": lambda: RealtimeOptions(nice=-10),
+    "timer_slack": lambda: RealtimeOptions(timer_slack_ns=REALTIME_TIMER_SLACK_NS),
+    "gc_freeze": lambda: RealtimeOptions(gc="freeze"),
+    "gc_disable": lambda: RealtimeOptions(gc="disable"),
+    "all": lambda: RealtimeOptions(
+        cpus=[_last_cpu()], fifo_priority=REALTIME_FIFO_PRIORITY,
+        timer_slack_ns=REALTIME_TIMER_SLACK_NS, gc="disable",
+    ),
+}
+
+
+class GarbageLoad:
+    """Фонові потоки, що створюють циклічне сміття (тиск на GC та GIL)"""
+    def __init__(self, threads):
+        self._stop = threading.Event()
+        self._threads = [threading.Thread(target=self._churn, daemon=True) for _ in range(threads)]
+
+    def _churn(self):
+        while not self._stop.is_set():
+            for _ in range(1000):
+                node = {"data": [0] * 16}
+                node["self"] = node
+
+    def __enter__(self):
+        for t in self._threads:
+            t.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        for t in self._threads:
+            t.join()
+
+
+def run_option(name, cps, duration, load):
+    """Один прогін з опцією name під навантаженням load потоків"""
+    options = OPTIONS[name]()
+    engines = []
+
+    def factory(backend):
+        engine = ClickerEngine(backend, realtime=options)
+        engines.append(engine)
+        return engine
+
+    with GarbageLoad(load):
+        result = run_case(cps, 0.0, duration, factory)
+
+    status = engines[0].realtime_status
+    result["option"] = name
+    result["load_threads"] = load
+    result["realtime"] = options.as_dict() if options is not None else None
+    result["not_applied"] = {k: v for k, v in status.items() if v != "ok"}
+    return result
+
+
+def run_suite(option_names, cps_list, duration, load):
+    results = []
+    for cps in cps_list:
+        baseline = None
+        for name in option_names:
+            r = run_option(name, cps, duration, load)
+            if name == "baseline":
+                baseline = r
+            results.append(r)
+            print(format_result(r, baseline))
+    return results
+
+
+def format_result(r, baseline=None):
+    line = (
+        f"[Bench] {r['target_cps']:7.1f} CPS {r['option']:12s} "
+        f"p99 {r['interval_p99_ms']:7.3f} ms max {r['interval_max_ms']:7.3f} ms "
+        f"jitter {r['jitter_ms']:.3f} ms"
+    )
+    if baseline is not None and r is not baseline:
+        line += (
+            f" | p99 {r['interval_p99_ms'] - baseline['interval_p99_ms']:+.3f} ms"
+            f" max {r['interval_max_ms'] - baseline['interval_max_ms']:+.3f} ms"
+        )
+    if r["not_applied"]:
+        line += f" | не застосовано: {', '.join(r['not_applied'])}"
+    return line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк налаштувань потоку кліків")
+    parser.add_argument("--options", nargs="+", choices=list(OPTIONS), default=list(OPTIONS),
+                        help="які опції проганяти (baseline - для порівняння)")
+    parser.add_argument("--cps", type=float, nargs="+", default=DEFAULT_CPS_LIST)
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION,
+                        help="тривалість кожного прогону (секунди)")
+    parser.add_argument("--load", type=int, default=DEFAULT_LOAD,
+                        help="фонових потоків зі сміттям (0 - без навантаження)")
+    parser.add_argument("--output", help="шлях до JSON (за замовчуванням benchmarks/results/)")
+    args = parser.parse_args(argv)
+
+    names = args.options
+    if "baseline" in names:
+        names = ["baseline"] + [n for n in names if n != "baseline"]
+
+    results = run_suite(names, args.cps, args.duration, args.load)
+    path = save_results(results, args.output, name="realtime")
+    print(f"[Bench] Результати збережено: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Бенчмарк холодного старту: час імпорту точок входу (python -X importtime)
+та час до появи вікна GUI.
+
+Крім часу, перевіряє лінивість імпортів: headless-шлях (src.cli, src.engine,
+AutoClicker) не повинен тягнути Tk, pynput чи pyautogui, а src.ui - pynput
+та pyautogui (вони вантажаться на першому кадрі, після показу вікна).
+Перевищення бюджету чи зайвий важкий модуль - ненульовий код виходу.
+
+Запуск:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --runs 10 --budget-ms 150
+    python -m benchmarks.bench_startup --no-window
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+from benchmarks.bench_engine import percentile, save_results
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("tkinter", "customtkinter", "pynput", "pyautogui", "PIL", "numpy")
+
+# Точка входу -> важкі модулі, яких при її імпорті бути не повинно
+ENTRY_POINTS = {
+    "src.cli": HEAVY_MODULES,
+    "src.engine": HEAVY_MODULES,
+    "AutoClicker": HEAVY_MODULES,
+    "src.ui": ("pynput", "pyautogui", "numpy"),
+}
+
+DEFAULT_RUNS = 5
+DEFAULT_IMPORT_BUDGET_MS = 100.0
+DEFAULT_WINDOW_BUDGET_MS = 1000.0
+
+WINDOW_SCRIPT = """
+import time
+t0 = time.perf_counter()
+from src.ui import AutoClickerApp
+app = AutoClickerApp()
+app.update()
+print((time.perf_counter() - t0) * 1e3)
+app.on_closing()
+"""
+
+
+def parse_importtime(stderr):
+    """Рядки 'import time: self | cumulative | module' -> {модуль: cumulative мкс}"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def measure_import(module):
+    """Один холодний імпорт у свіжому інтерпретаторі: (мс, {модуль: мкс})"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    modules = parse_importtime(proc.stderr)
+    return modules.get(module, 0) / 1e3, modules
+
+
+def measure_window():
+    """Час від старту скрипта до показаного вікна (мс) або None без дисплея/GUI"""
+    proc = subprocess.run(
+        [sys.executable, "-c", WINDOW_SCRIPT], cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        return None
+    return float(proc.stdout.strip().splitlines()[-1])
+
+
+def run_suite(runs, window=True):
+    results = []
+    for module, forbidden in ENTRY_POINTS.items():
+        times = []
+        loaded = set()
+        try:
+            for _ in range(runs):
+                ms, modules = measure_import(module)
+                times.append(ms)
+                loaded.update(m for m in forbidden if m in modules)
+        except RuntimeError as e:
+            print(f"[Bench] {module}: пропущено ({e})")
+            continue
+
+        times.sort()
+        slowest = sorted(modules.items(), key=lambda kv: kv[1], reverse=True)[1:6]
+        results.append({
+            "entry": module,
+            "import_p50_ms": percentile(times, 50),
+            "import_max_ms": times[-1],
+            "heavy_loaded": sorted(loaded),
+            "slowest": [[name, us / 1e3] for name, us in slowest],
+        })
+
+    if window:
+        times = [t for t in (measure_window() for _ in range(runs)) if t is not None]
+        if times:
+            times.sort()
+            results.append({
+                "entry": "window",
+                "import_p50_ms": percentile(times, 50),
+                "import_max_ms": times[-1],
+                "heavy_loaded": [],
+                "slowest": [],
+            })
+        else:
+            print("[Bench] window: пропущено (немає дисплея або customtkinter)")
+    return results
+
+
+def check(results, import_budget_ms, window_budget_ms):
+    """Друкує результати, повертає кількість порушень"""
+    failures = 0
+    for r in results:
+        budget = window_budget_ms if r["entry"] == "window" else import_budget_ms
+        ok = r["import_p50_ms"] <= budget and not r["heavy_loaded"]
+        failures += not ok
+        print(
+            f"[Bench] {r['entry']:12s} p50 {r['import_p50_ms']:7.1f} ms "
+            f"max {r['import_max_ms']:7.1f} ms (бюджет {budget:.0f} ms) "
+            f"{'OK' if ok else 'FAIL'}"
+            + (f" | важкі модулі: {', '.join(r['heavy_loaded'])}" if r["heavy_loaded"] else "")
+        )
+        for name, ms in r["slowest"]:
+            print(f"[Bench]     {name:30s} {ms:7.1f} ms")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк холодного старту")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_IMPORT_BUDGET_MS,
+                        help="бюджет імпорту кожної точки входу (p50)")
+    parser.add_argument("--window-budget-ms", type=float, default=DEFAULT_WINDOW_BUDGET_MS,
+                        help="бюджет часу до появи вікна (p50)")
+    parser.add_argument("--no-window", action="store_true", help="не вимірювати вікно GUI")
+    parser.add_argument("--output", help="шлях до JSON (за замовчуванням benchmarks/results/)")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.runs, window=not args.no_window)
+    failures = check(results, args.budget_ms, args.window_budget_ms)
+    path = save_results(results, args.output, name="startup")
+    print(f"[Bench] Результати збережено: {path}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
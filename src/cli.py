@@ -0,0 +1,435 @@
+"""
+Headless CLI / демон: двигун без GUI.
+
+customtkinter, pynput та pyautogui не імпортуються, доки їх не попросять:
+GUI - лише з --gui, бібліотеки кліків - лише обраним бекендом.
+
+Приклади:
+    python -m src --cps 50 --randomness 10 --duration 5
+    python -m src --profile my.json
+    python -m src --use-profile fast
+    python -m src --backend null --cps 200 --duration 2
+    python -m src --cps 200 --count 1000
+    python -m src --start-at 12:30 --duration 10
+    python -m src --trigger 100,200=ff0000 --cps 20
+    python -m src --cps 200 --cpus 3 --fifo --timer-slack --gc freeze
+    python -m src --cps 20 --log-format text --log-level engine=DEBUG
+    python -m src --jobs jobs.json --control
+    python -m src --record-macro m.acm --duration 10
+    python -m src --play-macro m.acm --macro-loops 3 --backend xtest
+    python -m src --gui
+"""
+import time
+
+_T0 = time.perf_counter()
+
+import argparse  # noqa: E402
+import signal  # noqa: E402
+import threading  # noqa: E402
+
+from src.config import (  # noqa: E402
+    VALID_BACKENDS, VALID_BUTTONS, VALID_DISTRIBUTIONS, VALID_GC_MODES,
+    REALTIME_FIFO_PRIORITY, REALTIME_TIMER_SLACK_NS, LOG_FORMAT, LOG_FORMATS
+)
+from src.log import configure_logging, get_logger, parse_level_specs  # noqa: E402
+from src.settings import load_settings_file, validate_setting  # noqa: E402
+
+log = get_logger("cli")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src", description="Pro AutoClicker (headless)")
+    parser.add_argument("--gui", action="store_true", help="запустити графічний інтерфейс")
+    parser.add_argument("--cps", type=float, help="цільова швидкість (кліків/сек)")
+    parser.add_argument("--randomness", type=float, help="рандомність, %%")
+    parser.add_argument("--button", choices=VALID_BUTTONS)
+    parser.add_argument("--distribution", choices=VALID_DISTRIBUTIONS)
+    parser.add_argument("--backend", choices=VALID_BACKENDS, default="auto")
+    parser.add_argument("--seed", type=int, help="сід для відтворюваних затримок")
+    parser.add_argument("--profile", help="JSON-файл з налаштуваннями двигуна")
+    parser.add_argument("--use-profile", metavar="NAME", help="збережений профіль за назвою")
+    parser.add_argument("--profiles", metavar="PATH", help="файл профілів (за замовчуванням ~/.autoclicker_profiles.json)")
+    parser.add_argument("--duration", type=float, default=0.0,
+                        help="тривалість клікання у секундах (0 - до Ctrl+C / SIGTERM)")
+    parser.add_argument("--count", type=int, help="рівно стільки кліків, потім вихід")
+    parser.add_argument("--start-at", metavar="HH:MM[:SS]",
+                        help="почати клікання в заданий час (сьогодні або завтра)")
+    parser.add_argument("--control", nargs="?", const="", metavar="SOCKET",
+                        help="увімкнути керування через Unix-сокет (за замовчуванням - у $XDG_RUNTIME_DIR)")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="трасувати кліки та експортувати при виході (.csv або Chrome JSON)")
+    parser.add_argument("--trace-profile", action="store_true",
+                        help="додатково cProfile навколо викликів бекенду (PATH.prof)")
+    parser.add_argument("--trigger", metavar="X,Y[,W,H]=RRGGBB",
+                        help="клікати лише коли піксель/область має заданий колір")
+    parser.add_argument("--trigger-tolerance", type=int, metavar="N",
+                        help="допуск кольору по каналу (0-255)")
+    parser.add_argument("--trigger-mode", choices=("gate", "fire"), default="gate",
+                        help="gate - клікати поки колір збігається, fire - лише запуск")
+    parser.add_argument("--jobs", metavar="PATH",
+                        help="JSON-файл незалежних задач {назва: {settings, plan, hotkey, seed}} "
+                             "замість одного двигуна (спільний планувальник)")
+    parser.add_argument("--record-macro", metavar="PATH",
+                        help="записати макрос (pynput) до --duration / Ctrl+C і зберегти")
+    parser.add_argument("--play-macro", metavar="PATH",
+                        help="відтворити макрос бекендом кліків (--backend) і вийти")
+    parser.add_argument("--macro-loops", type=int, default=1, metavar="N",
+                        help="повторів макросу (0 - до Ctrl+C / --duration)")
+    parser.add_argument("--idle", action="store_true",
+                        help="не починати клікання одразу (чекати команди start)")
+    parser.add_argument("--cpus", metavar="N[,N...]",
+                        help="закріпити потік кліків за ядрами (Linux)")
+    parser.add_argument("--fifo", type=int, nargs="?", const=REALTIME_FIFO_PRIORITY, metavar="PRIO",
+                        help="SCHED_FIFO для потоку кліків (потрібен CAP_SYS_NICE)")
+    parser.add_argument("--nice", type=int, metavar="N", help="nice потоку кліків (-20..19)")
+    parser.add_argument("--timer-slack", type=int, nargs="?", const=REALTIME_TIMER_SLACK_NS, metavar="NS",
+                        help="timer slack потоку кліків у нс (Linux)")
+    parser.add_argument("--gc", choices=VALID_GC_MODES, default="default",
+                        help="GC на час серії (для всього процесу): freeze - заморозити наявні об'єкти, disable - ще й вимкнути")
+    parser.add_argument("--log-level", action="append", metavar="[COMPONENT=]LEVEL",
+                        help="рівень логу: глобальний (INFO) або компонента (engine=DEBUG), можна повторювати")
+    parser.add_argument("--log-format", choices=LOG_FORMATS, default=LOG_FORMAT,
+                        help="json - JSON-рядки, text - '[Engine] ...'")
+    parser.add_argument("--log-file", metavar="PATH", help="писати лог у файл замість stderr")
+    return parser
+
+
+def collect_settings(args):
+    """
+    Налаштування двигуна з профілю, перекриті прапорцями командного рядка.
+
+    Raises:
+        OSError: файл --profile не прочитано
+        ValueError: некоректний JSON, не об'єкт або некоректний план
+    """
+    settings = {}
+    if args.profile:
+        settings.update(load_settings_file(args.profile))
+
+    flags = {
+        "target_cps": args.cps,
+        "randomness_pct": args.randomness,
+        "button": args.button,
+        "distribution": args.distribution,
+    }
+    settings.update({k: v for k, v in flags.items() if v is not None})
+    return settings
+
+
+def realtime_options(args):
+    """RealtimeOptions з прапорців або None, якщо жоден не заданий"""
+    if args.cpus is None and args.fifo is None and args.nice is None \
+            and args.timer_slack is None and args.gc == "default":
+        return None
+    from src.realtime import RealtimeOptions
+
+    cpus = None
+    if args.cpus is not None:
+        try:
+            cpus = [int(c) for c in args.cpus.split(",")]
+        except ValueError:
+            raise ValueError(f"--cpus: очікується список номерів ядер, отримано '{args.cpus}'")
+    return RealtimeOptions(cpus, args.fifo, args.nice, args.timer_slack, args.gc)
+
+
+def parse_start_at(value):
+    """'HH:MM[:SS]' -> найближчий такий момент у майбутньому (час епохи)"""
+    error = f"час має бути HH:MM або HH:MM:SS, отримано '{value}'"
+    try:
+        parts = [int(p) for p in value.split(":")]
+    except ValueError:
+        raise ValueError(error)
+    if len(parts) not in (2, 3) or not (0 <= parts[0] < 24 and all(0 <= p < 60 for p in parts[1:])):
+        raise ValueError(error)
+    now = time.localtime()
+    target = time.mktime(now[:3] + tuple(parts) + (0,) * (3 - len(parts)) + (0, 0, -1))
+    return target if target > time.time() else target + 86400
+
+
+# Прапорці одного двигуна, які не мають сенсу з --jobs (налаштування - у файлі задач)
+ENGINE_ONLY_FLAGS = {
+    "cps": "--cps", "randomness": "--randomness", "button": "--button",
+    "distribution": "--distribution", "profile": "--profile", "use_profile": "--use-profile",
+    "count": "--count", "start_at": "--start-at", "trace": "--trace", "trigger": "--trigger",
+    "cpus": "--cpus", "fifo": "--fifo", "nice": "--nice", "timer_slack": "--timer-slack",
+}
+
+
+def run_jobs(args):
+    """
+    Запускає задачі з файлу --jobs на одному JobScheduler до закінчення
+    duration або сигналу. Гарячі клавіші задач перемикають їх (pynput),
+    --control додає команди jobs/job/job-set/add-job/remove-job.
+    """
+    conflicts = [flag for name, flag in ENGINE_ONLY_FLAGS.items() if getattr(args, name)]
+    if conflicts:
+        log.error("Помилка: %s не поєднуються з --jobs", ", ".join(conflicts))
+        return 2
+
+    from src.jobs import JobScheduler, load_jobs_file
+
+    try:
+        jobs = load_jobs_file(args.jobs)
+        scheduler = JobScheduler(backend=args.backend)
+        for job in jobs:
+            scheduler.add_job(job)
+    except (OSError, ValueError) as e:
+        log.error("Помилка задач: %s", e)
+        return 2
+    except RuntimeError as e:
+        log.error("Помилка: %s", e)
+        return 1
+
+    done = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: done.set())
+
+    server = None
+    if args.control is not None:
+        from src.control import ControlServer
+        try:
+            server = ControlServer(None, args.control or None, jobs=scheduler)
+            server.start()
+        except (RuntimeError, OSError) as e:
+            log.error("Помилка сервера керування: %s", e)
+            return 2
+
+    try:
+        scheduler.start_hotkeys()
+    except ImportError:
+        log.warning("pynput не встановлено - гарячі клавіші задач вимкнені")
+
+    scheduler.start()
+    if not args.idle:
+        for job in jobs:
+            job.start()
+
+    done.wait(args.duration or None)
+    if server is not None:
+        server.stop()
+    scheduler.stop_engine()
+    scheduler.join()
+
+    for name, stats in scheduler.stats().items():
+        log.info(
+            "Задача '%s': кліків %d, CPS %.2f (ціль %.2f), запізнення %.3f мс",
+            name, stats["clicks"], stats["cps"], stats["target_cps"],
+            stats["mean_lateness_ms"], extra={"stats": stats},
+        )
+    return 0
+
+
+def run_macro(args):
+    """
+    --record-macro: запис до duration або сигналу, потім збереження.
+    --play-macro: відтворення через бекенд кліків до кінця макросу,
+    duration або сигналу (прокрутку й клавіші бекенд пропускає).
+    """
+    conflicts = [flag for name, flag in ENGINE_ONLY_FLAGS.items() if getattr(args, name)]
+    if args.jobs:
+        conflicts.append("--jobs")
+    if args.record_macro and args.play_macro:
+        conflicts.append("--record-macro")
+    if conflicts:
+        log.error("Помилка: %s не поєднуються з --play-macro/--record-macro", ", ".join(conflicts))
+        return 2
+    if args.macro_loops < 0:
+        log.error("Помилка: --macro-loops має бути >= 0")
+        return 2
+
+    from src.macro import BackendOutput, Macro, MacroPlayer, MacroRecorder
+
+    done = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: done.set())
+
+    if args.record_macro:
+        recorder = MacroRecorder()
+        try:
+            recorder.start()
+        except ImportError:
+            log.error("Помилка: запис макросу потребує pynput")
+            return 2
+        done.wait(args.duration or None)
+        macro = recorder.stop()
+        try:
+            macro.save(args.record_macro)
+        except OSError as e:
+            log.error("Помилка збереження макросу: %s", e)
+            return 2
+        log.info("Макрос збережено: %s (%d подій)", args.record_macro, len(macro))
+        return 0
+
+    try:
+        macro = Macro.load(args.play_macro)
+    except (OSError, ValueError) as e:
+        log.error("Помилка макросу: %s", e)
+        return 2
+    try:
+        from src.engine import create_backend
+        output = BackendOutput(create_backend(args.backend))
+    except RuntimeError as e:
+        macro.close()
+        log.error("Помилка: %s", e)
+        return 1
+
+    player = MacroPlayer(macro, output, args.macro_loops)
+    player.on_finished = done.set
+    player.start()
+    done.wait(args.duration or None)
+    player.stop()
+    player.join()
+    macro.close()
+
+    stats = player.get_stats()
+    log.info(
+        "Відтворено подій: %d, повторів: %d, запізнення: %.3f мс (макс. %.3f), пропущено: %d",
+        stats["events"], stats["loops_done"], stats["mean_lateness_ms"],
+        stats["max_lateness_ms"], output.skipped, extra={"stats": stats},
+    )
+    return 0
+
+
+def run_headless(args):
+    """Запускає двигун без GUI до закінчення duration або сигналу"""
+    if args.record_macro or args.play_macro:
+        return run_macro(args)
+    if args.jobs:
+        return run_jobs(args)
+
+    from src.engine import ClickerEngine, make_run_limits
+
+    from src.profiles import ProfileStore
+
+    store = ProfileStore(args.profiles).load()
+    profile = None
+    if args.use_profile:
+        if args.use_profile not in store:
+            log.error("Помилка: профіль '%s' не знайдено", args.use_profile)
+            return 2
+        profile = store.get(args.use_profile)
+
+    # Явний --backend має пріоритет над бекендом профілю
+    backend = args.backend
+    if profile is not None and backend == "auto":
+        backend = profile.backend
+
+    try:
+        realtime = realtime_options(args)
+    except ValueError as e:
+        log.error("Помилка: %s", e)
+        return 2
+
+    try:
+        settings = collect_settings(args)
+        for key, value in settings.items():
+            error = validate_setting(key, value)
+            if error:
+                raise ValueError(error)
+    except (OSError, ValueError, TypeError) as e:
+        log.error("Помилка налаштувань%s: %s", f" ({args.profile})" if args.profile else "", e)
+        return 2
+
+    try:
+        engine = ClickerEngine(backend=backend, seed=args.seed, realtime=realtime)
+    except RuntimeError as e:
+        log.error("Помилка: %s", e)
+        return 1
+    if profile is not None and not engine.update_settings_many(profile.settings):
+        return 2
+    if not engine.update_settings_many(settings):
+        return 2
+
+    done = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: done.set())
+
+    if args.trace:
+        engine.enable_tracing(profile=args.trace_profile)
+
+    server = None
+    if args.control is not None:
+        from src.control import ControlServer
+        try:
+            server = ControlServer(engine, args.control or None, profiles=store)
+            server.start()
+        except (RuntimeError, OSError) as e:
+            log.error("Помилка сервера керування: %s", e)
+            return 2
+
+    trigger = None
+    if args.trigger:
+        from src.triggers import ScreenTrigger, parse_trigger_spec
+        try:
+            condition = parse_trigger_spec(args.trigger, args.trigger_tolerance)
+            trigger = ScreenTrigger(engine, condition, mode=args.trigger_mode)
+        except (ValueError, RuntimeError) as e:
+            log.error("Помилка тригера: %s", e)
+            return 2
+
+    # Обмеження серії виконує сам двигун, вихід - по її завершенню.
+    # З тригером або --idle --duration обмежує час роботи процесу
+    engine_limits = trigger is None and not args.idle
+    try:
+        start_at = parse_start_at(args.start_at) if args.start_at else None
+        run_args = {"count": args.count, "duration": args.duration or None, "at": start_at}
+        if engine_limits and make_run_limits(**run_args) is not None:
+            engine.on_finished = done.set
+    except ValueError as e:
+        log.error("Помилка: %s", e)
+        return 2
+
+    engine.start()
+    if trigger is not None:
+        trigger.start()  # клікання вмикає тригер, а не старт
+    elif not args.idle:
+        engine.start_clicking(**run_args)
+
+        # Час до першого кліку від старту інтерпретатора модуля
+        while (start_at is None and engine.telemetry.clicks == 0
+               and engine.is_alive() and not done.is_set()):
+            time.sleep(0.0005)
+        if engine.telemetry.clicks:
+            first_ms = (time.perf_counter() - _T0) * 1e3
+            log.info("Перший клік через %.1f мс після старту", first_ms, extra={"first_click_ms": first_ms})
+
+    done.wait(None if engine_limits else args.duration or None)
+    if trigger is not None:
+        trigger.stop()
+        trigger.join()
+        log.info("Перевірка тригера: %.2f мс/кадр", trigger.check_latency_ms())
+    if server is not None:
+        server.stop()
+    engine.stop_engine()
+    engine.join()
+
+    if args.trace:
+        trace = engine.disable_tracing()
+        trace.export(args.trace)
+        log.info("Трасу збережено: %s %s", args.trace, trace.summary())
+
+    stats = engine.get_stats()
+    log.info(
+        "Кліків: %d, CPS: %.2f (ціль %.2f), джитер: %.3f мс",
+        stats["clicks"], stats["achieved_cps"], stats["target_cps"], stats["jitter_ms"],
+        extra={"stats": stats},
+    )
+    return 0
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        level, levels = parse_level_specs(args.log_level)
+    except ValueError as e:
+        parser.error(str(e))
+    configure_logging(level, args.log_format, args.log_file, levels)
+
+    if args.gui:
+        # Важкий GUI-стек вантажимо лише на вимогу
+        from src.ui import run_app
+        run_app()
+        return 0
+
+    return run_headless(args)
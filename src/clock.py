@@ -0,0 +1,147 @@
+"""
+Годинник двигуна: звідки брати "зараз" і як чекати.
+
+SystemClock - справжній час (perf_counter_ns, гібридне очікування),
+ним користуються GUI, CLI та бенчмарки. VirtualClock - віртуальний час
+для симуляції (src/simulation.py): очікування не спить, а одразу
+переводить годинник на дедлайн, виконуючи по дорозі заплановані дії.
+Двигун, планувальник і телеметрія ходять лише через об'єкт годинника,
+тож обидва режими виконують один і той самий код run().
+"""
+import heapq
+import time
+from src.config import SCHEDULER_SPIN_NS
+
+
+def wait_until(deadline, interrupt=None, spin_ns=SCHEDULER_SPIN_NS):
+    """
+    Гібридне очікування абсолютного дедлайну (perf_counter_ns): грубий sleep
+    до spin_ns перед дедлайном, далі spin з time.sleep(0).
+
+    Args:
+        interrupt: threading.Event, встановлення якого перериває очікування
+
+    Returns:
+        int: фактичний час пробудження або None, якщо очікування перервано
+    """
+    remaining = deadline - time.perf_counter_ns()
+
+    if remaining > spin_ns:
+        timeout = (remaining - spin_ns) / 1e9
+        if interrupt is None:
+            time.sleep(timeout)
+        elif interrupt.wait(timeout):
+            return None
+
+    now = time.perf_counter_ns()
+    while now < deadline:
+        if interrupt is not None and interrupt.is_set():
+            return None
+        time.sleep(0)
+        now = time.perf_counter_ns()
+    return now
+
+
+class SystemClock:
+    """Справжній час: perf_counter_ns, time.time() та блокуючі очікування"""
+    now_ns = staticmethod(time.perf_counter_ns)
+    wall = staticmethod(time.time)
+    wait_until = staticmethod(wait_until)
+
+    @staticmethod
+    def wait(event, timeout=None):
+        """Event.wait(timeout): True, якщо подію встановлено"""
+        return event.wait(timeout)
+
+
+SYSTEM_CLOCK = SystemClock()
+
+
+class SimulationStalled(RuntimeError):
+    """Двигун чекає без таймауту, а запланованих дій більше немає"""
+
+
+class VirtualClock:
+    """
+    Детермінований віртуальний час для одного потоку.
+
+    Дії (call_at/call_later) виконуються всередині очікувань у тому ж
+    потоці, що чекає, рівно у свій віртуальний момент і в порядку
+    планування. Очікування, яке дія перервала (встановила interrupt),
+    повертає None так само, як SystemClock.
+
+    Args:
+        start_ns: початкове значення now_ns()
+        wall_start: час епохи, що відповідає start_ns (для make_run_limits)
+    """
+    def __init__(self, start_ns=0, wall_start=0.0):
+        self._now = start_ns
+        self._start_ns = start_ns
+        self._wall_start = wall_start
+        self._actions = []  # купа (момент, порядковий номер, fn)
+        self._seq = 0
+        self.waits = 0
+
+    def now_ns(self):
+        return self._now
+
+    def wall(self):
+        return self._wall_start + (self._now - self._start_ns) / 1e9
+
+    def call_at(self, at_ns, fn):
+        """Планує fn() на віртуальний момент at_ns (не раніше "зараз")"""
+        heapq.heappush(self._actions, (max(at_ns, self._now), self._seq, fn))
+        self._seq += 1
+
+    def call_later(self, delay, fn):
+        """Планує fn() через delay секунд віртуального часу"""
+        self.call_at(self._now + int(delay * 1e9), fn)
+
+    def pending(self):
+        """Скільки дій ще заплановано"""
+        return len(self._actions)
+
+    def _run_next(self):
+        at_ns, _, fn = heapq.heappop(self._actions)
+        if at_ns > self._now:
+            self._now = at_ns
+        fn()
+
+    def wait_until(self, deadline, interrupt=None, spin_ns=None):
+        """
+        Переводить годинник на deadline, виконуючи дії до нього включно:
+        дія, запланована рівно на дедлайн, встигає перервати очікування
+        """
+        self.waits += 1
+        if deadline <= self._now:
+            return self._now  # дедлайн уже минув - як SystemClock, без перевірки interrupt
+        actions = self._actions
+        while True:
+            if interrupt is not None and interrupt.is_set():
+                return None
+            if not actions or actions[0][0] > deadline:
+                break
+            self._run_next()
+        self._now = deadline
+        return deadline
+
+    def wait(self, event, timeout=None):
+        """
+        Віртуальний Event.wait: виконує дії, доки подію не встановлять
+        або не мине timeout.
+
+        Raises:
+            SimulationStalled: timeout=None, а дій більше немає
+        """
+        self.waits += 1
+        deadline = None if timeout is None else self._now + int(timeout * 1e9)
+        actions = self._actions
+        while not event.is_set():
+            if actions and (deadline is None or actions[0][0] <= deadline):
+                self._run_next()
+                continue
+            if deadline is None:
+                raise SimulationStalled("Двигун чекає команди, а запланованих дій немає")
+            self._now = max(self._now, deadline)
+            return False
+        return True
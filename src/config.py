@@ -4,23 +4,50 @@
 DEFAULT_CPS = 10.0
 DEFAULT_RANDOMNESS = 20.0
 DEFAULT_BUTTON = "left"
-DEFAULT_HOTKEY = "s"
+DEFAULT_HOTKEY = "s"  # Старт/стоп (toggle)
+# Додаткові гарячі клавіші: комбінація -> дія (див. src/hotkeys.py)
+HOTKEY_BINDINGS = {"ctrl+shift+x": "panic"}
 
 # Діапазони валідації
 CPS_MIN = 1.0
-CPS_MAX = 200.0  # Максимум 200 кліків на секунду
+CPS_MAX = 1000.0  # Максимум налаштувань; фактичну межу задає бекенд (ClickBackend.MAX_CPS)
 
 RANDOMNESS_MIN = 0.0
 RANDOMNESS_MAX = 100.0
 
 VALID_BUTTONS = ["left", "right", "middle"]
 
-MIN_DELAY = 0.001  # Мінімальна затримка між кліками
+MIN_DELAY = 0.0001  # Мінімальна затримка між кліками (1 / CPS_MAX з запасом)
+
+# Генератор затримок
+VALID_DISTRIBUTIONS = ["uniform", "gaussian", "lognormal", "profile"]
+DEFAULT_DISTRIBUTION = "uniform"
+DELAY_BLOCK_SIZE = 1024  # Скільки затримок генерується за раз
+
+# План цілей
+VALID_PLAN_MODES = ["round_robin", "weighted", "random"]
+PLAN_BLOCK_SIZE = 256  # Скільки координат компілюється за раз
+
+# Пакетний режим: від порогу одне пробудження планує групу кліків,
+# кожен з яких чекає власного піддедлайну
+BATCH_CPS_THRESHOLD = 100.0  # Поріг CPS за замовчуванням
+BATCH_WINDOW = 0.01  # Тривалість групи кліків (секунди)
+MAX_BATCH_SIZE = 50  # Максимум кліків за одне пробудження
+
+# Бекенди кліків ("auto" - доступний з найменшою оцінкою NOMINAL_COST_NS)
+VALID_BACKENDS = ["auto", "xtest", "pynput", "pyautogui", "null"]
+DEFAULT_BACKEND = "auto"
+
+# Планувальник дедлайнів
+SCHEDULER_SPIN_NS = 1_500_000  # Останні 1.5 мс до дедлайну - активне очікування
+MISSED_DEADLINE_POLICIES = ["catch_up", "skip"]
+MISSED_DEADLINE_POLICY = "catch_up"  # Що робити з пропущеними дедлайнами
+MAX_CATCH_UP_CLICKS = 5  # Максимум кліків "наздоганяння" поспіль
 
 # GUI налаштування
 WINDOW_TITLE = "Pro AutoClicker by AI"
 WINDOW_WIDTH = 400
-WINDOW_HEIGHT = 500
+WINDOW_HEIGHT = 600
 
 # Кольори (UI/UX)
 COLOR_STOP = "#c42b1c"  # Червоний для STOP
@@ -29,5 +56,66 @@ COLOR_START = ["#3a7ebf", "#1f538d"]  # Синій для START
 COLOR_START_HOVER = ["#3273af", "#1a487d"]
 
 # Таймаути
-IDLE_SLEEP = 0.05  # Затримка коли не клікаємо
-GUI_MARSHAL_DELAY = 0  # Для .after() при cross-thread call
+ERROR_BACKOFF = 0.1  # Пауза після помилки кліку
+
+# Регулятор фактичного CPS (PI)
+RATE_CONTROL = True  # Вмикати регулятор у ClickerEngine за замовчуванням
+RATE_WINDOW = 1.0  # Ковзне вікно виміру досягнутого CPS (секунди)
+RATE_CONTROL_PERIOD = 0.1  # Крок регулятора (секунди)
+RATE_KP = 0.5
+RATE_KI = 2.0
+RATE_TOLERANCE = 0.05  # Відставання від цілі, з якого ціль вважається недосяжною
+RATE_MIN_CORRECTION = 0.5  # Регулятор не сповільнює більш ніж удвічі
+
+# Рух курсора між цілями плану
+MOTION_RATE_HZ = 125  # Частота точок траєкторії
+MOTION_MIN_POINTS = 4  # Мінімум точок на рух: короткий бюджет дає частіші точки, а не стрибок
+MOTION_SPEED = 1500.0  # Середня швидкість руху (пікселів/сек)
+MOTION_MIN_DURATION = 0.04  # Мінімальна тривалість руху (секунди)
+MOTION_SPEED_VARIATION = 0.2  # ± частка випадкової зміни тривалості
+MOTION_CURVATURE = 0.15  # Максимальний вигин траєкторії (частка відстані)
+MOTION_OVERSHOOT = 0.05  # Максимальний переліт за ціль (частка відстані)
+MOTION_BUDGET = 0.8  # Частка інтервалу між кліками, яку можна витратити на рух
+MOTION_DISTANCE_BUCKET = 20  # Крок кошиків відстані для кешу шляхів (пікселі)
+MOTION_ANGLE_BUCKETS = 32  # Кількість секторів кута для кешу шляхів
+MOTION_VARIANTS = 4  # Варіантів шляху на кошик (щоб рухи не повторювались)
+MOTION_CACHE_SIZE = 4096
+
+# Налаштування потоку кліків (src/realtime.py, усе опційно)
+VALID_GC_MODES = ("default", "freeze", "disable")  # Поведінка GC на час серії
+REALTIME_FIFO_PRIORITY = 10  # Пріоритет SCHED_FIFO для --fifo без значення
+REALTIME_TIMER_SLACK_NS = 1000  # Timer slack для --timer-slack без значення (за замовч. ядра 50 мкс)
+
+# Тригери за станом екрана
+TRIGGER_INTERVAL = 0.005  # Період перевірки області (секунди, менше за кадр 60 Гц)
+TRIGGER_TOLERANCE = 10  # Допуск по кожному каналу кольору (0-255)
+
+# Логування (src/log.py)
+LOG_LEVEL = "INFO"
+LOG_FORMAT = "json"  # JSON-рядки; "text" - "[Engine] повідомлення"
+LOG_FORMATS = ("json", "text")
+LOG_QUEUE_SIZE = 10000  # Більше записів у черзі - нові відкидаються (кліки не чекають)
+LOG_ERROR_INTERVAL = 5.0  # Однакова помилка - не частіше ніж раз на N секунд
+LOG_SHUTDOWN_TIMEOUT = 1.0  # Скільки чекати дописування логу при виході (секунди)
+
+# Трасування кліків
+TRACE_RING_SIZE = 65536  # Останні N кліків у буфері трасування
+
+# Макроси (бінарний формат запису)
+MACRO_MAGIC = b"ACMR"
+MACRO_VERSION = 1
+
+# Профілі
+PROFILES_FILE_NAME = ".autoclicker_profiles.json"  # У домашній директорії
+
+# Керування через Unix-сокет
+CONTROL_SOCKET_NAME = "autoclicker.sock"  # У $XDG_RUNTIME_DIR або tempdir/autoclicker-<uid>
+STATS_STREAM_INTERVAL = 0.25  # Період push-телеметрії за замовчуванням (секунди)
+STATS_STREAM_MIN_INTERVAL = 0.01
+CONTROL_LINE_LIMIT = 65536  # Максимальна довжина рядка запиту (байт)
+
+# Телеметрія
+TELEMETRY_RING_SIZE = 1024  # Останні групи кліків у кільцевому буфері
+TELEMETRY_WINDOW = 1.0  # Вікно ковзного CPS (секунди)
+TELEMETRY_POLL_MS = 250  # Як часто GUI оновлює показники
+GUI_FRAME_MS = 33  # Кадр GUI: одне застосування накопиченого стану (~30 FPS)
@@ -0,0 +1,507 @@
+"""
+Локальний API керування двигуном через Unix-сокет (asyncio).
+
+Протокол - JSON по рядку на запит і відповідь:
+    {"cmd": "start"}                          -> {"ok": true, "clicking": true}
+    {"cmd": "start", "count": 1000}           -> рівно N кліків ("duration": сек, "at": час епохи)
+    {"cmd": "stop"} / {"cmd": "toggle"}
+    {"cmd": "set", "settings": {"target_cps": 50}}
+    {"cmd": "status"}                         -> налаштування, стан, телеметрія
+    {"cmd": "load-profile", "path": "p.json"}
+    {"cmd": "profile", "name": "fast"}        -> перемикання на збережений профіль
+    {"cmd": "profiles"}                       -> список профілів
+    {"cmd": "trace", "action": "start"}       -> трасування кліків ("profile": true - з cProfile)
+    {"cmd": "trace", "action": "stop", "path": "t.json"} -> експорт (.csv або Chrome JSON)
+    {"cmd": "motion", "enabled": true}        -> плавний рух курсора між цілями плану
+    {"cmd": "record", "action": "start"}      -> запис макросу (pynput; "moves": false - без рухів)
+    {"cmd": "record", "action": "stop", "path": "m.acm"} -> зберегти запис
+    {"cmd": "play", "path": "m.acm", "loops": 1} -> відтворення бекендом двигуна ("output": "pynput" - з клавішами)
+    {"cmd": "play", "action": "stop"} / {"cmd": "play", "action": "status"}
+    {"cmd": "stream-stats", "interval": 0.25} -> далі push {"event": "stats", ...}
+    {"cmd": "unsubscribe"}
+Команди задач JobScheduler (сервер з jobs=, напр. python -m src --jobs):
+    {"cmd": "jobs"}                           -> телеметрія всіх задач
+    {"cmd": "job", "name": "left", "action": "toggle"} -> "start" / "stop" / "toggle"
+    {"cmd": "job-set", "name": "left", "settings": {"target_cps": 80}}
+    {"cmd": "add-job", "name": "right", "settings": {...}, "hotkey": "f7", "start": true}
+    {"cmd": "remove-job", "name": "right"}
+Без двигуна (лише задачі) команди двигуна відповідають "невідома команда".
+Поле "id" запиту повертається у відповіді без змін. Некоректний запит
+(JSON, аргументи, рядок довший за CONTROL_LINE_LIMIT) отримує
+{"ok": false, "error": ...}, з'єднання лишається відкритим.
+"""
+import asyncio
+import json
+import errno
+import math
+import os
+import socket
+import stat
+import tempfile
+import threading
+from src.config import (
+    CONTROL_SOCKET_NAME, STATS_STREAM_INTERVAL, STATS_STREAM_MIN_INTERVAL, CONTROL_LINE_LIMIT
+)
+from src.log import get_logger
+from src.settings import decode_settings, validate_setting, load_settings_file
+
+log = get_logger("control")
+
+
+def default_socket_path():
+    """
+    Шлях до сокета за замовчуванням - у директорії лише цього користувача:
+    $XDG_RUNTIME_DIR або tempdir/autoclicker-<uid> (створюється з правами 0700)
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, CONTROL_SOCKET_NAME)
+
+    directory = os.path.join(tempfile.gettempdir(), f"autoclicker-{os.getuid()}")
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        info = os.lstat(directory)
+        if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+            raise RuntimeError(f"Небезпечна директорія для сокета: {directory}")
+    return os.path.join(directory, CONTROL_SOCKET_NAME)
+
+
+def claim_socket_path(path):
+    """
+    Звільняє шлях під новий сокет. Видаляє лише залишок попереднього
+    запуску - сокет, на якому ніхто не слухає (ECONNREFUSED).
+
+    Raises:
+        RuntimeError: на сокеті вже працює сервер, або за шляхом не сокет
+        OSError: інша помилка перевірки (права тощо)
+    """
+    try:
+        info = os.lstat(path)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(info.st_mode):
+        raise RuntimeError(f"{path} існує і не є сокетом")
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError as e:
+        if e.errno != errno.ECONNREFUSED:
+            raise
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f"На {path} вже працює інший сервер керування")
+
+
+class ControlServer:
+    """
+    asyncio-сервер на Unix-сокеті у власному фоновому потоці.
+
+    Команди лише викликають неблокуючі методи ClickerEngine та
+    JobScheduler, тож відповідь не чекає на потік кліків. engine чи jobs
+    може бути None - тоді їхні команди не реєструються.
+    """
+    def __init__(self, engine, path=None, profiles=None, jobs=None):
+        if not hasattr(socket, "AF_UNIX"):
+            raise RuntimeError("Unix-сокети не підтримуються на цій платформі")
+
+        self.engine = engine
+        self.jobs = jobs  # JobScheduler або None
+        self.profiles = profiles  # ProfileStore або None
+        self.path = path or default_socket_path()
+        self._loop = None
+        self._stop_event = None
+        self._ready = threading.Event()
+        self._error = None  # виняток старту з потоку сервера
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+        self._recorder = None  # MacroRecorder під час запису
+        self._player = None  # останній MacroPlayer
+
+        self._commands = {"record": self._cmd_record, "play": self._cmd_play}
+        if engine is not None:
+            self._commands.update({
+                "start": self._cmd_start,
+                "stop": self._cmd_stop,
+                "toggle": self._cmd_toggle,
+                "set": self._cmd_set,
+                "status": self._cmd_status,
+                "load-profile": self._cmd_load_profile,
+                "profile": self._cmd_profile,
+                "profiles": self._cmd_profiles,
+                "trace": self._cmd_trace,
+                "motion": self._cmd_motion,
+            })
+        if jobs is not None:
+            self._commands.update({
+                "jobs": self._cmd_jobs,
+                "job": self._cmd_job,
+                "job-set": self._cmd_job_set,
+                "add-job": self._cmd_add_job,
+                "remove-job": self._cmd_remove_job,
+            })
+
+    # --- Життєвий цикл ---
+    def start(self):
+        """
+        Запускає сервер і чекає, поки сокет буде готовий.
+
+        Raises:
+            RuntimeError, OSError: шлях зайнятий іншим сервером чи недоступний
+        """
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            self._thread.join()
+            raise self._error
+        log.info("Слухаю %s", self.path)
+
+    def stop(self):
+        """Зупиняє сервер, запис і відтворення макросу та видаляє файл сокета"""
+        if self._recorder is not None:
+            self._recorder.stop()
+            self._recorder = None
+        if self._player is not None:
+            self._player.stop()
+        if self._loop is not None and self._stop_event is not None:
+            self._loop.call_soon_threadsafe(self._stop_event.set)
+        self._thread.join()
+
+    def _run(self):
+        try:
+            asyncio.run(self._serve())
+        except Exception as e:
+            if self._ready.is_set():
+                raise
+            self._error = e
+            self._ready.set()
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+
+        claim_socket_path(self.path)
+        server = await asyncio.start_unix_server(
+            self._handle, path=self.path, limit=CONTROL_LINE_LIMIT
+        )
+        os.chmod(self.path, 0o600)  # команди - лише від власника
+        self._ready.set()
+
+        async with server:
+            await self._stop_event.wait()
+
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    # --- З'єднання ---
+    async def _handle(self, reader, writer):
+        stream = None
+        try:
+            while True:
+                line = await self._read_line(reader)
+                if line is None:
+                    self._send(writer, {
+                        "ok": False, "error": f"запит довший за {CONTROL_LINE_LIMIT} байт"
+                    })
+                    await writer.drain()
+                    continue
+                if not line:
+                    break
+
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("запит має бути JSON-об'єктом")
+                except ValueError as e:
+                    self._send(writer, {"ok": False, "error": f"некоректний JSON: {e}"})
+                    await writer.drain()
+                    continue
+
+                cmd = request.get("cmd")
+                if cmd == "stream-stats":
+                    interval = self._stream_interval(request)
+                    if interval is None:
+                        response = {"ok": False, "error": "interval має бути додатним числом секунд"}
+                    else:
+                        if stream is not None:
+                            stream.cancel()
+                        stream = asyncio.create_task(self._stream_stats(writer, interval))
+                        response = {"ok": True, "interval": interval}
+                elif cmd == "unsubscribe":
+                    if stream is not None:
+                        stream.cancel()
+                        stream = None
+                    response = {"ok": True}
+                else:
+                    response = self.dispatch(request)
+
+                if "id" in request:
+                    response["id"] = request["id"]
+                self._send(writer, response)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if stream is not None:
+                stream.cancel()
+            writer.close()
+
+    @staticmethod
+    async def _read_line(reader):
+        """
+        Наступний рядок запиту: b"" - кінець з'єднання, None - рядок довший
+        за ліміт буфера (відкидається цілком, до "\n" включно)
+        """
+        oversized = False
+        while True:
+            try:
+                line = await reader.readuntil(b"\n")
+            except asyncio.IncompleteReadError as e:
+                return b"" if oversized else e.partial
+            except asyncio.LimitOverrunError as e:
+                # Відкидаємо прочитане без "\n" і дочитуємо рядок до кінця
+                await reader.readexactly(e.consumed)
+                oversized = True
+                continue
+            return None if oversized else line
+
+    @staticmethod
+    def _stream_interval(request):
+        """Період push-телеметрії з запиту (не менше мінімального) або None"""
+        value = request.get("interval", STATS_STREAM_INTERVAL)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return None
+        if not math.isfinite(value) or value <= 0:
+            return None
+        return max(STATS_STREAM_MIN_INTERVAL, float(value))
+
+    async def _stream_stats(self, writer, interval):
+        """Push-підписка: телеметрія кожні interval секунд"""
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                self._send(writer, self._stats_event())
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+    def _stats_event(self):
+        event = {"event": "stats"}
+        if self.engine is not None:
+            event["clicking"] = self.engine.is_clicking()
+            event.update(self.engine.get_telemetry())
+        if self.jobs is not None:
+            event["jobs"] = self.jobs.stats()
+        return event
+
+    @staticmethod
+    def _send(writer, message):
+        writer.write(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    # --- Команди ---
+    def dispatch(self, request):
+        """Виконує одну команду, повертає словник-відповідь"""
+        handler = self._commands.get(request.get("cmd"))
+        if handler is None:
+            return {"ok": False, "error": f"невідома команда: {request.get('cmd')}"}
+        try:
+            return handler(request)
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    @staticmethod
+    def _field(request, name):
+        """Обов'язкове поле запиту; відсутнє - зрозуміла помилка замість KeyError"""
+        if name not in request:
+            raise ValueError(f"відсутнє поле '{name}'")
+        return request[name]
+
+    def _cmd_start(self, request):
+        self.engine.start_clicking(
+            count=request.get("count"), duration=request.get("duration"), at=request.get("at")
+        )
+        return {"ok": True, "clicking": True}
+
+    def _cmd_stop(self, request):
+        self.engine.stop_clicking()
+        return {"ok": True, "clicking": False}
+
+    def _cmd_toggle(self, request):
+        return {"ok": True, "clicking": self.engine.toggle()}
+
+    def _apply_settings(self, settings, target=None):
+        """Валідує та застосовує налаштування до двигуна або задачі target"""
+        target = target or self.engine
+        if not isinstance(settings, dict):
+            return {"ok": False, "error": "settings має бути JSON-об'єктом"}
+        settings = decode_settings(settings)
+        for key, value in settings.items():
+            error = validate_setting(key, value)
+            if error:
+                return {"ok": False, "error": error}
+        ok = target.update_settings_many(settings)
+        return {"ok": ok, "settings": target.settings.to_json()}
+
+    def _cmd_set(self, request):
+        return self._apply_settings(request.get("settings"))
+
+    def _cmd_load_profile(self, request):
+        return self._apply_settings(load_settings_file(self._field(request, "path")))
+
+    def _cmd_profile(self, request):
+        if self.profiles is None:
+            return {"ok": False, "error": "профілі не завантажені"}
+        name = self._field(request, "name")
+        if name not in self.profiles:
+            return {"ok": False, "error": f"профіль '{name}' не знайдено"}
+        profile = self.profiles.get(name)
+        ok = self.engine.apply_profile(profile)
+        return {"ok": ok, "profile": profile.name, "settings": self.engine.settings.to_json()}
+
+    def _cmd_profiles(self, request):
+        names = self.profiles.names() if self.profiles is not None else []
+        return {"ok": True, "profiles": names}
+
+    def _cmd_trace(self, request):
+        action = request.get("action")
+        if action == "start":
+            self.engine.enable_tracing(profile=bool(request.get("profile")))
+            return {"ok": True}
+        if action == "stop":
+            trace = self.engine.disable_tracing()
+            if trace is None:
+                return {"ok": False, "error": "трасування не увімкнено"}
+            if request.get("path"):
+                trace.export(request["path"])
+            return {"ok": True, "summary": trace.summary()}
+        return {"ok": False, "error": "action має бути 'start' або 'stop'"}
+
+    def _cmd_motion(self, request):
+        if request.get("enabled", True):
+            if self.engine.motion is None:
+                self.engine.enable_motion()
+        else:
+            self.engine.disable_motion()
+        motion = self.engine.motion
+        return {"ok": True, "motion": motion.stats() if motion is not None else None}
+
+    def _cmd_status(self, request):
+        return {
+            "ok": True,
+            "clicking": self.engine.is_clicking(),
+            "settings": self.engine.settings.to_json(),
+            "telemetry": self.engine.get_telemetry(),
+        }
+
+    # --- Задачі JobScheduler ---
+    def _job(self, request):
+        name = self._field(request, "name")
+        job = self.jobs.jobs.get(name) if isinstance(name, str) else None
+        if job is None:
+            raise ValueError(f"задачу '{name}' не знайдено")
+        return job
+
+    def _cmd_jobs(self, request):
+        return {"ok": True, "jobs": self.jobs.stats()}
+
+    def _cmd_job(self, request):
+        job = self._job(request)
+        action = request.get("action", "toggle")
+        if action == "start":
+            job.start()
+        elif action == "stop":
+            job.stop()
+        elif action == "toggle":
+            job.toggle()
+        else:
+            return {"ok": False, "error": "action має бути 'start', 'stop' або 'toggle'"}
+        return {"ok": True, "name": job.name, "clicking": job.is_clicking()}
+
+    def _cmd_job_set(self, request):
+        return self._apply_settings(request.get("settings"), self._job(request))
+
+    def _cmd_add_job(self, request):
+        from src.jobs import ClickJob
+
+        name = request.get("name")
+        if not isinstance(name, str) or not name:
+            return {"ok": False, "error": "name має бути непорожнім рядком"}
+        job = self.jobs.add_job(ClickJob.from_dict(name, request, self.jobs.clock))
+        if request.get("start"):
+            job.start()
+        return {"ok": True, "name": job.name, "clicking": job.is_clicking()}
+
+    def _cmd_remove_job(self, request):
+        job = self._job(request)
+        self.jobs.remove_job(job.name)
+        return {"ok": True, "name": job.name}
+
+    # --- Макроси ---
+    def _cmd_record(self, request):
+        from src.macro import MacroRecorder
+
+        action = request.get("action")
+        if action == "start":
+            if self._recorder is not None:
+                return {"ok": False, "error": "запис уже триває"}
+            recorder = MacroRecorder(record_moves=bool(request.get("moves", True)))
+            try:
+                recorder.start()
+            except ImportError:
+                return {"ok": False, "error": "запис макросу потребує pynput"}
+            self._recorder = recorder
+            return {"ok": True, "recording": True}
+        if action == "stop":
+            if self._recorder is None:
+                return {"ok": False, "error": "запис не триває"}
+            macro, self._recorder = self._recorder.stop(), None
+            if request.get("path"):
+                macro.save(request["path"])
+            return {"ok": True, "recording": False, "events": len(macro),
+                    "duration": macro.duration_ns / 1e9}
+        return {"ok": False, "error": "action має бути 'start' або 'stop'"}
+
+    def _cmd_play(self, request):
+        from src.macro import BackendOutput, Macro, MacroPlayer, PynputOutput
+
+        action = request.get("action", "start")
+        player = self._player
+        if action == "stop":
+            if player is not None:
+                player.stop()
+            return {"ok": True, "playing": False}
+        if action == "status":
+            if player is None:
+                return {"ok": True, "playing": False}
+            return {"ok": True, "playing": player.is_alive(), "stats": player.get_stats()}
+        if action != "start":
+            return {"ok": False, "error": "action має бути 'start', 'stop' або 'status'"}
+
+        if player is not None and player.is_alive():
+            return {"ok": False, "error": "макрос уже відтворюється"}
+        if self.engine is not None and self.engine.is_clicking():
+            return {"ok": False, "error": "зупиніть клікання перед відтворенням макросу"}
+        loops = request.get("loops", 1)
+        if isinstance(loops, bool) or not isinstance(loops, int) or loops < 0:
+            return {"ok": False, "error": "loops має бути цілим числом >= 0 (0 - до stop)"}
+        output = request.get("output", "backend")
+        if output == "backend":
+            backend = self.engine.backend if self.engine is not None else self.jobs.backend
+            output = BackendOutput(backend)
+        elif output == "pynput":
+            try:
+                output = PynputOutput()
+            except ImportError:
+                return {"ok": False, "error": "output 'pynput' потребує pynput"}
+        else:
+            return {"ok": False, "error": "output має бути 'backend' або 'pynput'"}
+
+        macro = Macro.load(self._field(request, "path"))
+        player = MacroPlayer(macro, output, loops)
+        player.on_finished = macro.close
+        player.start()
+        self._player = player
+        return {"ok": True, "playing": True, "events": len(macro), "duration": macro.duration_ns / 1e9}
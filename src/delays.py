@@ -0,0 +1,145 @@
+import math
+import random
+from array import array
+from src.config import MIN_DELAY, DELAY_BLOCK_SIZE, DEFAULT_DISTRIBUTION
+
+
+# --- Розподіли затримок ---
+# Кожен розподіл: fn(rng, base_delay, spread, count, profile) -> ітерабельне
+# з count затримок. spread = randomness_pct / 100. Розподіли підібрані так,
+# що середнє дорівнює base_delay, а стандартне відхилення збігається з
+# рівномірним ±spread (base * spread / sqrt(3)).
+
+def _uniform(rng, base, spread, count, profile):
+    """Рівномірний ±spread від базової затримки (як було раніше)"""
+    low = base - base * spread
+    high = base + base * spread
+    uniform = rng.uniform
+    return (uniform(low, high) for _ in range(count))
+
+
+def _gaussian(rng, base, spread, count, profile):
+    """Нормальний розподіл навколо базової затримки"""
+    sigma = base * spread / math.sqrt(3)
+    gauss = rng.gauss
+    return (gauss(base, sigma) for _ in range(count))
+
+
+def _lognormal(rng, base, spread, count, profile):
+    """Лог-нормальний: довгий "хвіст" повільних кліків, як у людини"""
+    cv = spread / math.sqrt(3)
+    sigma = math.sqrt(math.log(1.0 + cv * cv))
+    mu = math.log(base) - sigma * sigma / 2
+    lognorm = rng.lognormvariate
+    return (lognorm(mu, sigma) for _ in range(count))
+
+
+def _profile(rng, base, spread, count, profile):
+    """
+    Записаний профіль людини: вибірка з нормованих (середнє = 1) інтервалів.
+    spread масштабує відхилення від середнього (1.0 - природний розкид профілю).
+    """
+    if not profile:
+        return _uniform(rng, base, spread, count, profile)
+    choice = rng.choice
+    return (base * (1.0 + (choice(profile) - 1.0) * spread) for _ in range(count))
+
+
+DISTRIBUTIONS = {
+    "uniform": _uniform,
+    "gaussian": _gaussian,
+    "lognormal": _lognormal,
+    "profile": _profile,
+}
+
+
+class DelayStream:
+    """
+    Потік попередньо згенерованих затримок між кліками.
+
+    Затримки генеруються блоками по DELAY_BLOCK_SIZE у компактний array('d'),
+    тож гарячий цикл лише читає наступне значення. Блок перегенеровується
+    лише коли змінюються параметри (cps, рандомність, розподіл, профіль)
+    або коли він вичерпаний.
+
+    configure() можна викликати з іншого потоку: він лише атомарно підміняє
+    кортеж параметрів, а перегенерацію виконує потік, що читає next().
+    """
+    def __init__(self, cps, randomness_pct, distribution=DEFAULT_DISTRIBUTION,
+                 seed=None, block_size=DELAY_BLOCK_SIZE):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Невідомий розподіл: {distribution}")
+
+        self.block_size = block_size
+        self._rng = random.Random(seed)
+        self._profile = ()
+        self._params = (cps, randomness_pct, distribution, self._profile)
+        self._buffer_params = None
+        self._buffer = array("d")
+        self._pos = 0
+
+    def seed(self, seed):
+        """Перезапускає RNG з новим сідом (для відтворюваних прогонів)"""
+        self._rng.seed(seed)
+        self._buffer_params = None
+
+    def configure(self, cps=None, randomness_pct=None, distribution=None):
+        """
+        Змінює параметри потоку. Блок буде перегенеровано лише якщо
+        параметри дійсно змінилися.
+        """
+        old_cps, old_pct, old_dist, profile = self._params
+        params = (
+            old_cps if cps is None else cps,
+            old_pct if randomness_pct is None else randomness_pct,
+            old_dist if distribution is None else distribution,
+            profile,
+        )
+        if params[2] not in DISTRIBUTIONS:
+            raise ValueError(f"Невідомий розподіл: {params[2]}")
+        if params != self._params:
+            self._params = params
+
+    def load_profile(self, intervals):
+        """
+        Завантажує записані інтервали людини (секунди) для розподілу "profile".
+        Інтервали нормуються до середнього 1.0.
+        """
+        intervals = [float(i) for i in intervals if i > 0]
+        if not intervals:
+            raise ValueError("Профіль не містить додатних інтервалів")
+
+        mean = sum(intervals) / len(intervals)
+        cps, pct, dist, _ = self._params
+        self._params = (cps, pct, dist, tuple(i / mean for i in intervals))
+
+    def _refill(self, params):
+        """Генерує новий блок затримок для заданих параметрів"""
+        cps, pct, dist, profile = params
+        if cps <= 0:
+            cps = 0.1
+
+        base = 1.0 / cps
+        spread = pct / 100.0
+        if spread > 0:
+            values = DISTRIBUTIONS[dist](self._rng, base, spread, self.block_size, profile)
+            self._buffer = array("d", (v if v > MIN_DELAY else MIN_DELAY for v in values))
+        else:
+            self._buffer = array("d", [max(MIN_DELAY, base)]) * self.block_size
+
+        self._buffer_params = params
+        self._pos = 0
+
+    def next(self):
+        """Наступна затримка (секунди)"""
+        params = self._params
+        if params is not self._buffer_params or self._pos >= len(self._buffer):
+            self._refill(params)
+
+        value = self._buffer[self._pos]
+        self._pos += 1
+        return value
+
+    def take(self, count):
+        """Наступні count затримок списком (для пакетного режиму)"""
+        return [self.next() for _ in range(count)]
@@ -1,12 +1,396 @@
+import os
+import sys
 import threading
 import time
-import random
-import pyautogui
+from bisect import bisect_left
 from src.config import (
-    DEFAULT_CPS, DEFAULT_RANDOMNESS, DEFAULT_BUTTON, DEFAULT_HOTKEY,
-    CPS_MIN, CPS_MAX, RANDOMNESS_MIN, RANDOMNESS_MAX, VALID_BUTTONS,
-    MIN_DELAY, IDLE_SLEEP
+    ERROR_BACKOFF, DEFAULT_BACKEND, BATCH_WINDOW, MAX_BATCH_SIZE, TRACE_RING_SIZE,
+    RATE_CONTROL, MOTION_BUDGET, CPS_MAX
 )
+from src.clock import SYSTEM_CLOCK
+from src.delays import DelayStream
+from src.log import get_logger
+from src.rate import RateController
+from src.scheduler import DeadlineScheduler
+from src.settings import EngineSettings, validate_setting
+from src.telemetry import Telemetry
+
+log = get_logger("engine")
+
+
+# --- Бекенди кліків ---
+
+class ClickBackend:
+    """
+    Базовий інтерфейс бекенду кліків.
+
+    Нащадки реалізують _click(button) та is_available(). Кожен бекенд сам
+    вимірює вартість кліку - середнє за всі кліки з моменту створення
+    (cost_ns), а до першого кліку звітує NOMINAL_COST_NS.
+
+    NOMINAL_COST_NS - апріорна оцінка за обсягом роботи на клік (виклики
+    ctypes, шари бібліотеки, перевірки позиції), а не вимір: лише за нею
+    "auto" впорядковує бекенди, бо пробний вимір означав би справжні кліки.
+
+    MAX_CPS - найвищий CPS, який бекенд витримує стабільно: вищий
+    target_cps двигун обмежує до нього (налаштування не змінюються).
+    """
+    name = "base"
+    NOMINAL_COST_NS = 1_000_000
+    MAX_CPS = CPS_MAX
+
+    def __init__(self):
+        self._cost_total_ns = 0
+        self._cost_clicks = 0
+
+    @classmethod
+    def is_available(cls):
+        """Чи можна використати бекенд у поточному оточенні"""
+        return False
+
+    def click(self, button):
+        """Клік з виміром власної вартості"""
+        start = time.perf_counter_ns()
+        self._click(button)
+        self._cost_total_ns += time.perf_counter_ns() - start
+        self._cost_clicks += 1
+
+    def click_at(self, x, y, button):
+        """Переміщення в (x, y) і клік одним викликом бекенду, з виміром вартості"""
+        start = time.perf_counter_ns()
+        self._click_at(x, y, button)
+        self._cost_total_ns += time.perf_counter_ns() - start
+        self._cost_clicks += 1
+
+    def move(self, x, y):
+        """Переміщення курсора без кліку (точки траєкторії, вартість не рахується)"""
+        self._move(x, y)
+
+    def _click(self, button):
+        raise NotImplementedError
+
+    def _click_at(self, x, y, button):
+        raise NotImplementedError
+
+    def _move(self, x, y):
+        raise NotImplementedError
+
+    @property
+    def cost_ns(self):
+        """Середня вартість кліку за весь час роботи бекенду (або номінальна до першого кліку)"""
+        if self._cost_clicks == 0:
+            return self.NOMINAL_COST_NS
+        return self._cost_total_ns // self._cost_clicks
+
+
+class PyAutoGUIBackend(ClickBackend):
+    """Класичний шлях через pyautogui (без паузи pyautogui.PAUSE)"""
+    name = "pyautogui"
+    NOMINAL_COST_NS = 500_000
+    MAX_CPS = 100.0  # mouseDown + mouseUp з перевірками позиції на кожен клік
+
+    def __init__(self):
+        super().__init__()
+        import pyautogui
+        # Захист від вильоту при наведенні в кут екрана
+        pyautogui.FAILSAFE = False
+        self._pyautogui = pyautogui
+
+    @classmethod
+    def is_available(cls):
+        try:
+            import pyautogui  # noqa: F401
+        except Exception:
+            return False
+        return True
+
+    def _click(self, button):
+        # _pause=False: інакше кожен клік додає pyautogui.PAUSE (0.1 с)
+        self._pyautogui.click(button=button, _pause=False)
+
+    def _click_at(self, x, y, button):
+        self._pyautogui.click(x, y, button=button, _pause=False)
+
+    def _move(self, x, y):
+        self._pyautogui.moveTo(x, y, _pause=False)
+
+
+class PynputBackend(ClickBackend):
+    """Клік через pynput.mouse.Controller (вже є в залежностях)"""
+    name = "pynput"
+    NOMINAL_COST_NS = 100_000
+    MAX_CPS = 500.0
+
+    def __init__(self):
+        super().__init__()
+        from pynput import mouse
+        self._controller = mouse.Controller()
+        self._buttons = {
+            "left": mouse.Button.left,
+            "right": mouse.Button.right,
+            "middle": mouse.Button.middle,
+        }
+
+    @classmethod
+    def is_available(cls):
+        try:
+            from pynput import mouse  # noqa: F401
+        except Exception:
+            return False
+        return True
+
+    def _click(self, button):
+        self._controller.click(self._buttons[button])
+
+    def _click_at(self, x, y, button):
+        self._controller.position = (x, y)
+        self._controller.click(self._buttons[button])
+
+    def _move(self, x, y):
+        self._controller.position = (x, y)
+
+
+class XTestBackend(ClickBackend):
+    """
+    Прямий виклик XTestFakeButtonEvent через ctypes (Linux/X11).
+    Оминає всю логіку позиціонування та пауз вищих бібліотек.
+    """
+    name = "xtest"
+    NOMINAL_COST_NS = 20_000
+
+    _BUTTONS = {"left": 1, "middle": 2, "right": 3}
+
+    def __init__(self):
+        super().__init__()
+        import ctypes
+        import ctypes.util
+        self._xlib = ctypes.cdll.LoadLibrary(self._library_path("X11"))
+        self._xtst = ctypes.cdll.LoadLibrary(self._library_path("Xtst"))
+        self._xlib.XOpenDisplay.restype = ctypes.c_void_p
+        self._xlib.XFlush.argtypes = [ctypes.c_void_p]
+        self._xtst.XTestFakeButtonEvent.argtypes = [
+            ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_ulong
+        ]
+        self._xtst.XTestFakeMotionEvent.argtypes = [
+            ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_ulong
+        ]
+
+        self._display = self._xlib.XOpenDisplay(None)
+        if not self._display:
+            raise RuntimeError("Не вдалося відкрити X11 дисплей")
+
+    @staticmethod
+    def _library_path(name):
+        # LoadLibrary(None) завантажив би саму програму, і помилка вилізла б
+        # лише як "undefined symbol" при першому кліку
+        import ctypes.util
+        path = ctypes.util.find_library(name)
+        if path is None:
+            raise RuntimeError(f"Бібліотеку lib{name} не знайдено (потрібна для бекенду xtest)")
+        return path
+
+    @classmethod
+    def is_available(cls):
+        if not sys.platform.startswith("linux") or not os.environ.get("DISPLAY"):
+            return False
+        import ctypes.util  # find_library тягне subprocess - лише для цього бекенду
+        return bool(ctypes.util.find_library("X11") and ctypes.util.find_library("Xtst"))
+
+    def _click(self, button):
+        code = self._BUTTONS[button]
+        self._xtst.XTestFakeButtonEvent(self._display, code, True, 0)
+        self._xtst.XTestFakeButtonEvent(self._display, code, False, 0)
+        self._xlib.XFlush(self._display)
+
+    def _click_at(self, x, y, button):
+        code = self._BUTTONS[button]
+        # screen=-1: поточний екран
+        self._xtst.XTestFakeMotionEvent(self._display, -1, x, y, 0)
+        self._xtst.XTestFakeButtonEvent(self._display, code, True, 0)
+        self._xtst.XTestFakeButtonEvent(self._display, code, False, 0)
+        self._xlib.XFlush(self._display)
+
+    def _move(self, x, y):
+        self._xtst.XTestFakeMotionEvent(self._display, -1, x, y, 0)
+        self._xlib.XFlush(self._display)
+
+
+class NullBackend(ClickBackend):
+    """
+    Бекенд без реальних кліків для тестів та бенчмарків.
+    Записує (час, button) кожного кліку у self.clicks, координати
+    click_at() - у self.positions, а move() - у self.moves як (час, x, y).
+    Час - clock.now_ns() (perf_counter_ns або віртуальний у симуляції).
+    """
+    name = "null"
+    NOMINAL_COST_NS = 0
+
+    def __init__(self, record=True, clock=SYSTEM_CLOCK):
+        super().__init__()
+        self.record = record
+        self._now = clock.now_ns
+        self.clicks = []
+        self.positions = []
+        self.moves = []
+
+    @classmethod
+    def is_available(cls):
+        return True
+
+    def _move(self, x, y):
+        if self.record:
+            self.moves.append((self._now(), x, y))
+
+    def _click(self, button):
+        if self.record:
+            self.clicks.append((self._now(), button))
+
+    def _click_at(self, x, y, button):
+        if self.record:
+            self.clicks.append((self._now(), button))
+            self.positions.append((x, y))
+
+
+# Бекенди, з яких обирається "auto" (null ніколи не обирається автоматично)
+BACKENDS = {
+    XTestBackend.name: XTestBackend,
+    PynputBackend.name: PynputBackend,
+    PyAutoGUIBackend.name: PyAutoGUIBackend,
+    NullBackend.name: NullBackend,
+}
+
+
+def available_backends():
+    """Назви доступних бекендів за зростанням NOMINAL_COST_NS (оцінка, не вимір)"""
+    names = [name for name, cls in BACKENDS.items() if cls.is_available()]
+    return sorted(names, key=lambda name: BACKENDS[name].NOMINAL_COST_NS)
+
+
+def create_backend(name=DEFAULT_BACKEND):
+    """
+    Створює бекенд за назвою. Для "auto" обирає доступний (крім null)
+    з найменшою NOMINAL_COST_NS, переходячи до наступного, якщо
+    ініціалізація не вдалася. Вибір не вимірює бекенди: пробні кліки
+    натиснули б кнопку миші під курсором. Фактичну вартість видно
+    в cost_ns (get_stats()/get_telemetry()) після перших кліків.
+
+    Raises:
+        RuntimeError: названий бекенд невідомий, недоступний (нема бібліотеки,
+            дисплея) або не ініціалізувався; для "auto" - жоден не доступний
+    """
+    if name != "auto":
+        cls = BACKENDS.get(name)
+        if cls is None:
+            raise RuntimeError(f"Невідомий бекенд '{name}', доступні: {available_backends()}")
+        if not cls.is_available():
+            raise RuntimeError(
+                f"Бекенд '{name}' недоступний на цій системі, доступні: {available_backends()}"
+            )
+        try:
+            return cls()
+        except RuntimeError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Бекенд '{name}' не ініціалізовано: {e}") from e
+
+    for candidate in available_backends():
+        if candidate == NullBackend.name:
+            continue
+        try:
+            backend = BACKENDS[candidate]()
+        except Exception as e:
+            log.warning("Бекенд '%s' недоступний: %s", candidate, e)
+            continue
+        log.info("Обрано бекенд '%s'", candidate, extra={"backend": candidate})
+        return backend
+
+    raise RuntimeError("Немає жодного доступного бекенду кліків")
+
+
+def plan_batch(settings, delays, max_cps=CPS_MAX):
+    """
+    Планує групу кліків на одне пробудження.
+
+    Нижче порогу batch_threshold_cps група складається з одного кліку.
+    Вище - з round(cps * BATCH_WINDOW) кліків зі звичайними затримками
+    з DelayStream: двигун чекає кожен клік групи на власному піддедлайні
+    (group_offsets), тож і середній CPS, і розподіл інтервалів між
+    кліками такі самі, як в одиночному режимі. Економиться лише робота
+    на пробудження (знімок налаштувань, телеметрія, регулятор).
+
+    Args:
+        settings: знімок EngineSettings, прочитаний на це пробудження
+        delays: DelayStream, налаштований під цей знімок
+        max_cps: межа бекенду (ClickBackend.MAX_CPS)
+
+    Returns:
+        tuple: (кількість кліків, сумарна затримка до наступної групи,
+        затримки кліків групи або None для одиночного кліку)
+    """
+    cps = min(settings.target_cps, max_cps)
+    if cps < settings.batch_threshold_cps:
+        return 1, delays.next(), None
+
+    count = min(MAX_BATCH_SIZE, max(1, round(cps * BATCH_WINDOW)))
+    if count == 1:
+        return 1, delays.next(), None
+    gaps = delays.take(count)
+    return count, sum(gaps), gaps
+
+
+def group_offsets(gaps, delay):
+    """
+    Піддедлайни кліків групи: зсуви від дедлайну групи (нс).
+
+    Затримки gaps масштабуються так, щоб група тривала delay секунд
+    (після корекції регулятора), перший клік - на самому дедлайні.
+    """
+    scale = delay * 1e9 / sum(gaps)
+    offsets = []
+    elapsed = 0.0
+    for gap in gaps:
+        offsets.append(round(elapsed * scale))
+        elapsed += gap
+    return offsets
+
+
+def make_run_limits(count=None, duration=None, at=None, clock=SYSTEM_CLOCK):
+    """
+    Перевіряє обмеження серії та переводить їх у (max_clicks, duration, start_ns).
+
+    Час старту at (епоха) перераховується в perf_counter_ns один раз тут,
+    далі планувальник працює лише з монотонним годинником.
+
+    Returns:
+        tuple або None, якщо обмежень немає
+    """
+    if count is None and duration is None and at is None:
+        return None
+    if count is not None and (isinstance(count, bool) or not isinstance(count, int) or count <= 0):
+        raise ValueError("Кількість кліків має бути додатним цілим числом")
+    if duration is not None and not (isinstance(duration, (int, float)) and duration > 0):
+        raise ValueError("Тривалість має бути додатним числом секунд")
+
+    start_ns = None
+    if at is not None:
+        if not isinstance(at, (int, float)):
+            raise ValueError("Час старту має бути часом епохи (секунди)")
+        offset = at - clock.wall()
+        if offset > 0:
+            start_ns = clock.now_ns() + int(offset * 1e9)
+    return count, duration, start_ns
+
+
+def describe_run_limits(count=None, duration=None, at=None):
+    """Короткий опис обмежень для логу"""
+    parts = []
+    if count is not None:
+        parts.append(f"{count} кліків")
+    if duration is not None:
+        parts.append(f"{duration:g} с")
+    if at is not None:
+        parts.append("о " + time.strftime("%H:%M:%S", time.localtime(at)))
+    return f" ({', '.join(parts)})" if parts else ""
 
 
 class ClickerEngine(threading.Thread):
@@ -16,21 +400,72 @@ class ClickerEngine(threading.Thread):
     
     Thread-safe завдяки threading.Lock() для критичних секцій.
     """
-    def __init__(self):
+    def __init__(self, backend=None, seed=None, realtime=None, clock=SYSTEM_CLOCK):
         super().__init__()
         self.daemon = True
+
+        # Бекенд кліків: екземпляр ClickBackend, назва або None ("auto")
+        if backend is None or isinstance(backend, str):
+            backend = create_backend(backend or DEFAULT_BACKEND)
+        self.backend = backend
         
+        # Джерело часу та очікувань: SystemClock або VirtualClock (src/simulation.py)
+        self.clock = clock
+
         # Thread-safe флаги з локами
         self._lock = threading.Lock()
         self._clicking = False
         self._running = True
+
+        # Подія пробудження потоку: start/stop/налаштування/stop_engine
+        # будять run() одразу, без опитування
+        self._wake = threading.Event()
         
-        # Налаштування (словник безпечний для простих присвоєнь під GIL)
-        self.settings = {
-            "target_cps": DEFAULT_CPS,
-            "randomness_pct": DEFAULT_RANDOMNESS,
-            "button": DEFAULT_BUTTON,
-        }
+        # Налаштування: незмінний знімок, що підміняється цілком
+        # (запис під _lock, читання в run() - без локів)
+        self._settings = EngineSettings()
+
+        # Попередньо згенеровані затримки (seed - для відтворюваних прогонів)
+        self.delays = DelayStream(
+            self._settings.target_cps, self._settings.randomness_pct,
+            self._settings.distribution, seed=seed
+        )
+
+        # Планувальник на абсолютних дедлайнах (використовується лише потоком run)
+        self.scheduler = DeadlineScheduler(clock=clock)
+
+        # Живі лічильники для GUI (пише лише run, читає будь-хто)
+        self.telemetry = Telemetry(clock=clock)
+
+        # Опційне трасування кожного кліку (None - вимкнено, нуль витрат)
+        self.trace = None
+
+        # PI-регулятор фактичного CPS (None - вимкнено)
+        self.rate = RateController() if RATE_CONTROL else None
+
+        # Режим серії: (max_clicks, duration, start_ns) або None - без обмежень.
+        # Номер серії змінюється на кожен новий старт, щоб run() скинув планувальник
+        self._run_limits = None
+        self._series = 0
+
+        # Викликається потоком двигуна, коли серія з обмеженням завершилась
+        self.on_finished = None
+
+        # Опційний рух курсора між цілями плану (None - кліки "стрибком")
+        self.motion = None
+        self._cursor = None  # остання відома позиція курсора (x, y)
+        self._pending_target = None  # (plan, x, y) - ціль, до якої вже рухаємось
+
+        # Опційні налаштування потоку (RealtimeOptions): affinity, пріоритет,
+        # timer slack - на старті потоку, GC - на час кожної серії
+        self.realtime = realtime
+        self.realtime_status = {}  # {опція: "ok" або причина} після старту потоку
+        self._gc_guard = None
+
+    @property
+    def settings(self):
+        """Поточний знімок налаштувань (EngineSettings, доступ як до словника)"""
+        return self._settings
 
     def update_settings(self, key, value):
         """
@@ -43,95 +478,470 @@ class ClickerEngine(threading.Thread):
         Returns:
             bool: True якщо оновлення успішне, False якщо валідація не пройшла
         """
-        # Валідація
-        if key == "target_cps":
-            if not (CPS_MIN <= value <= CPS_MAX):
-                print(f"[Engine] Помилка: CPS має бути від {CPS_MIN} до {CPS_MAX}")
-                return False
-        elif key == "randomness_pct":
-            if not (RANDOMNESS_MIN <= value <= RANDOMNESS_MAX):
-                print(f"[Engine] Помилка: Рандомність має бути від {RANDOMNESS_MIN} до {RANDOMNESS_MAX}%")
-                return False
-        elif key == "button":
-            if value not in VALID_BUTTONS:
-                print(f"[Engine] Помилка: кнопка має бути однією з {VALID_BUTTONS}")
+        return self.update_settings_many({key: value})
+
+    def update_settings_many(self, changes):
+        """
+        Атомарно застосовує кілька налаштувань одним новим знімком.
+
+        Усе або нічого: якщо хоч одне значення невалідне, знімок не змінюється.
+        Значення, що не змінилися, не створюють нового знімка, тож "шторм"
+        подій від слайдера з тими самими значеннями нічого не коштує двигуну.
+
+        Args:
+            changes: словник {назва параметра: нове значення}
+
+        Returns:
+            bool: True якщо оновлення успішне, False якщо валідація не пройшла
+        """
+        for key, value in changes.items():
+            error = validate_setting(key, value)
+            if error:
+                log.error("Помилка: %s", error)
                 return False
-        
-        self.settings[key] = value
+
+        with self._lock:
+            old = self._settings
+            changed = {k: v for k, v in changes.items() if old[k] != v}
+            if not changed:
+                return True
+            self._settings = old.replace(**changed)
+
+            # Будимо потік лише коли поточний інтервал став задовгим (CPS зріс);
+            # решту змін run() підхопить на наступній групі кліків
+            if self._settings.target_cps > old.target_cps:
+                self._wake.set()
         return True
 
-    def start_clicking(self):
-        """Запуск клікання з thread-safe локом"""
+    def start_clicking(self, count=None, duration=None, at=None):
+        """
+        Запуск клікання з thread-safe локом.
+
+        Без аргументів - клікати до stop_clicking(). Обмеження виконує сам
+        планувальник у потоці двигуна (не GUI), після чого викликається on_finished.
+
+        Args:
+            count: рівно стільки кліків, потім стоп
+            duration: клікати стільки секунд (монотонний годинник)
+            at: почати в цей момент (час епохи, clock.wall())
+
+        Raises:
+            ValueError: некоректні обмеження
+        """
+        limits = make_run_limits(count, duration, at, self.clock)
         with self._lock:
+            if limits is not None or not self._clicking:
+                self._series += 1  # нова серія
+            self._run_limits = limits
             self._clicking = True
-        print("[Engine] Старт клікання")
+            self._wake.set()
+        log.info("Старт клікання%s", describe_run_limits(count, duration, at))
 
     def stop_clicking(self):
         """Зупинка клікання з thread-safe локом"""
         with self._lock:
             self._clicking = False
-        print("[Engine] Стоп клікання")
+            self._run_limits = None
+            self._wake.set()
+        log.info("Стоп клікання")
 
     def toggle(self):
         """Toggle режим клікання, повертає новий стан"""
         with self._lock:
             self._clicking = not self._clicking
             result = self._clicking
+            self._run_limits = None
+            if result:
+                self._series += 1
+            self._wake.set()
         
-        if result:
-            print("[Engine] Старт клікання")
-        else:
-            print("[Engine] Стоп клікання")
+        log.info("Старт клікання" if result else "Стоп клікання")
         
         return result
 
+    def is_clicking(self):
+        """Поточний стан клікання (thread-safe)"""
+        with self._lock:
+            return self._clicking
+
     def stop_engine(self):
         """Повна зупинка потоку перед виходом"""
         with self._lock:
             self._clicking = False
             self._running = False
+            self._wake.set()
 
-    def _calculate_delay(self):
+    def _finish_run(self, series):
+        """Завершує серію з обмеженням (потік двигуна)"""
+        with self._lock:
+            if self._series != series:
+                return  # поки чекали, почалася нова серія
+            self._clicking = False
+            self._run_limits = None
+        stats = self.scheduler.stats()
+        log.info("Серію завершено: %d кліків", stats["clicks"], extra={"clicks": stats["clicks"]})
+        callback = self.on_finished
+        if callback is not None:
+            callback()
+
+    def set_plan(self, plan):
         """
-        Розраховує затримку між кліками на основі CPS та рандому.
-        Рандомність застосовується як ±% від базової затримки.
+        Підміняє план цілей на льоту, без зупинки потоку
+        (план - частина знімка налаштувань).
+
+        Args:
+            plan: ClickPlan або None (клікати в поточній позиції курсора)
         """
-        cps = self.settings["target_cps"]
-        if cps <= 0:
-            cps = 0.1
-        
-        base_delay = 1.0 / cps
-        random_pct = self.settings["randomness_pct"] / 100.0
-        
-        if random_pct > 0:
-            variation = base_delay * random_pct
-            min_delay = base_delay - variation
-            max_delay = base_delay + variation
-            return max(MIN_DELAY, random.uniform(min_delay, max_delay))
-        else:
-            return base_delay
+        log.info("План цілей: %d цілей", len(plan.targets) if plan else 0)
+        return self.update_settings_many({"plan": plan})
+
+    def set_backend(self, backend):
+        """
+        Підміняє бекенд кліків одним присвоєнням (потік не перезапускається).
+
+        Args:
+            backend: екземпляр ClickBackend або назва ("auto" - найшвидший)
+        """
+        if isinstance(backend, str):
+            if backend == "auto" or backend == self.backend.name:
+                return self.backend
+            backend = create_backend(backend)
+        self.backend = backend
+        log.info("Бекенд: '%s'", backend.name, extra={"backend": backend.name})
+        return backend
+
+    def apply_profile(self, profile):
+        """
+        Застосовує профіль: бекенд (якщо інший), а потім налаштування разом
+        з планом - одним новим знімком. Планувальник не скидається, тож
+        поточний дедлайн не губиться.
+
+        Returns:
+            bool: True якщо профіль застосовано
+        """
+        try:
+            self.set_backend(profile.backend)
+        except Exception as e:
+            log.error("Помилка: бекенд профілю '%s' недоступний: %s", profile.name, e)
+            return False
+
+        if not self.update_settings_many(profile.settings):
+            return False
+        log.info("Профіль '%s'", profile.name)
+        return True
+
+    def load_delay_profile(self, intervals):
+        """Завантажує записані інтервали людини для розподілу "profile" """
+        self.delays.load_profile(intervals)
+
+    def _plan_batch(self, settings):
+        """Група кліків на це пробудження (див. plan_batch)"""
+        return plan_batch(settings, self.delays, self.backend.MAX_CPS)
+
+    def _effective_cps(self, settings):
+        """Цільовий CPS з урахуванням межі бекенду"""
+        return min(settings.target_cps, self.backend.MAX_CPS)
+
+    def _limit_group(self, count, offsets):
+        """Обрізає групу за max_clicks та кінцем тривалості серії"""
+        remaining = self.scheduler.remaining()
+        if remaining is not None and count > remaining:
+            count = remaining
+        end_ns = self.scheduler.end_ns
+        if offsets is not None and end_ns is not None:
+            # Піддедлайни на межі тривалості чи пізніше вже не клікаються
+            count = min(count, bisect_left(offsets, end_ns - self.scheduler.deadline))
+        return count
+
+    def get_stats(self):
+        """
+        Виміряна статистика поточної серії кліків у порівнянні з цільовою.
+
+        Returns:
+            dict: target_cps, achieved_cps, jitter_ms та інші поля
+            DeadlineScheduler.stats()
+        """
+        stats = self.scheduler.stats()
+        stats["target_cps"] = self._settings.target_cps
+        stats["backend"] = self.backend.name
+        stats["backend_max_cps"] = self.backend.MAX_CPS
+        stats["backend_cost_ms"] = self.backend.cost_ns / 1e6
+        if self.rate is not None:
+            stats.update(self.rate.stats())
+        if self.realtime_status:
+            stats["realtime"] = dict(self.realtime_status)
+        return stats
+
+    def get_telemetry(self):
+        """
+        Живі показники для GUI: ковзний CPS, джитер, лічильники, вартість бекенду.
+        Не бере локів - безпечно викликати з будь-якого потоку.
+        """
+        telemetry = self.telemetry.snapshot()
+        telemetry["backend"] = self.backend.name
+        telemetry["backend_ms"] = self.backend.cost_ns / 1e6
+        rate = self.rate
+        telemetry["unreachable"] = rate.reason if rate is not None and rate.unreachable else None
+        return telemetry
+
+    def enable_tracing(self, size=TRACE_RING_SIZE, profile=False):
+        """
+        Вмикає трасування кліків (дедлайн / dispatch / повернення бекенду).
+
+        Args:
+            size: розмір кільцевого буфера (останні size кліків)
+            profile: додатково cProfile навколо викликів бекенду
+
+        Returns:
+            ClickTrace: буфер трасування (export()/summary())
+        """
+        from src.tracing import ClickTrace  # cProfile/csv - лише коли трасування потрібне
+        self.trace = ClickTrace(size, profile)
+        log.info("Трасування увімкнено (%d кліків)", size)
+        return self.trace
+
+    def disable_tracing(self):
+        """Вимикає трасування, повертає зібраний ClickTrace (або None)"""
+        trace, self.trace = self.trace, None
+        return trace
+
+    def set_rate_control(self, enabled):
+        """Вмикає/вимикає PI-регулятор CPS (діє з наступної групи кліків)"""
+        if enabled and self.rate is None:
+            rate = RateController()
+            rate.reset(self._effective_cps(self._settings), self.backend.MAX_CPS)
+            self.rate = rate
+        elif not enabled:
+            self.rate = None
+
+    def enable_motion(self, planner=None):
+        """
+        Вмикає плавний рух курсора між цілями плану.
+
+        Args:
+            planner: MotionPlanner (None - з налаштуваннями за замовчуванням)
+
+        Returns:
+            MotionStream: поточний рух (stats())
+        """
+        from src.motion import MotionPlanner, MotionStream
+        self.motion = MotionStream(planner or MotionPlanner())
+        log.info("Рух курсора увімкнено")
+        return self.motion
+
+    def disable_motion(self):
+        self.motion = None
+
+    def _next_target(self, plan):
+        """Ціль наступного кліку: та, до якої вже ведемо курсор, або наступна з плану"""
+        pending = self._pending_target
+        if pending is not None:
+            self._pending_target = None
+            if pending[0] is plan:
+                return pending[1], pending[2]
+        return plan.next()
+
+    def _start_motion(self, motion, plan, count):
+        """Після кліку: обирає наступну ціль і веде до неї курсор до наступного дедлайну"""
+        cursor = self._cursor
+        if plan is None or count != 1 or cursor is None:
+            motion.cancel()  # у пакетному режимі рухатись ніколи
+            return
+        x, y = plan.next()
+        self._pending_target = (plan, x, y)
+        now = self.clock.now_ns()
+        budget = (self.scheduler.deadline - now) / 1e9 * MOTION_BUDGET
+        motion.start(cursor[0], cursor[1], x, y, now, budget)
+
+    def _emit(self, settings, count, deadline, offsets=None):
+        """
+        Група кліків без трасування (звичайний гарячий шлях).
+
+        Перший клік - одразу (дедлайн групи вже настав), кожен наступний
+        чекає свого піддедлайну deadline + offsets[i].
+
+        Returns:
+            int: скільки кліків виконано (менше count, якщо очікування перервали)
+        """
+        backend = self.backend
+        button = settings.button
+        plan = settings.plan
+        wait_until = self.clock.wait_until
+        wake = self._wake
+        spin_ns = self.scheduler.spin_ns
+
+        for i in range(count):
+            if i and wait_until(deadline + offsets[i], wake, spin_ns) is None:
+                return i
+            if plan is None:
+                backend.click(button)
+            else:
+                x, y = self._next_target(plan)
+                backend.click_at(x, y, button)
+                self._cursor = (x, y)
+        return count
+
+    def _emit_traced(self, trace, deadline, settings, count, offsets=None):
+        """Як _emit, але з фіксацією часу кожного виклику бекенду"""
+        backend = self.backend
+        button = settings.button
+        plan = settings.plan
+        profiler = trace.profiler
+        clock = self.clock.now_ns
+        wait_until = self.clock.wait_until
+        wake = self._wake
+        spin_ns = self.scheduler.spin_ns
+
+        for i in range(count):
+            target = deadline
+            if i:
+                target += offsets[i]
+                if wait_until(target, wake, spin_ns) is None:
+                    return i
+            if plan is not None:
+                x, y = self._next_target(plan)
+                self._cursor = (x, y)
+            dispatched = clock()
+            if profiler is not None:
+                profiler.enable()
+            if plan is None:
+                backend.click(button)
+            else:
+                backend.click_at(x, y, button)
+            if profiler is not None:
+                profiler.disable()
+            trace.record(target, dispatched, clock())
+        return count
 
     def run(self):
-        """Головний цикл потоку з обробкою помилок"""
-        print("[Engine] Потік запущено")
+        """
+        Головний цикл потоку з обробкою помилок.
+
+        Цикл керується подією _wake: у простої потік спить без таймауту,
+        а очікування дедлайну перериваються start/stop/налаштуваннями.
+        """
+        log.info("Потік запущено")
+        if self.realtime is not None:
+            from src.realtime import GCGuard, apply_thread_options
+            self.realtime_status = apply_thread_options(self.realtime)
+            self._gc_guard = GCGuard(self.realtime.gc)
+        gc_guard = self._gc_guard
+        clock = self.clock
+        current_series = 0
+        settings_version = -1
+        configured_backend = None
         
         while True:
             with self._lock:
                 if not self._running:
                     break
                 clicking = self._clicking
+                series = self._series
+                limits = self._run_limits
+                # Очищуємо під локом: зміни стану після цього знову встановлять подію
+                self._wake.clear()
             
             if clicking:
+                if series != current_series:
+                    # Нова серія: перший клік одразу (або о запланованій порі),
+                    # статистика з нуля. Збирання GCGuard - до першого дедлайну
+                    if gc_guard is not None:
+                        gc_guard.enter()
+                    if limits is None:
+                        self.scheduler.reset()
+                    else:
+                        max_clicks, duration, start_ns = limits
+                        self.scheduler.reset(start_ns, max_clicks, duration)
+                    if self.rate is not None:
+                        self.rate.reset(self._effective_cps(self._settings), self.backend.MAX_CPS)
+                    if self.motion is not None:
+                        self.motion.cancel()
+                    self._pending_target = None
+                    current_series = series
+
+                if limits is not None and self.scheduler.expired():
+                    # Кінець тривалості - рівно о end_ns, а не на наступному дедлайні
+                    remaining = self.scheduler.remaining()
+                    if remaining is None or remaining > 0:
+                        if clock.wait_until(self.scheduler.end_ns, self._wake) is None:
+                            continue
+                    self._finish_run(series)
+                    continue
+
                 try:
-                    pyautogui.click(button=self.settings["button"])
-                    delay = self._calculate_delay()
-                    time.sleep(delay)
+                    # Точки руху курсора - на власних дедлайнах до наступного кліку
+                    motion = self.motion
+                    if (motion is not None and motion.next_ns is not None
+                            and motion.next_ns < self.scheduler.deadline):
+                        if clock.wait_until(motion.next_ns, self._wake) is not None:
+                            x, y = motion.advance()
+                            self.backend.move(x, y)
+                        continue
+
+                    now = self.scheduler.wait(self._wake)
+                    if now is None:
+                        # Розбудили: перевіряємо стан, новий CPS діє одразу
+                        self.scheduler.pull_in(1.0 / self._effective_cps(self._settings))
+                        continue
+
+                    # Один знімок налаштувань на групу кліків, без локів
+                    settings = self._settings
+                    rate = self.rate
+                    backend_changed = self.backend is not configured_backend
+                    if settings.version != settings_version or backend_changed:
+                        settings_version = settings.version
+                        configured_backend = self.backend
+                        cps = self._effective_cps(settings)
+                        if cps < settings.target_cps:
+                            log.warning("CPS %g обмежено до %g - межа бекенду '%s'",
+                                        settings.target_cps, cps, configured_backend.name)
+                        self.delays.configure(
+                            cps=cps,
+                            randomness_pct=settings.randomness_pct,
+                            distribution=settings.distribution,
+                        )
+                        if rate is not None and (rate.target_cps != cps or backend_changed):
+                            rate.reset(cps, configured_backend.MAX_CPS)
+
+                    count, delay, gaps = self._plan_batch(settings)
+                    planned_ns = int(delay * 1e9)
+                    if rate is not None:
+                        delay = rate.adjust(delay, count)
+                    offsets = None if gaps is None else group_offsets(gaps, delay)
+                    if limits is not None:
+                        count = self._limit_group(count, offsets)
+                    deadline = self.scheduler.deadline
+                    trace = self.trace
+                    if trace is None:
+                        emitted = self._emit(settings, count, deadline, offsets)
+                    else:
+                        emitted = self._emit_traced(trace, deadline, settings, count, offsets)
+                    if offsets is not None and emitted < len(offsets):
+                        # Групу обрізали чи перервали: наступний дедлайн - піддедлайн
+                        # першого невиконаного кліку, розподіл інтервалів не ламається
+                        self.scheduler.advance_ns(offsets[emitted], emitted)
+                    else:
+                        self.scheduler.advance(delay, emitted)
+                    count = emitted
+                    if motion is not None:
+                        self._start_motion(motion, settings.plan, count)
+                    self.telemetry.record(now, count)
+                    if rate is not None:
+                        rate.record(now, count, self.backend.cost_ns, planned_ns)
                 except Exception as e:
-                    print(f"[Engine] Помилка при кліканні: {e}")
+                    # Повтори тієї ж помилки приглушує RepeatFilter (src/log.py):
+                    # у лог іде одна на LOG_ERROR_INTERVAL з лічильником "repeated"
+                    self.telemetry.record_error(e)
+                    log.error("Помилка при кліканні: %s", e)
                     # Продовжуємо роботу, але з більшою затримкою
-                    time.sleep(0.1)
+                    clock.wait(self._wake, ERROR_BACKOFF)
+                    self.scheduler.rebase()
             else:
-                # Ефективне очікування коли не клікаємо
-                time.sleep(IDLE_SLEEP)
-        
-        print("[Engine] Потік завершено")
+                if gc_guard is not None:
+                    gc_guard.exit()
+                # Спимо до наступної команди - нуль пробуджень у простої
+                clock.wait(self._wake)
+
+        if gc_guard is not None:
+            gc_guard.exit()
+        log.info("Потік завершено")
@@ -0,0 +1,194 @@
+"""
+Таблиця гарячих клавіш: комбінація (клавіша + модифікатори) -> дія.
+
+Прив'язки компілюються один раз у 16 словників (по одному на кожну маску
+модифікаторів), тож обробка натискання в потоці pynput - це перевірка
+класу клавіші та один dict.get без винятків і без виділення пам'яті.
+Для звичайних клавіш, які не є гарячими, обробник повертається одразу.
+
+Формат прив'язки: "s", "f6", "ctrl+shift+x", "alt+1".
+Дії: "toggle", "start", "stop", "panic", "hold" (клікати, поки клавіша
+натиснута), "profile:<назва>" та "job:<назва>" (задача JobScheduler).
+"""
+
+MOD_CTRL = 1
+MOD_SHIFT = 2
+MOD_ALT = 4
+MOD_CMD = 8
+
+MODIFIERS = {"ctrl": MOD_CTRL, "shift": MOD_SHIFT, "alt": MOD_ALT, "cmd": MOD_CMD}
+
+# Назви спеціальних клавіш (як у pynput.keyboard.Key)
+SPECIAL_KEYS = frozenset(
+    [f"f{i}" for i in range(1, 21)] + [
+        "esc", "space", "tab", "enter", "backspace", "delete", "insert",
+        "home", "end", "page_up", "page_down", "up", "down", "left", "right",
+        "pause", "print_screen", "scroll_lock", "caps_lock", "num_lock", "menu",
+    ]
+)
+
+SIMPLE_ACTIONS = ("toggle", "start", "stop", "panic", "hold")
+# Дії з аргументом: "<префікс>:<назва>" -> handlers[префікс](назва)
+NAMED_ACTIONS = ("profile", "job")
+
+
+def parse_hotkey(spec):
+    """
+    Розбирає комбінацію на (маска модифікаторів, клавіша).
+
+    Raises:
+        ValueError: невідомий модифікатор чи клавіша
+    """
+    if not isinstance(spec, str) or not spec.strip():
+        raise ValueError("Гаряча клавіша не може бути порожньою")
+    *mods, name = spec.strip().lower().split("+")
+
+    mask = 0
+    for mod in mods:
+        bit = MODIFIERS.get(mod)
+        if bit is None:
+            raise ValueError(f"Невідомий модифікатор '{mod}' у '{spec}'")
+        mask |= bit
+
+    if len(name) == 1 and name.isprintable() and not name.isspace():
+        return mask, name
+    if name in SPECIAL_KEYS:
+        return mask, name
+    raise ValueError(f"Невідома клавіша '{name}' у '{spec}'")
+
+
+def validate_action(action):
+    """Повертає текст помилки або None"""
+    if action in SIMPLE_ACTIONS:
+        return None
+    if isinstance(action, str):
+        prefix, sep, name = action.partition(":")
+        if sep and name and prefix in NAMED_ACTIONS:
+            return None
+    return f"Невідома дія гарячої клавіші: '{action}'"
+
+
+class HotkeyDispatcher:
+    """
+    Обробники on_press/on_release для pynput.keyboard.Listener.
+
+    handlers - словник {"toggle": f, "start": f, "stop": f, "panic": f,
+    "profile": f(назва), "job": f(назва)}; "hold" використовує start/stop.
+    Потрібні лише обробники дій, що є в прив'язках. Обробники
+    викликаються прямо в потоці слухача, тож мають бути короткими
+    (методи двигуна; GUI оновлює власний кадр).
+
+    compile() будує нову таблицю та підміняє її одним присвоєнням -
+    слухача не потрібно перезапускати.
+    """
+    def __init__(self, handlers, bindings=None, key_class=None):
+        if key_class is None:
+            from pynput.keyboard import Key as key_class
+        self._key_class = key_class
+        self._handlers = handlers
+        self._mods = 0
+        self._held = {}  # клавіша -> обробник відпускання (лише для "hold")
+        self._table = [{} for _ in range(16)]
+
+        # Модифікатори ловимо за членами Key (хеш enum - дешевий)
+        self._modifier_bits = {}
+        for name, bit in MODIFIERS.items():
+            for suffix in ("", "_l", "_r", "_gr"):
+                member = getattr(key_class, name + suffix, None)
+                if member is not None:
+                    self._modifier_bits[member] = bit
+
+        if bindings:
+            self.compile(bindings)
+
+    def compile(self, bindings):
+        """
+        Компілює {комбінація: дія} у таблицю пошуку.
+
+        Raises:
+            ValueError: некоректна комбінація чи дія (стара таблиця лишається)
+        """
+        table = [{} for _ in range(16)]
+        for spec, action in bindings.items():
+            mask, name = parse_hotkey(spec)
+            error = validate_action(action)
+            if error:
+                raise ValueError(error)
+
+            entry = self._entry(action)
+            if name in SPECIAL_KEYS:
+                table[mask][getattr(self._key_class, name)] = entry
+                continue
+
+            # pynput віддає символ з урахуванням Shift і керуючий код з Ctrl,
+            # тож усі варіанти кладемо в таблицю заздалегідь
+            table[mask][name] = entry
+            table[mask][name.upper()] = entry
+            if mask & MOD_CTRL and "a" <= name <= "z":
+                table[mask][chr(ord(name) - 96)] = entry
+
+        self._table = table
+        self._held.clear()
+
+    def _entry(self, action):
+        """(обробник натискання, обробник відпускання або None)"""
+        handlers = self._handlers
+        if action == "panic":
+            stop = handlers["panic"]
+
+            def panic():
+                self.reset()
+                stop()
+            return panic, None
+        if action == "hold":
+            return handlers["start"], handlers["stop"]
+        prefix, sep, name = action.partition(":")
+        if sep:
+            switch = handlers[prefix]
+            return (lambda: switch(name)), None
+        return handlers[action], None
+
+    def on_press(self, key):
+        """Викликається потоком pynput для кожної натиснутої клавіші"""
+        if key is None:
+            return
+        if key.__class__ is self._key_class:
+            bit = self._modifier_bits.get(key)
+            if bit is not None:
+                self._mods |= bit
+                return
+            ident = key
+        else:
+            ident = key.char
+            if ident is None:
+                return
+
+        entry = self._table[self._mods].get(ident)
+        if entry is None or ident in self._held:
+            return  # не гаряча клавіша або автоповтор утримуваної
+        press, release = entry
+        if release is not None:
+            self._held[ident] = release
+        press()
+
+    def on_release(self, key):
+        if key is None:
+            return
+        if key.__class__ is self._key_class:
+            bit = self._modifier_bits.get(key)
+            if bit is not None:
+                self._mods &= ~bit
+                return
+            ident = key
+        else:
+            ident = key.char
+
+        if self._held:
+            release = self._held.pop(ident, None)
+            if release is not None:
+                release()
+
+    def reset(self):
+        """Скидає утримувані клавіші та модифікатори (panic, втрата фокусу)"""
+        self._held.clear()
+        self._mods = 0
@@ -0,0 +1,403 @@
+import heapq
+import json
+import threading
+from collections import deque
+from src.clock import SYSTEM_CLOCK
+from src.config import ERROR_BACKOFF, DEFAULT_BACKEND, MAX_CATCH_UP_CLICKS, HOTKEY_BINDINGS
+from src.delays import DelayStream
+from src.engine import create_backend
+from src.hotkeys import parse_hotkey
+from src.log import get_logger
+from src.settings import EngineSettings, decode_settings, validate_setting
+from src.telemetry import Telemetry
+
+log = get_logger("jobs")
+
+
+class ClickJob:
+    """
+    Одна незалежна задача клікання для JobScheduler.
+
+    Має власний знімок налаштувань, потік затримок, план цілей, телеметрію
+    та (необов'язково) гарячу клавішу, що її перемикає
+    (JobScheduler.start_hotkeys). Сама нічого не чекає - коли клікати,
+    вирішує спільний планувальник. clock - той самий, що в планувальника.
+
+    Raises:
+        ValueError: некоректні налаштування чи гаряча клавіша
+    """
+    def __init__(self, name, settings=None, plan=None, hotkey=None, seed=None, clock=SYSTEM_CLOCK):
+        self.name = name
+        if hotkey is not None:
+            parse_hotkey(hotkey)
+            hotkey = hotkey.strip().lower()
+        self.hotkey = hotkey
+        self.clock = clock
+        self.telemetry = Telemetry(clock=clock)
+
+        self._settings = EngineSettings()
+        self._lock = threading.Lock()
+        self._clicking = False
+        self._generation = 0  # відсікає застарілі записи в купі після stop/start
+        self._scheduler = None
+        # Пише лише потік планувальника: останній клік і поточний дедлайн
+        self._last_fire_ns = None
+        self._next_deadline_ns = None
+
+        # Запізнення диспетчеризації (для перевірки точності)
+        self.fires = 0
+        self.lateness_total_ns = 0
+        self.lateness_max_ns = 0
+
+        settings = dict(settings or {})
+        if plan is not None:
+            settings["plan"] = plan
+        if settings and not self.update_settings_many(settings):
+            raise ValueError(f"Некоректні налаштування задачі '{name}'")
+
+        self.delays = DelayStream(
+            self._settings.target_cps, self._settings.randomness_pct,
+            self._settings.distribution, seed=seed
+        )
+        self._delays_version = self._settings.version
+
+    @classmethod
+    def from_dict(cls, name, data, clock=SYSTEM_CLOCK):
+        """
+        Задача з опису {"settings": {...}, "plan": {...}, "hotkey": "f6", "seed": 1}
+        (файл --jobs, команда керування add-job).
+
+        Raises:
+            ValueError: некоректний опис, налаштування чи гаряча клавіша
+        """
+        if not isinstance(data, dict):
+            raise ValueError(f"Задача '{name}': опис має бути JSON-об'єктом")
+        settings = data.get("settings") or {}
+        if not isinstance(settings, dict):
+            raise ValueError(f"Задача '{name}': settings має бути JSON-об'єктом")
+        plan = data.get("plan")
+        if plan is not None:
+            settings = dict(settings, plan=plan)
+        return cls(name, decode_settings(settings), None, data.get("hotkey"), data.get("seed"), clock)
+
+    @property
+    def settings(self):
+        return self._settings
+
+    def update_settings_many(self, changes):
+        """Атомарна зміна налаштувань задачі (правила як у ClickerEngine)"""
+        for key, value in changes.items():
+            error = validate_setting(key, value)
+            if error:
+                log.error("'%s': Помилка: %s", self.name, error)
+                return False
+
+        with self._lock:
+            old = self._settings
+            changed = {k: v for k, v in changes.items() if old[k] != v}
+            if not changed:
+                return True
+            self._settings = old.replace(**changed)
+            faster = self._settings.target_cps > old.target_cps
+
+        # Новий CPS вище - не чекати кінця старого інтервалу
+        if faster and self._clicking and self._scheduler is not None:
+            self._scheduler._pull_in(self)
+        return True
+
+    def is_clicking(self):
+        with self._lock:
+            return self._clicking
+
+    def start(self):
+        if self._scheduler is None:
+            raise RuntimeError(f"Задача '{self.name}' не додана до планувальника")
+        with self._lock:
+            if self._clicking:
+                return
+            self._clicking = True
+        self._scheduler._enqueue(self)
+
+    def stop(self):
+        with self._lock:
+            self._clicking = False
+            self._generation += 1
+
+    def toggle(self):
+        if self.is_clicking():
+            self.stop()
+            return False
+        self.start()
+        return True
+
+    def stats(self):
+        """Телеметрія задачі + середнє/максимальне запізнення диспетчеризації"""
+        stats = self.telemetry.snapshot()
+        stats["name"] = self.name
+        stats["clicking"] = self.is_clicking()
+        stats["target_cps"] = self._settings.target_cps
+        stats["mean_lateness_ms"] = (
+            self.lateness_total_ns / self.fires / 1e6 if self.fires else 0.0
+        )
+        stats["max_lateness_ms"] = self.lateness_max_ns / 1e6
+        return stats
+
+
+def load_jobs_file(path, clock=SYSTEM_CLOCK):
+    """
+    Читає файл задач {назва: опис ClickJob.from_dict}.
+
+    Returns:
+        list: ClickJob у порядку файлу
+
+    Raises:
+        OSError: файл не прочитано
+        ValueError: некоректний JSON чи опис задачі
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not data:
+        raise ValueError(f"Файл задач має містити непорожній JSON-об'єкт {{назва: задача}}: {path}")
+    return [ClickJob.from_dict(name, raw, clock) for name, raw in data.items()]
+
+
+class JobScheduler(threading.Thread):
+    """
+    Один потік, що обслуговує багато ClickJob через купу дедлайнів.
+
+    Замість N потоків, що сплять кожен сам по собі і змагаються за GIL та
+    бекенд, дедлайни всіх задач зведені в одну купу (heapq) і кліки
+    виконуються строго в порядку дедлайнів одним бекендом.
+
+    Записи в купі: (deadline_ns, seq, generation, job). Після stop()/start()
+    задачі старі записи відкидаються за generation, без пошуку в купі.
+    Додавання з інших потоків іде через deque + подію пробудження.
+
+    Час і очікування - через clock (SystemClock або VirtualClock, як у двигуні).
+    """
+    def __init__(self, backend=None, clock=SYSTEM_CLOCK):
+        super().__init__()
+        self.daemon = True
+        self.clock = clock
+
+        if backend is None or isinstance(backend, str):
+            backend = create_backend(backend or DEFAULT_BACKEND)
+        self.backend = backend
+
+        self.jobs = {}
+        self._heap = []
+        self._seq = 0
+        self._pending = deque()
+        self._wake = threading.Event()
+        self._running = True
+
+        # Гарячі клавіші задач (start_hotkeys)
+        self.hotkeys = None
+        self.listener = None
+
+    # --- Керування задачами (з будь-якого потоку) ---
+    def add_job(self, job):
+        if job.name in self.jobs:
+            raise ValueError(f"Задача '{job.name}' вже існує")
+        if job.clock is not self.clock:
+            raise ValueError(f"Задача '{job.name}' має інший годинник, ніж планувальник")
+        if job.hotkey is not None and any(other.hotkey == job.hotkey for other in self.jobs.values()):
+            raise ValueError(f"Гаряча клавіша '{job.hotkey}' вже прив'язана до іншої задачі")
+        job._scheduler = self
+        self.jobs[job.name] = job
+        self._compile_hotkeys()
+        log.info("Додано задачу '%s'", job.name)
+        return job
+
+    def remove_job(self, name):
+        job = self.jobs.pop(name)
+        job.stop()
+        job._scheduler = None
+        self._compile_hotkeys()
+
+    def toggle_job(self, name):
+        """Перемикає задачу за назвою (дія гарячої клавіші "job:<назва>")"""
+        job = self.jobs.get(name)
+        if job is not None:
+            job.toggle()
+
+    def toggle_hotkey(self, key):
+        """Перемикає всі задачі, прив'язані до клавіші; повертає їх назви"""
+        key = key.strip().lower()
+        toggled = []
+        for job in list(self.jobs.values()):
+            if job.hotkey == key:
+                job.toggle()
+                toggled.append(job.name)
+        return toggled
+
+    def stop_all(self):
+        """Зупиняє всі задачі, потік планувальника працює далі (дія "panic")"""
+        for job in list(self.jobs.values()):
+            job.stop()
+
+    def stop_engine(self):
+        """Зупиняє всі задачі, слухача клавіш та потік планувальника"""
+        self.stop_all()
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+        self._running = False
+        self._wake.set()
+
+    # --- Гарячі клавіші задач ---
+    def hotkey_bindings(self):
+        """{комбінація: "job:<назва>"} для задач з клавішами + "panic" з HOTKEY_BINDINGS"""
+        bindings = {key: action for key, action in HOTKEY_BINDINGS.items() if action == "panic"}
+        for job in self.jobs.values():
+            if job.hotkey is not None:
+                bindings[job.hotkey] = f"job:{job.name}"
+        return bindings
+
+    def start_hotkeys(self):
+        """
+        Запускає слухача pynput: клавіша задачі перемикає її, "panic" зупиняє всі.
+        Таблиця перебудовується при add_job/remove_job без перезапуску слухача.
+        """
+        from pynput import keyboard
+        from src.hotkeys import HotkeyDispatcher
+
+        self.hotkeys = HotkeyDispatcher(
+            {"job": self.toggle_job, "panic": self.stop_all}, key_class=keyboard.Key
+        )
+        self._compile_hotkeys()
+        self.listener = keyboard.Listener(
+            on_press=self.hotkeys.on_press, on_release=self.hotkeys.on_release
+        )
+        self.listener.start()
+
+    def _compile_hotkeys(self):
+        if self.hotkeys is not None:
+            self.hotkeys.compile(self.hotkey_bindings())
+
+    def stats(self):
+        return {name: job.stats() for name, job in self.jobs.items()}
+
+    def _enqueue(self, job):
+        """Ставить задачу на негайний клік (нове покоління дедлайнів)"""
+        with job._lock:
+            job._generation += 1
+            generation = job._generation
+        self._pending.append((self.clock.now_ns(), generation, job))
+        self._wake.set()
+
+    def _pull_in(self, job):
+        """Просить потік планувальника підтягнути дедлайн задачі (CPS зріс)"""
+        self._pending.append((None, 0, job))
+        self._wake.set()
+
+    # --- Потік планувальника ---
+    def _push(self, deadline, generation, job):
+        self._seq += 1
+        job._next_deadline_ns = deadline
+        heapq.heappush(self._heap, (deadline, self._seq, generation, job))
+
+    def _drain_pending(self):
+        while self._pending:
+            deadline, generation, job = self._pending.popleft()
+            if deadline is None:
+                self._reschedule(job)
+                continue
+            job._last_fire_ns = None  # новий старт
+            self._push(deadline, generation, job)
+
+    def _reschedule(self, job):
+        """
+        Наступний клік - не пізніше ніж через новий інтервал від останнього:
+        min(поточний дедлайн, останній клік + інтервал), але не раніше
+        "зараз" (як у ClickerEngine.pull_in). Дедлайн у минулому дав би
+        кліки впритул: _fire рахує наступний від нього.
+        """
+        last = job._last_fire_ns
+        current = job._next_deadline_ns
+        if last is None or current is None or not job._clicking:
+            return  # ще не клікала - перший дедлайн і так найближчий
+        settings = job._settings
+        interval_ns = int(1e9 / min(settings.target_cps, self.backend.MAX_CPS))
+        deadline = max(last + interval_ns, self.clock.now_ns())
+        if deadline >= current:
+            return
+        with job._lock:
+            job._generation += 1
+            generation = job._generation
+        self._push(deadline, generation, job)
+
+    def _fire(self, job, deadline, now):
+        """
+        Виконує один клік задачі та повертає наступний дедлайн.
+
+        Пакетного режиму тут немає: кожен клік - окремий запис у купі,
+        тож кліки різних задач переплітаються строго за дедлайнами.
+        """
+        settings = job._settings
+        if settings.version != job._delays_version:
+            job._delays_version = settings.version
+            job.delays.configure(
+                cps=min(settings.target_cps, self.backend.MAX_CPS),
+                randomness_pct=settings.randomness_pct,
+                distribution=settings.distribution,
+            )
+
+        delay = job.delays.next()
+        plan = settings.plan
+        if plan is None:
+            self.backend.click(settings.button)
+        else:
+            x, y = plan.next()
+            self.backend.click_at(x, y, settings.button)
+
+        job.telemetry.record(now, 1)
+        job._last_fire_ns = now
+        lateness = now - deadline
+        job.fires += 1
+        job.lateness_total_ns += lateness
+        if lateness > job.lateness_max_ns:
+            job.lateness_max_ns = lateness
+
+        # Наздоганяємо не більше MAX_CATCH_UP_CLICKS інтервалів
+        interval_ns = int(delay * 1e9)
+        next_deadline = deadline + interval_ns
+        floor = now - interval_ns * MAX_CATCH_UP_CLICKS
+        return next_deadline if next_deadline > floor else floor
+
+    def run(self):
+        log.info("Планувальник запущено")
+        heap = self._heap
+        clock = self.clock
+
+        while self._running:
+            self._wake.clear()
+            self._drain_pending()
+
+            # Відкидаємо записи зупинених/перезапущених задач
+            while heap and (heap[0][2] != heap[0][3]._generation
+                            or not heap[0][3]._clicking):
+                heapq.heappop(heap)
+
+            if not heap:
+                clock.wait(self._wake)
+                continue
+
+            deadline, _, generation, job = heap[0]
+            now = clock.wait_until(deadline, self._wake)
+            if now is None:
+                continue  # нова задача/команда - переглядаємо купу
+
+            heapq.heappop(heap)
+            if generation != job._generation or not job._clicking:
+                continue
+
+            try:
+                next_deadline = self._fire(job, deadline, now)
+            except Exception as e:
+                job.telemetry.record_error(e)
+                log.error("'%s': Помилка при кліканні: %s", job.name, e)
+                next_deadline = clock.now_ns() + int(ERROR_BACKOFF * 1e9)
+            self._push(next_deadline, generation, job)
+
+        log.info("Планувальник завершено")
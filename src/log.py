@@ -0,0 +1,301 @@
+"""
+Логування: JSON-рядки, які пише окремий потік.
+
+Логери компонентів (get_logger("engine") -> "autoclicker.engine") мають
+один спільний QueueHandler: потік, що логує (двигун, GUI, pynput), лише
+кладе запис у queue.SimpleQueue (put без локів Python і без очікування),
+а QueueListener у фоновому потоці форматує й пише у потік виводу. Повільний
+термінал чи заповнений pipe гальмує тільки цей потік, а не кліки. Якщо
+черга переповнена, нові записи відкидаються й рахуються. Лічильник
+відкинутих пишеться, щойно черга розвантажиться.
+
+Однакові попередження/помилки (той самий компонент і текст) пропускаються
+не частіше ніж раз на LOG_ERROR_INTERVAL. Запис, що пройшов після паузи,
+має поле "repeated" - скільки таких було приглушено між ними.
+
+Рівні - глобальний та окремо для компонентів (configure_logging).
+Формат "text" - для людей: "[Engine] повідомлення".
+"""
+import contextlib
+import json
+import logging
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from src.config import (
+    LOG_LEVEL, LOG_FORMAT, LOG_FORMATS, LOG_QUEUE_SIZE, LOG_ERROR_INTERVAL,
+    LOG_SHUTDOWN_TIMEOUT
+)
+
+ROOT_LOGGER = "autoclicker"
+
+# Назва компонента -> префікс у текстовому форматі
+TEXT_PREFIXES = {
+    "engine": "Engine", "ui": "GUI", "cli": "CLI", "control": "Control",
+    "jobs": "Jobs", "macro": "Macro", "profiles": "Profiles", "rate": "Rate",
+    "realtime": "Realtime", "trigger": "Trigger",
+}
+
+# Стандартні атрибути LogRecord - усе інше (extra=) йде в JSON як поля
+_RECORD_FIELDS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message"}
+
+
+def get_logger(component):
+    """Логер компонента: get_logger("engine") -> "autoclicker.engine" """
+    return logging.getLogger(f"{ROOT_LOGGER}.{component}")
+
+
+def _component(record):
+    return record.name[len(ROOT_LOGGER) + 1:] or ROOT_LOGGER
+
+
+class JsonFormatter(logging.Formatter):
+    """Один JSON-об'єкт на рядок: ts, level, component, msg + поля з extra"""
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "component": _component(record),
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Старий вигляд виводу: "[Engine] повідомлення" """
+    def format(self, record):
+        prefix = TEXT_PREFIXES.get(_component(record), _component(record))
+        line = f"[{prefix}] {record.getMessage()}"
+        repeated = getattr(record, "repeated", None)
+        if repeated:
+            line += f" (ще {repeated} повторів)"
+        if record.exc_text:
+            line += "\n" + record.exc_text
+        return line
+
+
+class RepeatFilter(logging.Filter):
+    """
+    Приглушує однакові WARNING+ частіше ніж раз на interval секунд.
+    Працює в потоці, що логує, тож приглушений запис навіть не ставиться в чергу.
+    """
+    MAX_KEYS = 256
+
+    def __init__(self, interval=LOG_ERROR_INTERVAL):
+        super().__init__()
+        self.interval = interval
+        self._seen = {}  # (логер, текст) -> [час останнього пропущеного, приглушено]
+
+    def filter(self, record):
+        if record.levelno < logging.WARNING:
+            return True
+        key = (record.name, record.getMessage())
+        now = record.created
+        entry = self._seen.get(key)
+        if entry is not None and now - entry[0] < self.interval:
+            entry[1] += 1
+            return False
+
+        if entry is not None and entry[1]:
+            record.repeated = entry[1]
+        if len(self._seen) >= self.MAX_KEYS:
+            self._seen.clear()
+        self._seen[key] = [now, 0]
+        return True
+
+
+class _Output:
+    """
+    Запис рядків з потоку слухача. Це не logging.Handler: logging.shutdown()
+    при виході не бере його лок, тож заблокований вивід не вішає завершення.
+    """
+    def __init__(self, stream, formatter, owned=False):
+        self.stream = stream
+        self.formatter = formatter
+        self.owned = owned
+
+    def handle(self, record):
+        try:
+            self.stream.write(self.formatter.format(record) + "\n")
+            self.stream.flush()
+        except Exception:
+            pass  # закритий/зламаний вивід не повинен зупиняти слухача
+
+    def close(self):
+        if self.owned:
+            self.stream.close()
+
+
+class _Listener(QueueListener):
+    """QueueListener, чия зупинка не чекає вічно на заблокований вивід"""
+    def stop(self, timeout=None):
+        if self._thread is not None:
+            self.enqueue_sentinel()
+            self._thread.join(timeout)
+            self._thread = None
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler без форматування в потоці, що логує, та з обмеженою чергою.
+    Слухача запускає при першому записі (імпорт модулів не створює потоків).
+    """
+    def __init__(self, q, output, maxsize):
+        super().__init__(q)
+        self.output = output
+        self.maxsize = maxsize
+        self.dropped = 0
+        self.listener = None
+        self._start_lock = threading.Lock()
+
+    def handle(self, record):
+        # Без self.lock: put_nowait у SimpleQueue і так потокобезпечний,
+        # тож потік, що логує, ніколи не чекає на інший потік
+        rv = self.filter(record)
+        if isinstance(rv, logging.LogRecord):
+            record = rv
+        if rv:
+            self.emit(record)
+        return rv
+
+    def prepare(self, record):
+        # Лише фіксуємо текст (аргументи можуть змінитися до запису),
+        # форматування - у потоці слухача
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        if self.listener is None:
+            self._start_listener()
+        if self.queue.qsize() >= self.maxsize:
+            self.dropped += 1
+            return
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            self.queue.put_nowait(logging.makeLogRecord({
+                "name": f"{ROOT_LOGGER}.log", "levelno": logging.WARNING, "levelname": "WARNING",
+                "msg": f"Черга логу була переповнена, відкинуто {dropped} записів",
+                "dropped": dropped,
+            }))
+        self.queue.put_nowait(record)
+
+    def _start_listener(self):
+        with self._start_lock:
+            if self.listener is None:
+                listener = _Listener(self.queue, self.output)
+                listener.start()
+                self.listener = listener
+
+
+_handler = None
+
+
+def configure_logging(level=LOG_LEVEL, fmt=LOG_FORMAT, stream=None, levels=None,
+                      error_interval=LOG_ERROR_INTERVAL):
+    """
+    Налаштовує логування всіх компонентів (можна викликати повторно).
+
+    Args:
+        level: глобальний рівень ("DEBUG", "INFO", ... або число)
+        fmt: "json" або "text"
+        stream: куди писати (за замовчуванням sys.stderr) або шлях до файлу
+        levels: {компонент: рівень} поверх глобального
+        error_interval: період приглушення однакових помилок (секунди)
+
+    Raises:
+        ValueError: невідомий формат чи рівень
+    """
+    global _handler
+    if fmt not in LOG_FORMATS:
+        raise ValueError(f"Формат логу має бути одним з {LOG_FORMATS}")
+    formatter = JsonFormatter() if fmt == "json" else TextFormatter()
+    if isinstance(stream, str):
+        output = _Output(open(stream, "a", encoding="utf-8"), formatter, owned=True)
+    else:
+        output = _Output(stream or sys.stderr, formatter)
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(_parse_level(level))
+    for component, component_level in (levels or {}).items():
+        get_logger(component).setLevel(_parse_level(component_level))
+
+    shutdown_logging()
+    handler = _NonBlockingQueueHandler(queue.SimpleQueue(), output, LOG_QUEUE_SIZE)
+    handler.addFilter(RepeatFilter(error_interval))
+    root.addHandler(handler)
+    root.propagate = False
+    _handler = handler
+
+
+def _parse_level(level):
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(str(level).upper())
+    if not isinstance(value, int):
+        raise ValueError(f"Невідомий рівень логу: '{level}'")
+    return value
+
+
+def parse_level_specs(specs):
+    """
+    ["INFO", "engine=DEBUG"] -> ("INFO", {"engine": "DEBUG"}).
+
+    Raises:
+        ValueError: невідомий рівень
+    """
+    level = LOG_LEVEL
+    levels = {}
+    for spec in specs or ():
+        component, sep, value = spec.rpartition("=")
+        _parse_level(value)
+        if sep:
+            levels[component] = value
+        else:
+            level = value
+    return level, levels
+
+
+def shutdown_logging():
+    """
+    Дописує чергу та зупиняє потік запису (перед виходом). Якщо вивід
+    заблоковано (повний pipe), чекає не довше LOG_SHUTDOWN_TIMEOUT
+    """
+    global _handler
+    handler, _handler = _handler, None
+    if handler is None:
+        return
+    logging.getLogger(ROOT_LOGGER).removeHandler(handler)
+    if handler.listener is not None:
+        handler.listener.stop(LOG_SHUTDOWN_TIMEOUT)
+    handler.output.close()
+
+
+@contextlib.contextmanager
+def quiet(level=logging.WARNING):
+    """Тимчасово підіймає рівень усіх логерів (симуляція, бенчмарки)"""
+    root = logging.getLogger(ROOT_LOGGER)
+    previous = root.level
+    root.setLevel(max(level, previous))
+    try:
+        yield
+    finally:
+        root.setLevel(previous)
+
+
+def _install_default():
+    configure_logging()
+    import atexit
+    atexit.register(shutdown_logging)
+
+
+_install_default()
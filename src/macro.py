@@ -0,0 +1,349 @@
+import math
+import mmap
+import struct
+import threading
+from src.clock import SYSTEM_CLOCK
+from src.config import MACRO_MAGIC, MACRO_VERSION
+from src.log import get_logger
+
+log = get_logger("macro")
+
+
+# --- Бінарний формат ---
+# Заголовок: magic, версія, розмір запису, кількість подій
+HEADER = struct.Struct("<4sHHI")
+# Подія: час від початку (нс), тип, прапорець/кнопка, a, b
+#   MOVE/PRESS/RELEASE: a, b = x, y
+#   SCROLL:             a, b = dx, dy
+#   KEY_DOWN/KEY_UP:    a = символ (ord) або vk спецклавіші (прапорець KEY_SPECIAL)
+EVENT = struct.Struct("<qBBxxii")
+
+MOVE, PRESS, RELEASE, SCROLL, KEY_DOWN, KEY_UP = range(6)
+KEY_SPECIAL = 1
+
+BUTTON_CODES = {"left": 1, "right": 2, "middle": 3}
+BUTTON_NAMES = {code: name for name, code in BUTTON_CODES.items()}
+
+
+class Macro:
+    """
+    Таймлайн подій у компактному бінарному вигляді (EVENT.size байт на подію).
+
+    Дані - будь-який буфер: bytearray під час запису або mmap при завантаженні,
+    тож навіть десятки тисяч подій відкриваються миттєво, без парсингу.
+    Події розпаковуються ліниво по одній під час відтворення.
+    """
+    def __init__(self, data=None, count=0, offset=0):
+        self._data = bytearray() if data is None else data
+        self._count = count
+        self._offset = offset
+        self._file = None
+
+    def __len__(self):
+        return self._count
+
+    def append(self, t_ns, kind, flag=0, a=0, b=0):
+        """Додає подію в кінець (лише для макросу в пам'яті)"""
+        self._data += EVENT.pack(t_ns, kind, flag, a, b)
+        self._count += 1
+
+    def event(self, index):
+        """Повертає (t_ns, kind, flag, a, b) події за індексом"""
+        return EVENT.unpack_from(self._data, self._offset + index * EVENT.size)
+
+    def __iter__(self):
+        return EVENT.iter_unpack(
+            memoryview(self._data)[self._offset:self._offset + self._count * EVENT.size]
+        )
+
+    @property
+    def duration_ns(self):
+        """Тривалість таймлайну (час останньої події)"""
+        return self.event(self._count - 1)[0] if self._count else 0
+
+    def save(self, path):
+        """Зберігає макрос у бінарний файл"""
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MACRO_MAGIC, MACRO_VERSION, EVENT.size, self._count))
+            f.write(memoryview(self._data)[self._offset:self._offset + self._count * EVENT.size])
+
+    @classmethod
+    def load(cls, path):
+        """
+        Відкриває макрос через mmap (дані підвантажуються ОС за потребою).
+
+        Raises:
+            ValueError: порожній, обрізаний чи чужий файл
+        """
+        f = open(path, "rb")
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            f.close()
+            raise ValueError(f"Порожній файл макросу: {path}")
+
+        try:
+            magic, version, record_size, count = HEADER.unpack_from(data, 0)
+        except struct.error:
+            data.close()
+            f.close()
+            raise ValueError(f"Файл макросу обрізаний: {path}") from None
+        if magic != MACRO_MAGIC or version != MACRO_VERSION or record_size != EVENT.size:
+            data.close()
+            f.close()
+            raise ValueError(f"Непідтримуваний формат макросу: {path}")
+        if len(data) < HEADER.size + count * EVENT.size:
+            data.close()
+            f.close()
+            raise ValueError(f"Файл макросу обрізаний: {path}")
+
+        macro = cls(data, count, HEADER.size)
+        macro._file = f
+        return macro
+
+    def close(self):
+        """Звільняє mmap та файл (для завантажених макросів)"""
+        if self._file is not None:
+            self._data.close()
+            self._file.close()
+            self._file = None
+
+
+class MacroRecorder:
+    """
+    Запис рухів, кліків, прокрутки та клавіш через слухачі pynput.
+    Час - clock.now_ns() від start().
+    """
+    def __init__(self, record_moves=True, clock=SYSTEM_CLOCK):
+        self.record_moves = record_moves
+        self._now = clock.now_ns
+        self.macro = Macro()
+        self._start_ns = 0
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    def start(self):
+        from pynput import keyboard, mouse
+
+        self.macro = Macro()
+        self._start_ns = self._now()
+        self._listeners = [
+            mouse.Listener(
+                on_move=self._on_move if self.record_moves else None,
+                on_click=self._on_click, on_scroll=self._on_scroll
+            ),
+            keyboard.Listener(on_press=self._on_press, on_release=self._on_release),
+        ]
+        for listener in self._listeners:
+            listener.start()
+        log.info("Запис розпочато")
+
+    def stop(self):
+        """Зупиняє запис, повертає Macro"""
+        for listener in self._listeners:
+            listener.stop()
+        self._listeners = []
+        log.info("Запис завершено: %d подій", len(self.macro))
+        return self.macro
+
+    def _append(self, kind, flag=0, a=0, b=0):
+        # Слухачі миші та клавіатури - різні потоки
+        with self._lock:
+            self.macro.append(self._now() - self._start_ns, kind, flag, a, b)
+
+    def _on_move(self, x, y):
+        self._append(MOVE, 0, int(x), int(y))
+
+    def _on_click(self, x, y, button, pressed):
+        code = BUTTON_CODES.get(button.name)
+        if code is not None:
+            self._append(PRESS if pressed else RELEASE, code, int(x), int(y))
+
+    def _on_scroll(self, x, y, dx, dy):
+        self._append(SCROLL, 0, int(dx), int(dy))
+
+    def _key_code(self, key):
+        """(прапорець, код): символ як ord, інакше vk спецклавіші"""
+        char = getattr(key, "char", None)
+        if char:
+            return 0, ord(char)
+        vk = getattr(getattr(key, "value", key), "vk", None)
+        return KEY_SPECIAL, vk or 0
+
+    def _on_press(self, key):
+        flag, code = self._key_code(key)
+        self._append(KEY_DOWN, flag, code)
+
+    def _on_release(self, key):
+        flag, code = self._key_code(key)
+        self._append(KEY_UP, flag, code)
+
+
+class PynputOutput:
+    """Виконує події макросу через контролери pynput"""
+    def __init__(self):
+        from pynput import keyboard, mouse
+        self._keyboard = keyboard
+        self._mouse = mouse.Controller()
+        self._keys = keyboard.Controller()
+        self._buttons = {
+            1: mouse.Button.left, 2: mouse.Button.right, 3: mouse.Button.middle,
+        }
+
+    def _key(self, flag, code):
+        if flag == KEY_SPECIAL:
+            return self._keyboard.KeyCode.from_vk(code)
+        return chr(code)
+
+    def play(self, kind, flag, a, b):
+        if kind == MOVE:
+            self._mouse.position = (a, b)
+        elif kind == PRESS:
+            self._mouse.position = (a, b)
+            self._mouse.press(self._buttons[flag])
+        elif kind == RELEASE:
+            self._mouse.position = (a, b)
+            self._mouse.release(self._buttons[flag])
+        elif kind == SCROLL:
+            self._mouse.scroll(a, b)
+        elif kind == KEY_DOWN:
+            self._keys.press(self._key(flag, a))
+        elif kind == KEY_UP:
+            self._keys.release(self._key(flag, a))
+
+
+class BackendOutput:
+    """
+    Виконує події макросу через бекенд кліків двигуна (ClickBackend):
+    MOVE - move(), PRESS - click_at() у точці натискання. RELEASE уже
+    покритий кліком, а прокрутку й клавіші бекенди не вміють - вони
+    пропускаються й рахуються в skipped (повна точність - PynputOutput).
+    """
+    def __init__(self, backend):
+        self.backend = backend
+        self.skipped = 0
+
+    def play(self, kind, flag, a, b):
+        if kind == MOVE:
+            self.backend.move(a, b)
+        elif kind == PRESS:
+            self.backend.click_at(a, b, BUTTON_NAMES[flag])
+        elif kind != RELEASE:
+            if not self.skipped:
+                log.warning("Бекенд '%s' не відтворює прокрутку та клавіші - пропускаю",
+                            self.backend.name)
+            self.skipped += 1
+
+
+class NullOutput:
+    """Вихід без реальних подій для тестів: записує (clock.now_ns(), подія)"""
+    def __init__(self, clock=SYSTEM_CLOCK):
+        self._now = clock.now_ns
+        self.events = []
+
+    def play(self, kind, flag, a, b):
+        self.events.append((self._now(), kind, flag, a, b))
+
+
+class MacroPlayer(threading.Thread):
+    """
+    Відтворення макросу у фоновому потоці.
+
+    Кожна подія чекає абсолютного дедлайну start_ns + записаний час події
+    (цілі наносекунди, без перерахунку в секунди). Затримка однієї події
+    не зсуває наступні: пропущені дедлайни виконуються одразу, а далі
+    таймлайн іде за записом. Повтор починається там, де закінчився
+    попередній (start_ns + duration_ns). get_stats() повертає виміряне
+    запізнення подій. loops=0 - повторювати до stop(). on_finished
+    викликається з потоку відтворення після завершення (як у ClickerEngine).
+    Час і очікування - через clock.
+    """
+    def __init__(self, macro, output=None, loops=1, clock=SYSTEM_CLOCK):
+        super().__init__()
+        self.daemon = True
+        self.macro = macro
+        self.output = output or PynputOutput()
+        self.loops = loops
+        self.loops_done = 0
+        self.clock = clock
+        self.on_finished = None
+        self._stop_event = threading.Event()
+        self._reset_stats()
+
+    def stop(self):
+        """Перериває відтворення (діє одразу, навіть посеред очікування)"""
+        self._stop_event.set()
+
+    def _reset_stats(self):
+        # Запізнення подій (Welford)
+        self._events = 0
+        self._lateness_mean = 0.0
+        self._lateness_m2 = 0.0
+        self._lateness_max = 0
+
+    def get_stats(self):
+        """
+        Статистика точності відтворення.
+
+        Returns:
+            dict: events, loops_done, jitter_ms (стандартне відхилення
+            запізнення), mean_lateness_ms, max_lateness_ms
+        """
+        variance = self._lateness_m2 / self._events if self._events > 1 else 0.0
+        return {
+            "events": self._events,
+            "loops_done": self.loops_done,
+            "jitter_ms": math.sqrt(variance) / 1e6,
+            "mean_lateness_ms": self._lateness_mean / 1e6,
+            "max_lateness_ms": self._lateness_max / 1e6,
+        }
+
+    def _record(self, lateness):
+        self._events += 1
+        delta = lateness - self._lateness_mean
+        self._lateness_mean += delta / self._events
+        self._lateness_m2 += delta * (lateness - self._lateness_mean)
+        if lateness > self._lateness_max:
+            self._lateness_max = lateness
+
+    def _play_once(self, start_ns):
+        """Один прохід таймлайну від start_ns. Returns: False якщо перервано stop()"""
+        play = self.output.play
+        wait_until = self.clock.wait_until
+        stop_event = self._stop_event
+
+        for t_ns, kind, flag, a, b in self.macro:
+            deadline = start_ns + t_ns
+            now = wait_until(deadline, stop_event)
+            if now is None:
+                return False
+            self._record(now - deadline)
+            try:
+                play(kind, flag, a, b)
+            except Exception as e:
+                log.error("Помилка відтворення події: %s", e)
+        return True
+
+    def run(self):
+        log.info("Відтворення: %d подій, повторів: %s", len(self.macro), self.loops or "∞")
+        self._reset_stats()
+        try:
+            if len(self.macro):  # порожній таймлайн з loops=0 крутився б без очікувань
+                self._play_loops()
+        finally:
+            if self.on_finished is not None:
+                self.on_finished()
+
+    def _play_loops(self):
+        start_ns = self.clock.now_ns()
+        duration_ns = self.macro.duration_ns
+
+        while not self._stop_event.is_set():
+            if not self._play_once(start_ns):
+                break
+            start_ns += duration_ns
+            self.loops_done += 1
+            if self.loops and self.loops_done >= self.loops:
+                break
+
+        log.info("Відтворення завершено: %d повторів", self.loops_done)
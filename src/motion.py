@@ -0,0 +1,168 @@
+import math
+import random
+from array import array
+from src.config import (
+    MOTION_RATE_HZ, MOTION_MIN_POINTS, MOTION_SPEED, MOTION_MIN_DURATION, MOTION_SPEED_VARIATION,
+    MOTION_CURVATURE, MOTION_OVERSHOOT, MOTION_DISTANCE_BUCKET, MOTION_ANGLE_BUCKETS,
+    MOTION_VARIANTS, MOTION_CACHE_SIZE
+)
+
+
+def minimum_jerk(t):
+    """Профіль мінімального ривка: 0 -> 1 з нульовими швидкістю та прискоренням на кінцях"""
+    return t * t * t * (10.0 + t * (-15.0 + 6.0 * t))
+
+
+class MotionPlanner:
+    """
+    Генератор людиноподібних траєкторій курсора.
+
+    Траєкторія - кубічна крива Безьє з випадковим вигином, що проходиться
+    за профілем мінімального ривка, з невеликим перельотом за ціль і
+    поверненням. Точки - плаский array('d') [x1, y1, x2, y2, ...] відносно
+    початку руху, з частотою rate_hz, але не менше MOTION_MIN_POINTS на рух:
+    якщо бюджет короткий (60 рухів/с - ~13 мс), точки йдуть частіше, а
+    не зводяться до одного стрибка.
+
+    Шляхи кешуються за (відстань, сектор кута, кількість точок, варіант):
+    для нового руху береться готовий шлях найближчого кошика, а різниця
+    між його кінцем і справжньою ціллю розподіляється вздовж шляху
+    за прогресом руху. Тригонометрія та Безьє рахуються лише при промаху кешу.
+    """
+    def __init__(self, rate_hz=MOTION_RATE_HZ, speed=MOTION_SPEED, curvature=MOTION_CURVATURE,
+                 overshoot=MOTION_OVERSHOOT, seed=None, cache_size=MOTION_CACHE_SIZE):
+        self.rate_hz = rate_hz
+        self.speed = speed
+        self.curvature = curvature
+        self.overshoot = overshoot
+        self.cache_size = cache_size
+        self._rng = random.Random(seed)
+        self._cache = {}
+        self._angle_step = 2 * math.pi / MOTION_ANGLE_BUCKETS
+        self.hits = 0
+        self.misses = 0
+
+    def _build(self, distance, angle, steps):
+        """Новий шлях кошика: (точки array('d'), прогрес array('d'), кінець x, кінець y)"""
+        rng = self._rng
+        cos_a, sin_a = math.cos(angle), math.sin(angle)
+        end_x, end_y = distance * cos_a, distance * sin_a
+
+        # Вигин - зсув контрольних точок перпендикулярно до напрямку руху
+        bend = rng.uniform(-self.curvature, self.curvature) * distance
+        px, py = -sin_a * bend, cos_a * bend
+        over = 1.0 + rng.uniform(0.0, self.overshoot)
+        c1x, c1y = end_x / 3 + px, end_y / 3 + py
+        c2x, c2y = end_x * 2 / 3 + px * 0.5, end_y * 2 / 3 + py * 0.5
+        o_x, o_y = end_x * over, end_y * over
+
+        # Основний рух до точки перельоту, далі коротке повернення на ціль
+        back = max(1, round(steps * 0.2)) if steps > 4 and over > 1.0 else 0
+        main = steps - back
+
+        points = array("d")
+        progress = array("d")
+        for i in range(1, main + 1):
+            t = minimum_jerk(i / main)
+            u = 1.0 - t
+            # P0 = (0, 0), тож його член Безьє зникає
+            b, c, d = 3 * u * u * t, 3 * u * t * t, t * t * t
+            points.append(b * c1x + c * c2x + d * o_x)
+            points.append(b * c1y + c * c2y + d * o_y)
+            progress.append(t)
+        for j in range(1, back + 1):
+            t = minimum_jerk(j / back)
+            points.append(o_x + (end_x - o_x) * t)
+            points.append(o_y + (end_y - o_y) * t)
+            progress.append(1.0)
+        return points, progress, end_x, end_y
+
+    def path(self, x0, y0, x1, y1, max_duration=None):
+        """
+        Рух з (x0, y0) в (x1, y1). max_duration обмежує тривалість руху.
+
+        Returns:
+            tuple: (абсолютні точки array('i') [x, y, ...], крок між точками в нс).
+            Остання точка - рівно ціль, через кількість точок * крок від старту.
+        """
+        dx, dy = x1 - x0, y1 - y0
+        distance = math.hypot(dx, dy)
+        if distance < 1.0:
+            return array("i", (x1, y1)), int(1e9 / self.rate_hz)
+
+        rng = self._rng
+        duration = max(MOTION_MIN_DURATION, distance / self.speed)
+        duration *= rng.uniform(1.0 - MOTION_SPEED_VARIATION, 1.0 + MOTION_SPEED_VARIATION)
+        if max_duration is not None and duration > max_duration:
+            duration = max_duration
+        steps = max(MOTION_MIN_POINTS, int(duration * self.rate_hz))
+        step_ns = int(duration * 1e9 / steps)
+
+        bucket = max(1, round(distance / MOTION_DISTANCE_BUCKET))
+        sector = round(math.atan2(dy, dx) / self._angle_step) % MOTION_ANGLE_BUCKETS
+        key = (bucket, sector, steps, rng.randrange(MOTION_VARIANTS))
+
+        entry = self._cache.get(key)
+        if entry is None:
+            self.misses += 1
+            if len(self._cache) >= self.cache_size:
+                del self._cache[next(iter(self._cache))]  # найстаріший запис
+            entry = self._build(bucket * MOTION_DISTANCE_BUCKET, sector * self._angle_step, steps)
+            self._cache[key] = entry
+        else:
+            self.hits += 1
+
+        points, progress, end_x, end_y = entry
+        err_x, err_y = dx - end_x, dy - end_y
+        out = array("i", bytes(len(points) * 4))
+        for i, s in enumerate(progress):
+            out[2 * i] = round(x0 + points[2 * i] + s * err_x)
+            out[2 * i + 1] = round(y0 + points[2 * i + 1] + s * err_y)
+        out[-2], out[-1] = x1, y1
+        return out, step_ns
+
+
+class MotionStream:
+    """
+    Поточний рух курсора, який потік двигуна видає точка за точкою
+    на власних дедлайнах між кліками (без окремого потоку).
+    """
+    def __init__(self, planner):
+        self.planner = planner
+        self.next_ns = None  # дедлайн наступної точки або None, якщо руху немає
+        self._step_ns = 0
+        self._points = array("i")
+        self._pos = 0
+        self.moves = 0
+        self.points_sent = 0
+
+    def start(self, x0, y0, x1, y1, start_ns, max_duration=None):
+        """Починає рух; перша точка - через один крок після start_ns"""
+        self._points, self._step_ns = self.planner.path(x0, y0, x1, y1, max_duration)
+        self._pos = 0
+        self.next_ns = start_ns + self._step_ns
+        self.moves += 1
+
+    def advance(self):
+        """Наступна точка (x, y); після останньої рух завершено"""
+        pos = self._pos
+        points = self._points
+        self._pos = pos + 2
+        self.points_sent += 1
+        if self._pos >= len(points):
+            self.next_ns = None
+        else:
+            self.next_ns += self._step_ns
+        return points[pos], points[pos + 1]
+
+    def cancel(self):
+        self.next_ns = None
+
+    def stats(self):
+        planner = self.planner
+        lookups = planner.hits + planner.misses
+        return {
+            "moves": self.moves,
+            "points": self.points_sent,
+            "cache_hit_rate": planner.hits / lookups if lookups else 0.0,
+        }
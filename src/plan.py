@@ -0,0 +1,127 @@
+import random
+from array import array
+from src.config import VALID_PLAN_MODES, PLAN_BLOCK_SIZE
+
+
+class ClickPlan:
+    """
+    План кліків по кількох цілях на екрані.
+
+    Цілі - точки (x, y) або прямокутники (x, y, w, h). Список цілей
+    заздалегідь "компілюється" блоками по PLAN_BLOCK_SIZE координат у плаский
+    array('i') [x0, y0, x1, y1, ...] разом зі зсувами jitter, тож потік
+    двигуна на кожен клік лише читає наступну пару чисел.
+
+    Режими:
+        "round_robin" - цілі по черзі
+        "weighted"    - випадкова ціль з вагами weights
+        "random"      - випадкова ціль з рівними шансами
+    Прямокутник дає випадкову точку всередині себе на кожен клік.
+    """
+    def __init__(self, targets, mode="round_robin", weights=None, jitter_px=0,
+                 seed=None, block_size=PLAN_BLOCK_SIZE):
+        if not targets:
+            raise ValueError("План має містити хоча б одну ціль")
+        if mode not in VALID_PLAN_MODES:
+            raise ValueError(f"Режим плану має бути одним з {VALID_PLAN_MODES}")
+        if weights is not None and len(weights) != len(targets):
+            raise ValueError("Кількість ваг має збігатися з кількістю цілей")
+        if jitter_px < 0:
+            raise ValueError("jitter_px не може бути від'ємним")
+
+        self.targets = [self._normalize(t) for t in targets]
+        self.mode = mode
+        self.weights = list(weights) if weights is not None else None
+        self.jitter_px = int(jitter_px)
+        self.block_size = block_size
+
+        self._rng = random.Random(seed)
+        self._order = 0  # позиція round_robin між блоками
+        self._coords = array("i")
+        self._pos = 0
+
+        # Без випадковості round_robin дає один і той самий цикл - компілюємо раз
+        self._static = (
+            mode == "round_robin" and self.jitter_px == 0
+            and all(w == 0 and h == 0 for _, _, w, h in self.targets)
+        )
+        self._compile()
+
+    @classmethod
+    def from_spec(cls, spec):
+        """Створює план зі словника (формат to_spec(), напр. з JSON профілю)"""
+        if not isinstance(spec, dict):
+            raise ValueError("Опис плану має бути словником")
+        return cls(
+            spec.get("targets") or [], spec.get("mode", "round_robin"),
+            spec.get("weights"), spec.get("jitter_px", 0), spec.get("seed"),
+        )
+
+    def to_spec(self):
+        """Опис плану, придатний для JSON"""
+        return {
+            "targets": [[x, y] if not (w or h) else [x, y, w, h] for x, y, w, h in self.targets],
+            "mode": self.mode,
+            "weights": self.weights,
+            "jitter_px": self.jitter_px,
+        }
+
+    @staticmethod
+    def _normalize(target):
+        """Точку перетворює на прямокутник 0x0"""
+        if len(target) == 2:
+            x, y = target
+            return int(x), int(y), 0, 0
+        if len(target) == 4:
+            x, y, w, h = target
+            if w < 0 or h < 0:
+                raise ValueError(f"Некоректний прямокутник: {target}")
+            return int(x), int(y), int(w), int(h)
+        raise ValueError(f"Ціль має бути (x, y) або (x, y, w, h): {target}")
+
+    def _pick(self, count):
+        """Послідовність цілей на блок згідно з режимом"""
+        if self.mode == "round_robin":
+            n = len(self.targets)
+            picked = [self.targets[(self._order + i) % n] for i in range(count)]
+            self._order = (self._order + count) % n
+            return picked
+        if self.mode == "weighted":
+            return self._rng.choices(self.targets, weights=self.weights, k=count)
+        return self._rng.choices(self.targets, k=count)
+
+    def _compile(self):
+        """Генерує наступний блок координат з уже застосованим jitter"""
+        if self._static:
+            # Повний цикл цілей; next() просто ходить по ньому по колу
+            picked = self.targets
+        else:
+            picked = self._pick(self.block_size)
+
+        randint = self._rng.randint
+        jitter = self.jitter_px
+        coords = array("i")
+        for x, y, w, h in picked:
+            if w or h:
+                x += randint(0, w)
+                y += randint(0, h)
+            if jitter:
+                x += randint(-jitter, jitter)
+                y += randint(-jitter, jitter)
+            coords.append(x)
+            coords.append(y)
+
+        self._coords = coords
+        self._pos = 0
+
+    def next(self):
+        """Координати наступного кліку (x, y)"""
+        if self._pos >= len(self._coords):
+            if self._static:
+                self._pos = 0
+            else:
+                self._compile()
+
+        pos = self._pos
+        self._pos = pos + 2
+        return self._coords[pos], self._coords[pos + 1]
@@ -0,0 +1,160 @@
+import json
+import os
+from src.config import PROFILES_FILE_NAME, VALID_BACKENDS
+from src.hotkeys import parse_hotkey
+from src.log import get_logger
+from src.plan import ClickPlan
+from src.settings import EngineSettings, validate_setting
+
+log = get_logger("profiles")
+
+
+def default_profiles_path():
+    """Файл профілів за замовчуванням (у домашній директорії)"""
+    return os.path.join(os.path.expanduser("~"), PROFILES_FILE_NAME)
+
+
+def validate_hotkey(key):
+    """Гаряча клавіша - комбінація у форматі src.hotkeys ("s", "f6", "ctrl+x")"""
+    try:
+        parse_hotkey(key)
+    except ValueError:
+        return False
+    return True
+
+
+class Profile:
+    """
+    Іменований набір налаштувань: CPS, рандомність, кнопка, розподіл,
+    гаряча клавіша, план цілей та бекенд.
+
+    Валідується один раз при створенні; план компілюється теж один раз,
+    тож перемикання профілю - лише підміна готового знімка в двигуні.
+    Відсутні налаштування беруться за замовчуванням, щоб профіль завжди
+    задавав повний стан.
+    """
+    __slots__ = ("name", "settings", "hotkey", "backend", "plan")
+
+    def __init__(self, name, settings=None, hotkey=None, backend="auto", plan=None):
+        if not name:
+            raise ValueError("Профіль повинен мати назву")
+        if hotkey is not None and not validate_hotkey(hotkey):
+            raise ValueError(f"Профіль '{name}': некоректна гаряча клавіша")
+        if backend not in VALID_BACKENDS:
+            raise ValueError(f"Профіль '{name}': бекенд має бути одним з {VALID_BACKENDS}")
+
+        values = EngineSettings().as_dict()
+        values.update(settings or {})
+        if isinstance(plan, dict):
+            plan = ClickPlan.from_spec(plan)
+        values["plan"] = plan
+
+        for key, value in values.items():
+            error = validate_setting(key, value)
+            if error:
+                raise ValueError(f"Профіль '{name}': {error}")
+
+        self.name = name
+        self.settings = values
+        self.hotkey = hotkey.lower() if hotkey else None
+        self.backend = backend
+        self.plan = plan
+
+    @classmethod
+    def from_dict(cls, name, data):
+        return cls(
+            name, data.get("settings"), data.get("hotkey"),
+            data.get("backend", "auto"), data.get("plan"),
+        )
+
+    def to_dict(self):
+        settings = {k: v for k, v in self.settings.items() if k != "plan"}
+        data = {"settings": settings, "backend": self.backend}
+        if self.hotkey:
+            data["hotkey"] = self.hotkey
+        if self.plan is not None:
+            data["plan"] = self.plan.to_spec()
+        return data
+
+
+class ProfileStore:
+    """
+    Профілі на диску (один компактний JSON-файл {назва: профіль}) з кешем у пам'яті.
+
+    load() читає та валідує файл один раз; некоректні профілі пропускаються
+    з повідомленням, а нечитабельний файл дає порожній набір (програма
+    стартує й так). Далі get() повертає вже готові Profile без звернень до диску.
+    """
+    def __init__(self, path=None):
+        self.path = path or default_profiles_path()
+        self._profiles = {}
+
+    def load(self):
+        """Завантажує профілі з файлу (відсутній чи пошкоджений файл - порожній набір)"""
+        self._profiles = {}
+        if not os.path.exists(self.path):
+            return self
+
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            log.warning("Файл профілів %s не прочитано: %s", self.path, e)
+            return self
+        if not isinstance(data, dict):
+            log.warning("Файл профілів %s: очікувався JSON-об'єкт {назва: профіль}", self.path)
+            return self
+
+        for name, raw in data.items():
+            try:
+                self._profiles[name] = Profile.from_dict(name, raw)
+            except (ValueError, TypeError, AttributeError) as e:
+                log.warning("Пропущено профіль '%s': %s", name, e)
+        log.info("Завантажено %d профілів з %s", len(self._profiles), self.path)
+        return self
+
+    def save(self):
+        """Записує всі профілі у файл (атомарно через тимчасовий файл)"""
+        data = {name: p.to_dict() for name, p in self._profiles.items()}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def names(self):
+        return list(self._profiles)
+
+    def hotkey_bindings(self):
+        """
+        {комбінація: "profile:<назва>"} для профілів з гарячою клавішею
+        (для HotkeyDispatcher). Якщо клавіша в кількох профілів - діє перший.
+        """
+        bindings = {}
+        for name, profile in self._profiles.items():
+            if profile.hotkey is None:
+                continue
+            if profile.hotkey in bindings:
+                log.warning("Клавіша '%s' профілю '%s' вже прив'язана до '%s'",
+                            profile.hotkey, name, bindings[profile.hotkey][8:])
+                continue
+            bindings[profile.hotkey] = f"profile:{name}"
+        return bindings
+
+    def get(self, name):
+        profile = self._profiles.get(name)
+        if profile is None:
+            raise KeyError(f"Профіль '{name}' не знайдено")
+        return profile
+
+    def add(self, profile):
+        """Додає або замінює профіль у кеші (save() - щоб зберегти на диск)"""
+        self._profiles[profile.name] = profile
+
+    def remove(self, name):
+        self._profiles.pop(name, None)
+
+    def __contains__(self, name):
+        return name in self._profiles
+
+    def __len__(self):
+        return len(self._profiles)
@@ -0,0 +1,130 @@
+from collections import deque
+from src.config import (
+    CPS_MAX, MIN_DELAY, RATE_WINDOW, RATE_CONTROL_PERIOD, RATE_KP, RATE_KI,
+    RATE_TOLERANCE, RATE_MIN_CORRECTION
+)
+from src.log import get_logger
+
+log = get_logger("rate")
+
+
+class RateController:
+    """
+    PI-регулятор фактичного CPS поверх планувальника дедлайнів.
+
+    Раз на period секунд порівнює фактичний час кліків за ковзне вікно
+    window із запланованим (сума виданих затримок до корекції) і коригує
+    множник інтервалів так, щоб компенсувати втрати на сон, GIL та
+    затримки бекенду. Похибка рахується відносно запланованого темпу, а не
+    target_cps: випадкові відхилення затримок (рандомність) - не відставання,
+    тож без навантаження множник лишається 1.0 і розподіл не ширшає. Команда обмежена зверху межею бекенду та MIN_DELAY
+    (anti-windup: інтеграл не росте, поки команда в насиченні).
+
+    Якщо навіть на межі досягнутий CPS нижчий за ціль більш ніж на
+    tolerance (або вартість кліку бекенду сама перевищує інтервал),
+    ціль позначається недосяжною - з причиною, а не мовчки.
+    """
+    def __init__(self, window=RATE_WINDOW, period=RATE_CONTROL_PERIOD,
+                 kp=RATE_KP, ki=RATE_KI, tolerance=RATE_TOLERANCE):
+        self.period_ns = int(period * 1e9)
+        self.kp = kp
+        self.ki = ki
+        self.tolerance = tolerance
+        self._steps = deque(maxlen=max(1, round(window / period)))
+        self.reset(1.0)
+
+    def reset(self, target_cps, max_cps=CPS_MAX):
+        """Нова серія, нова ціль або бекенд: регулятор з нуля (max_cps - межа бекенду)"""
+        self.target_cps = target_cps
+        self.correction = 1.0  # команда CPS / цільовий CPS
+        self.scale = 1.0  # множник інтервалів = 1 / correction
+        self.achieved_cps = 0.0
+        self.unreachable = False
+        self.reason = None
+        self._integral = 0.0
+        self._steps.clear()
+        self._step_start = None
+        self._step_clicks = 0
+        self._step_planned = 0
+        self._last_planned = 0
+        # Межа команди: не швидше max_cps і не частіше MIN_DELAY
+        self._max_correction = min(max_cps, 1.0 / MIN_DELAY) / target_cps
+
+    def adjust(self, delay, count=1):
+        """Скоригована затримка групи з count кліків (не менше MIN_DELAY на клік)"""
+        delay *= self.scale
+        floor = MIN_DELAY * count
+        return delay if delay > floor else floor
+
+    def record(self, now_ns, count, cost_ns=0, planned_ns=0):
+        """
+        Фіксує групу кліків; раз на period - крок регулятора.
+
+        Args:
+            planned_ns: затримка до наступної групи до корекції (нс, з тим
+                самим округленням, що й у планувальнику) - запланований
+                час, з яким порівнюється фактичний
+        """
+        # Час від попередньої групи до цієї запланувала затримка попередньої
+        previous, self._last_planned = self._last_planned, planned_ns
+        if self._step_start is None:
+            self._step_start = now_ns
+            return
+        self._step_clicks += count
+        self._step_planned += previous
+        elapsed = now_ns - self._step_start
+        if elapsed < self.period_ns:
+            return
+
+        self._steps.append((elapsed, self._step_clicks, self._step_planned))
+        self._step_start = now_ns
+        self._step_clicks = 0
+        self._step_planned = 0
+        self._update(elapsed / 1e9, cost_ns)
+
+    def _update(self, dt, cost_ns):
+        total_ns = sum(e for e, _, _ in self._steps)
+        clicks = sum(c for _, c, _ in self._steps)
+        planned = sum(p for _, _, p in self._steps)
+        self.achieved_cps = clicks * 1e9 / total_ns
+        target = self.target_cps
+        # Відставання від запланованого темпу: 0, якщо кліки йшли рівно
+        # на дедлайнах без корекції, незалежно від вибірки рандомності
+        error = 1.0 - planned / total_ns if planned > 0 else 0.0
+
+        correction = 1.0 + self.kp * error + self.ki * self._integral
+        saturated = correction >= self._max_correction
+        if not saturated:
+            self._integral += error * dt
+            correction = 1.0 + self.kp * error + self.ki * self._integral
+
+        if correction > self._max_correction:
+            correction = self._max_correction
+        elif correction < RATE_MIN_CORRECTION:
+            correction = RATE_MIN_CORRECTION
+        self.correction = correction
+        self.scale = 1.0 / correction
+
+        # Висновок про недосяжність - лише за повним вікном
+        short = error > self.tolerance and len(self._steps) == self._steps.maxlen
+        reason = None
+        if short and cost_ns * target >= 1e9:
+            reason = f"бекенд витрачає {cost_ns / 1e6:.2f} мс на клік"
+        elif short and saturated:
+            reason = f"регулятор у насиченні (межа {target * self._max_correction:.0f} CPS)"
+
+        if reason and not self.unreachable:
+            log.warning("Ціль %.1f CPS недосяжна: %.1f CPS, %s", target, self.achieved_cps, reason)
+        elif not short and self.unreachable:
+            log.info("Ціль %.1f CPS знову досягається", target)
+        if reason or not short:
+            self.unreachable = reason is not None
+            self.reason = reason
+
+    def stats(self):
+        return {
+            "window_cps": self.achieved_cps,
+            "rate_correction": self.correction,
+            "unreachable": self.unreachable,
+            "unreachable_reason": self.reason,
+        }
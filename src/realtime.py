@@ -0,0 +1,149 @@
+"""
+Опційні налаштування потоку кліків для стабільнішого таймінгу під навантаженням.
+
+Affinity, пріоритет, nice та timer slack застосовуються з самого потоку
+двигуна (на Linux sched_* з pid 0, nice та timer slack діють на потік,
+що викликає), тож Tk та слухач pynput лишаються зі звичайними
+налаштуваннями. Виняток - GC (GCGuard): збирач сміття у Python один на
+весь процес, тож freeze/disable діють на всі потоки. Що не дозволено
+(права, платформа), лише повідомляється - двигун працює далі.
+"""
+import gc
+import os
+import sys
+import threading
+from src.config import VALID_GC_MODES
+from src.log import get_logger
+
+PR_SET_TIMERSLACK = 29
+
+log = get_logger("realtime")
+
+
+class RealtimeOptions:
+    """
+    Набір опцій потоку кліків (None - не чіпати).
+
+    Args:
+        cpus: ядра для потоку (os.sched_setaffinity)
+        fifo_priority: пріоритет SCHED_FIFO 1-99 (потрібен CAP_SYS_NICE)
+        nice: значення nice потоку (від'ємні - потрібні права)
+        timer_slack_ns: timer slack потоку (prctl, Linux)
+        gc: "default", "freeze" (gc.freeze() на старті серії) або
+            "disable" (freeze + gc.disable() на час серії); діє на весь
+            процес, а не лише на потік кліків
+    """
+    __slots__ = ("cpus", "fifo_priority", "nice", "timer_slack_ns", "gc")
+
+    def __init__(self, cpus=None, fifo_priority=None, nice=None, timer_slack_ns=None, gc="default"):
+        if cpus is not None:
+            cpus = frozenset(int(c) for c in cpus)
+            if not cpus or min(cpus) < 0:
+                raise ValueError("Список ядер має бути непорожнім і без від'ємних номерів")
+        if fifo_priority is not None and not (1 <= fifo_priority <= 99):
+            raise ValueError("Пріоритет SCHED_FIFO має бути від 1 до 99")
+        if nice is not None and not (-20 <= nice <= 19):
+            raise ValueError("nice має бути від -20 до 19")
+        if timer_slack_ns is not None and timer_slack_ns < 1:
+            raise ValueError("timer slack має бути додатним (нс)")
+        if gc not in VALID_GC_MODES:
+            raise ValueError(f"Режим GC має бути одним з {VALID_GC_MODES}")
+
+        self.cpus = cpus
+        self.fifo_priority = fifo_priority
+        self.nice = nice
+        self.timer_slack_ns = timer_slack_ns
+        self.gc = gc
+
+    def as_dict(self):
+        return {
+            "cpus": sorted(self.cpus) if self.cpus is not None else None,
+            "fifo_priority": self.fifo_priority,
+            "nice": self.nice,
+            "timer_slack_ns": self.timer_slack_ns,
+            "gc": self.gc,
+        }
+
+
+def _set_timer_slack(ns):
+    import ctypes
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.prctl(PR_SET_TIMERSLACK, ctypes.c_ulong(ns), 0, 0, 0) != 0:
+        raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+
+
+def apply_thread_options(options):
+    """
+    Застосовує опції до потоку, що викликає (потік двигуна).
+
+    Returns:
+        dict: {опція: "ok" або текст помилки} лише для заданих опцій
+    """
+    results = {}
+    linux = sys.platform.startswith("linux")
+
+    def attempt(name, supported, action):
+        if not supported:
+            results[name] = "недоступно на цій платформі"
+            return
+        try:
+            action()
+            results[name] = "ok"
+        except (OSError, ValueError) as e:
+            results[name] = str(e)
+
+    if options.cpus is not None:
+        attempt("affinity", hasattr(os, "sched_setaffinity"),
+                lambda: os.sched_setaffinity(0, options.cpus))
+    if options.fifo_priority is not None:
+        attempt("fifo", hasattr(os, "SCHED_FIFO"),
+                lambda: os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(options.fifo_priority)))
+    if options.nice is not None:
+        # На Linux nice - атрибут потоку (tid), а не всього процесу
+        attempt("nice", linux and hasattr(os, "setpriority"),
+                lambda: os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), options.nice))
+    if options.timer_slack_ns is not None:
+        attempt("timer_slack", linux, lambda: _set_timer_slack(options.timer_slack_ns))
+
+    for name, result in results.items():
+        if result != "ok":
+            log.warning("%s: не застосовано (%s)", name, result)
+    return results
+
+
+class GCGuard:
+    """
+    Тримає збирач сміття поза гарячим циклом на час серії кліків.
+
+    enter() на старті серії: одне збирання, потім gc.freeze() переносить
+    усі наявні об'єкти в постійне покоління (повні збирання їх не
+    обходять), а в режимі "disable" ще й вимикає автоматичні збирання.
+    exit() у простої повертає все як було й робить одне збирання поза
+    таймінгом. gc.freeze()/gc.disable() - стан усього процесу: поки
+    серія триває, GUI, pynput і решта потоків теж живуть без GC.
+    enter() викликається до того, як двигун ставить перший дедлайн,
+    тож його збирання не затримує перший клік.
+    """
+    def __init__(self, mode):
+        self.mode = mode
+        self._active = False
+        self._was_enabled = True
+
+    def enter(self):
+        if self.mode == "default" or self._active:
+            return
+        self._active = True
+        gc.collect()
+        gc.freeze()
+        if self.mode == "disable":
+            self._was_enabled = gc.isenabled()
+            gc.disable()
+
+    def exit(self):
+        if not self._active:
+            return
+        self._active = False
+        if self.mode == "disable" and self._was_enabled:
+            gc.enable()
+        gc.unfreeze()
+        gc.collect()
@@ -0,0 +1,182 @@
+import math
+from src.clock import SYSTEM_CLOCK, wait_until  # noqa: F401 (wait_until - для jobs/engine)
+from src.config import (
+    SCHEDULER_SPIN_NS, MISSED_DEADLINE_POLICY, MISSED_DEADLINE_POLICIES,
+    MAX_CATCH_UP_CLICKS
+)
+
+
+class DeadlineScheduler:
+    """
+    Планувальник кліків на абсолютних монотонних дедлайнах (perf_counter_ns).
+
+    На відміну від "клік, потім sleep(delay)", наступний дедлайн рахується
+    від попереднього дедлайну, а не від моменту завершення кліку, тому
+    затримка кліку та пересипання не накопичуються в дрейф.
+
+    Очікування гібридне (wait_until): грубий time.sleep() до SCHEDULER_SPIN_NS
+    перед дедлайном, далі активне очікування (spin) з time.sleep(0), щоб
+    віддавати GIL іншим потокам.
+
+    Час і очікування - через clock (SystemClock або VirtualClock у симуляції).
+
+    Політики для пропущених дедлайнів:
+        "catch_up" - наздоганяємо пропущені кліки без пауз
+                     (не більше MAX_CATCH_UP_CLICKS), середній CPS зберігається
+        "skip"     - пропущені кліки відкидаються, відлік йде від "зараз"
+    """
+    def __init__(self, spin_ns=SCHEDULER_SPIN_NS, policy=MISSED_DEADLINE_POLICY,
+                 max_catch_up=MAX_CATCH_UP_CLICKS, clock=SYSTEM_CLOCK):
+        if policy not in MISSED_DEADLINE_POLICIES:
+            raise ValueError(f"Невідома політика: {policy}")
+
+        self.spin_ns = spin_ns
+        self.policy = policy
+        self.max_catch_up = max_catch_up
+        self.clock = clock
+        self._now = clock.now_ns
+        self.reset()
+
+    def reset(self, start_ns=None, max_clicks=None, duration=None):
+        """
+        Скидає дедлайн та обнуляє статистику.
+
+        Args:
+            start_ns: перший дедлайн (perf_counter_ns), None - "зараз"
+            max_clicks: рівно стільки кліків у серії (None - без обмеження)
+            duration: тривалість серії в секундах від першого дедлайну
+        """
+        now = self._now()
+        self._deadline = now if start_ns is None else start_ns
+        self.max_clicks = max_clicks
+        self.end_ns = None if duration is None else self._deadline + int(duration * 1e9)
+
+        # Статистика (Welford для запізнення)
+        self._ticks = 0
+        self._clicks = 0
+        self._last_batch = 0
+        self._first_tick_ns = now
+        self._last_tick_ns = now
+        self._lateness_mean = 0.0
+        self._lateness_m2 = 0.0
+        self._lateness_max = 0
+        self._skipped = 0
+
+    @property
+    def deadline(self):
+        """Поточний дедлайн (perf_counter_ns)"""
+        return self._deadline
+
+    def rebase(self):
+        """Переносить дедлайн на "зараз" без скидання статистики (після паузи/помилки)"""
+        self._deadline = self._now()
+
+    def pull_in(self, interval):
+        """Підтягує дедлайн не далі ніж на interval секунд від "зараз" (після зміни CPS)"""
+        if self._ticks == 0:
+            return  # перший дедлайн - запланований старт серії
+        limit = self._now() + int(interval * 1e9)
+        if self._deadline > limit:
+            self._deadline = limit
+
+    def remaining(self):
+        """Скільки кліків лишилось до max_clicks (None - без обмеження)"""
+        if self.max_clicks is None:
+            return None
+        return self.max_clicks - self._clicks
+
+    def expired(self):
+        """
+        Чи вичерпано серію: max_clicks виконано або наступний дедлайн
+        не раніше кінця тривалості (кліку на межі вже не буде)
+        """
+        if self.max_clicks is not None and self._clicks >= self.max_clicks:
+            return True
+        return self.end_ns is not None and self._deadline >= self.end_ns
+
+    def wait(self, interrupt=None):
+        """
+        Чекає до поточного дедлайну та фіксує запізнення.
+
+        Args:
+            interrupt: threading.Event, встановлення якого перериває очікування
+
+        Returns:
+            int: фактичний час пробудження (perf_counter_ns)
+            або None, якщо очікування перервано
+        """
+        deadline = self._deadline
+        now = self.clock.wait_until(deadline, interrupt, self.spin_ns)
+        if now is None:
+            return None
+
+        self._record(now, now - deadline)
+        return now
+
+    def advance(self, interval, clicks=1):
+        """
+        Переносить дедлайн на interval секунд вперед від попереднього дедлайну.
+
+        Args:
+            interval: інтервал до наступного пробудження (секунди)
+            clicks: скільки кліків виконано за це пробудження
+        """
+        self.advance_ns(int(interval * 1e9), clicks)
+
+    def advance_ns(self, interval_ns, clicks=1):
+        """advance() з інтервалом у цілих наносекундах (без округлення)"""
+        self._clicks += clicks
+        self._last_batch = clicks
+
+        self._deadline += interval_ns
+
+        now = self._now()
+        behind = now - self._deadline
+        if behind <= 0:
+            return
+
+        if self.policy == "skip":
+            missed = behind // interval_ns if interval_ns > 0 else 0
+            self._skipped += missed
+            self._deadline = now
+        elif interval_ns > 0 and behind > interval_ns * self.max_catch_up:
+            # Відставання завелике - наздоганяти не має сенсу
+            self._skipped += behind // interval_ns - self.max_catch_up
+            self._deadline = now - interval_ns * self.max_catch_up
+
+    def _record(self, now, lateness):
+        """Оновлює статистику після пробудження"""
+        if self._ticks == 0:
+            self._first_tick_ns = now
+        self._ticks += 1
+        self._last_tick_ns = now
+
+        delta = lateness - self._lateness_mean
+        self._lateness_mean += delta / self._ticks
+        self._lateness_m2 += delta * (lateness - self._lateness_mean)
+        if lateness > self._lateness_max:
+            self._lateness_max = lateness
+
+    def stats(self):
+        """
+        Повертає виміряну статистику з моменту останнього reset().
+
+        Returns:
+            dict: achieved_cps, ticks (пробудження), clicks, skipped,
+            jitter_ms (стандартне відхилення запізнення), mean_lateness_ms,
+            max_lateness_ms
+        """
+        elapsed = self._last_tick_ns - self._first_tick_ns
+        # Кліки останньої групи ще не мають "кінця" інтервалу - не рахуємо їх
+        achieved = (self._clicks - self._last_batch) * 1e9 / elapsed if elapsed > 0 else 0.0
+        variance = self._lateness_m2 / self._ticks if self._ticks > 1 else 0.0
+
+        return {
+            "achieved_cps": achieved,
+            "ticks": self._ticks,
+            "clicks": self._clicks,
+            "skipped": self._skipped,
+            "jitter_ms": math.sqrt(variance) / 1e6,
+            "mean_lateness_ms": self._lateness_mean / 1e6,
+            "max_lateness_ms": self._lateness_max / 1e6,
+        }
@@ -0,0 +1,146 @@
+import json
+import math
+from src.config import (
+    DEFAULT_CPS, DEFAULT_RANDOMNESS, DEFAULT_BUTTON, DEFAULT_DISTRIBUTION,
+    CPS_MIN, CPS_MAX, RANDOMNESS_MIN, RANDOMNESS_MAX, VALID_BUTTONS,
+    VALID_DISTRIBUTIONS, BATCH_CPS_THRESHOLD
+)
+from src.plan import ClickPlan
+
+
+class EngineSettings:
+    """
+    Незмінний знімок налаштувань двигуна.
+
+    Двигун читає знімок одним присвоєнням (атомарно під GIL) раз на групу
+    кліків, без локів. Будь-яка зміна створює новий знімок через replace()
+    з version + 1, тож читач дешево помічає зміну порівнянням версій.
+
+    План цілей (ClickPlan або None) - теж частина знімка, тож профіль
+    змінює і налаштування, і план одним присвоєнням.
+
+    Для сумісності підтримує доступ як до словника: settings["target_cps"].
+    """
+    __slots__ = (
+        "target_cps", "randomness_pct", "button", "batch_threshold_cps",
+        "distribution", "plan", "version",
+    )
+
+    FIELDS = __slots__[:-1]
+
+    def __init__(self, target_cps=DEFAULT_CPS, randomness_pct=DEFAULT_RANDOMNESS,
+                 button=DEFAULT_BUTTON, batch_threshold_cps=BATCH_CPS_THRESHOLD,
+                 distribution=DEFAULT_DISTRIBUTION, plan=None, version=0):
+        set_field = object.__setattr__
+        set_field(self, "target_cps", target_cps)
+        set_field(self, "randomness_pct", randomness_pct)
+        set_field(self, "button", button)
+        set_field(self, "batch_threshold_cps", batch_threshold_cps)
+        set_field(self, "distribution", distribution)
+        set_field(self, "plan", plan)
+        set_field(self, "version", version)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("EngineSettings незмінний, використовуйте replace()")
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def replace(self, **changes):
+        """Новий знімок зі зміненими полями та наступною версією"""
+        values = self.as_dict()
+        values.update(changes)
+        return EngineSettings(version=self.version + 1, **values)
+
+    def as_dict(self):
+        """Поля знімка як словник (без version)"""
+        return {key: getattr(self, key) for key in self.FIELDS}
+
+    def to_json(self):
+        """Поля знімка у JSON-сумісному вигляді (план - як опис to_spec())"""
+        values = self.as_dict()
+        values["plan"] = self.plan.to_spec() if self.plan is not None else None
+        return values
+
+    def __repr__(self):
+        return f"EngineSettings(v{self.version}, {self.as_dict()})"
+
+
+def is_number(value):
+    """int або float (не bool), скінченне - те, що можна порівнювати з межами"""
+    return (isinstance(value, (int, float)) and not isinstance(value, bool)
+            and math.isfinite(value))
+
+
+def validate_setting(key, value):
+    """
+    Перевіряє одне значення налаштування (тип і діапазон). Не кидає винятків
+    на значення будь-якого типу, тож підходить для даних з JSON.
+
+    Returns:
+        str або None: текст помилки, або None якщо значення коректне
+    """
+    if key == "target_cps":
+        if not is_number(value) or not (CPS_MIN <= value <= CPS_MAX):
+            return f"CPS має бути числом від {CPS_MIN} до {CPS_MAX}"
+    elif key == "randomness_pct":
+        if not is_number(value) or not (RANDOMNESS_MIN <= value <= RANDOMNESS_MAX):
+            return f"Рандомність має бути числом від {RANDOMNESS_MIN} до {RANDOMNESS_MAX}%"
+    elif key == "button":
+        if not isinstance(value, str) or value not in VALID_BUTTONS:
+            return f"кнопка має бути однією з {VALID_BUTTONS}"
+    elif key == "batch_threshold_cps":
+        if not is_number(value) or not (CPS_MIN <= value <= CPS_MAX):
+            return f"поріг пакетного режиму має бути числом від {CPS_MIN} до {CPS_MAX}"
+    elif key == "distribution":
+        if not isinstance(value, str) or value not in VALID_DISTRIBUTIONS:
+            return f"розподіл має бути одним з {VALID_DISTRIBUTIONS}"
+    elif key == "plan":
+        if value is not None and not isinstance(value, ClickPlan):
+            return "план має бути ClickPlan або None"
+    else:
+        return f"невідоме налаштування '{key}'"
+    return None
+
+
+def decode_settings(data):
+    """
+    JSON-налаштування -> значення для update_settings_many: "plan" у вигляді
+    опису (словник to_spec()) стає ClickPlan. Одна функція для --profile,
+    команд керування set/load-profile та файлу задач, тож усі приймають
+    однакові файли.
+
+    Raises:
+        ValueError: data не словник або некоректний опис плану
+    """
+    if not isinstance(data, dict):
+        raise ValueError("налаштування мають бути JSON-об'єктом")
+    plan = data.get("plan")
+    if isinstance(plan, dict):
+        try:
+            plan = ClickPlan.from_spec(plan)
+        except TypeError as e:
+            raise ValueError(f"некоректний план: {e}") from e
+        data = dict(data, plan=plan)
+    return data
+
+
+def load_settings_file(path):
+    """
+    Читає JSON-файл налаштувань двигуна (без валідації - її робить
+    ClickerEngine.update_settings_many), план - через decode_settings.
+
+    Returns:
+        dict: {назва параметра: значення}
+
+    Raises:
+        OSError: файл не прочитано
+        ValueError: некоректний JSON, не об'єкт або некоректний план
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"Файл налаштувань має містити JSON-об'єкт: {path}")
+    return decode_settings(data)
@@ -0,0 +1,264 @@
+"""
+Симуляція двигуна у віртуальному часі.
+
+ClickerEngine.run() виконується прямо в потоці, що викликає, з VirtualClock:
+очікування дедлайнів не сплять, а переводять годинник, тож години клікання
+проходять за секунди реального часу, а результат повністю детермінований
+(той самий seed - ті самі кліки до наносекунди). Команди (toggle, зміни
+налаштувань, start з обмеженнями) плануються на віртуальні моменти й
+виконуються всередині очікувань двигуна - так само, як їх перервав би
+GUI чи сокет керування.
+
+Використання:
+    sim = Simulation({"target_cps": 200, "randomness_pct": 0})
+    sim.at(0, sim.engine.start_clicking)
+    sim.run(3600)
+    assert len(sim.clicks()) == 720_000
+    assert set(sim.intervals()) == {5_000_000}  # групи по 2, але кожен клік на своєму дедлайні
+
+Запуск вбудованих сценаріїв з перевірками:
+    python -m src.simulation
+    python -m src.simulation --scenario hour_200cps toggle_storm
+"""
+import argparse
+import contextlib
+import sys
+import time
+
+from src.clock import VirtualClock
+from src.engine import ClickerEngine, NullBackend
+from src.log import quiet as quiet_logs
+
+
+class Simulation:
+    """
+    Двигун + NullBackend на спільному VirtualClock.
+
+    Args:
+        settings: початкові налаштування (update_settings_many)
+        seed: сід генератора затримок
+        wall_start: час епохи на нулі симуляції (для start_clicking(at=...))
+        quiet: лише WARNING+ у лог під час run() (шторм toggle - тисячі записів)
+        **engine_kwargs: додаткові аргументи ClickerEngine
+
+    Raises:
+        ValueError: налаштування не пройшли валідацію
+    """
+    def __init__(self, settings=None, seed=0, wall_start=0.0, quiet=True, **engine_kwargs):
+        self.clock = VirtualClock(wall_start=wall_start)
+        self.backend = NullBackend(clock=self.clock)
+        self.engine = ClickerEngine(self.backend, seed=seed, clock=self.clock, **engine_kwargs)
+        self.quiet = quiet
+        if settings and not self.engine.update_settings_many(settings):
+            raise ValueError(f"Некоректні налаштування симуляції: {settings}")
+
+    @staticmethod
+    def ns(seconds):
+        """Секунди симуляції -> віртуальні наносекунди"""
+        return int(round(seconds * 1e9))
+
+    def at(self, seconds, fn, *args, **kwargs):
+        """Планує fn(*args, **kwargs) на момент seconds від початку симуляції"""
+        self.clock.call_at(self.ns(seconds), lambda: fn(*args, **kwargs))
+        return self
+
+    def every(self, period, fn, *args, start=0.0, until=None, **kwargs):
+        """Планує fn кожні period секунд з start до until (включно)"""
+        step = self.ns(period)
+        if step <= 0:
+            raise ValueError("Період має бути додатним")
+        t = self.ns(start)
+        end = self.ns(until) if until is not None else None
+        if end is None:
+            raise ValueError("every() потребує until - інакше симуляція не скінчиться")
+        while t <= end:
+            self.clock.call_at(t, lambda: fn(*args, **kwargs))
+            t += step
+        return self
+
+    def run(self, duration):
+        """
+        Виконує run() двигуна до моменту duration (секунди симуляції).
+
+        Returns:
+            Simulation: self (для ланцюжків)
+        """
+        self.clock.call_at(self.ns(duration), self.engine.stop_engine)
+        started = time.perf_counter()
+        with quiet_logs() if self.quiet else contextlib.nullcontext():
+            self.engine.run()
+        self.elapsed = time.perf_counter() - started
+        return self
+
+    def clicks(self, start=None, end=None):
+        """Віртуальні моменти кліків (нс), опційно в [start, end) секунд"""
+        stamps = [t for t, _ in self.backend.clicks]
+        if start is None and end is None:
+            return stamps
+        lo = self.ns(start) if start is not None else float("-inf")
+        hi = self.ns(end) if end is not None else float("inf")
+        return [t for t in stamps if lo <= t < hi]
+
+    def intervals(self, start=None, end=None):
+        """Інтервали між сусідніми кліками (нс)"""
+        stamps = self.clicks(start, end)
+        return [b - a for a, b in zip(stamps, stamps[1:])]
+
+
+# --- Вбудовані сценарії ---
+
+def _expect(name, actual, expected):
+    if actual == expected:
+        return
+    if isinstance(actual, list) and isinstance(expected, list):
+        # Для довгих списків - лише перша розбіжність
+        index = next((i for i, (a, e) in enumerate(zip(actual, expected)) if a != e),
+                     min(len(actual), len(expected)))
+        raise AssertionError(
+            f"{name}: розбіжність на позиції {index} з {len(expected)} "
+            f"(очікувалось {expected[index:index + 3]}, отримано {actual[index:index + 3]})"
+        )
+    raise AssertionError(f"{name}: очікувалось {expected!r}, отримано {actual!r}")
+
+
+def scenario_hour_200cps():
+    """
+    Година на 200 CPS з налаштуваннями за замовчуванням (пакетний режим,
+    групи по 2): рівно 720 000 кліків кожні 5 мс, без жодного зсуву
+    """
+    sim = Simulation({"target_cps": 200, "randomness_pct": 0})
+    sim.at(0, sim.engine.start_clicking)
+    sim.run(3600)
+    expected = [k * 5_000_000 for k in range(720_000)]
+    _expect("моменти кліків", sim.clicks(), expected)
+    return sim
+
+
+def scenario_toggle_storm():
+    """
+    10 000 toggle кожні 7 мс: у кожному увімкненому вікні рівно два кліки
+    (на старті та через 5 мс), після стопу - жодного
+    """
+    sim = Simulation({"target_cps": 200, "randomness_pct": 0})
+    sim.every(0.007, sim.engine.toggle, until=69.993)
+    sim.run(71)
+    expected = [k * 14_000_000 + offset for k in range(5000) for offset in (0, 5_000_000)]
+    _expect("моменти кліків", sim.clicks(), expected)
+    _expect("стан після шторму", sim.engine.is_clicking(), False)
+    return sim
+
+
+def scenario_settings_changes():
+    """Зміна CPS щосекунди: кожен відрізок має свій точний інтервал"""
+    plan = [(0, 100), (1, 200), (2, 50), (3, 400)]
+    sim = Simulation({"target_cps": 100, "randomness_pct": 0, "batch_threshold_cps": 1000})
+    sim.at(0, sim.engine.start_clicking)
+    for t, cps in plan[1:]:
+        sim.at(t, sim.engine.update_settings, "target_cps", cps)
+    sim.run(4)
+    for t, cps in plan:
+        # Перший інтервал після зміни ще може бути перехідним - перевіряємо решту
+        intervals = sim.intervals(t + 0.1, t + 1)
+        _expect(f"інтервали на {cps} CPS", set(intervals), {int(1e9 / cps)})
+    return sim
+
+
+def scenario_batch_matches_single():
+    """
+    Пакетний режим не змінює розподіл інтервалів: той самий seed з рандомністю
+    дає ті самі інтервали між кліками, що й одиночний режим (до округлення в 1 нс)
+    """
+    runs = []
+    for threshold in (100, 1000):
+        sim = Simulation({"target_cps": 400, "randomness_pct": 30,
+                          "batch_threshold_cps": threshold}, seed=7)
+        sim.at(0, sim.engine.start_clicking)
+        sim.run(60)
+        runs.append(sim.intervals())
+    _expect("кількість інтервалів", len(runs[0]), len(runs[1]))
+    difference = max(abs(a - b) for a, b in zip(*runs))
+    _expect("інтервали однакові до 1 нс", difference <= 1, True)
+    return sim
+
+
+def scenario_randomness_bounds():
+    """
+    Регулятор CPS увімкнений (за замовчуванням): без навантаження він не
+    розширює розподіл - кожен інтервал у межах ±randomness_pct від 1/CPS
+    """
+    last = None
+    for cps, pct in ((10, 20), (10, 50), (50, 50), (400, 30)):
+        sim = Simulation({"target_cps": cps, "randomness_pct": pct}, seed=3)
+        sim.at(0, sim.engine.start_clicking)
+        sim.run(120)
+        intervals = sim.intervals()
+        base = 1e9 / cps
+        low, high = base * (1 - pct / 100) - 1, base * (1 + pct / 100) + 1
+        _expect(f"мінімум інтервалу на {cps} CPS ±{pct}%", min(intervals) >= low, True)
+        _expect(f"максимум інтервалу на {cps} CPS ±{pct}%", max(intervals) <= high, True)
+        _expect(f"множник регулятора на {cps} CPS", abs(sim.engine.rate.correction - 1) < 1e-6, True)
+        last = sim
+    return last
+
+
+def scenario_limits():
+    """count та duration: рівно задані кліки, незалежно від storm-команд поруч"""
+    sim = Simulation({"target_cps": 200, "randomness_pct": 0})
+    sim.at(0, sim.engine.start_clicking, count=1000)
+    sim.at(10, sim.engine.start_clicking, duration=2.5)
+    sim.run(20)
+    _expect("кліків у count-серії", len(sim.clicks(0, 10)), 1000)
+    _expect("кліків у duration-серії", len(sim.clicks(10, 20)), 500)
+    _expect("стан після серій", sim.engine.is_clicking(), False)
+    return sim
+
+
+def scenario_randomized_reproducible():
+    """Рандомність 30%: однаковий seed - однакові кліки, середній CPS тримається"""
+    runs = []
+    for _ in range(2):
+        sim = Simulation({"target_cps": 200, "randomness_pct": 30}, seed=42)
+        sim.at(0, sim.engine.start_clicking)
+        sim.run(600)
+        runs.append(sim.clicks())
+    _expect("відтворюваність", runs[0] == runs[1], True)
+    cps = (len(runs[0]) - 1) * 1e9 / (runs[0][-1] - runs[0][0])
+    _expect("середній CPS у межах 1%", abs(cps - 200) < 2, True)
+    return sim
+
+
+SCENARIOS = {
+    "hour_200cps": scenario_hour_200cps,
+    "toggle_storm": scenario_toggle_storm,
+    "settings_changes": scenario_settings_changes,
+    "batch_matches_single": scenario_batch_matches_single,
+    "randomness_bounds": scenario_randomness_bounds,
+    "limits": scenario_limits,
+    "randomized_reproducible": scenario_randomized_reproducible,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Сценарії двигуна у віртуальному часі")
+    parser.add_argument("--scenario", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for name in args.scenario:
+        started = time.perf_counter()
+        try:
+            sim = SCENARIOS[name]()
+        except AssertionError as e:
+            failures += 1
+            print(f"[Sim] {name}: FAIL - {e}")
+            continue
+        print(
+            f"[Sim] {name}: OK - {len(sim.clicks())} кліків за "
+            f"{sim.clock.now_ns() / 1e9:g} с віртуального часу, "
+            f"{(time.perf_counter() - started) * 1e3:.0f} мс реального"
+        )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+import math
+from array import array
+from src.clock import SYSTEM_CLOCK
+from src.config import TELEMETRY_RING_SIZE, TELEMETRY_WINDOW
+
+
+class Telemetry:
+    """
+    Живі лічильники двигуна без локів.
+
+    Пише лише потік двигуна (один запис на групу кліків у кільцевий буфер
+    фіксованого розміру), а GUI читає snapshot() з низькою частотою.
+    Читання може зачепити запис, що якраз оновлюється, - це дає похибку в
+    одну групу, але ніколи не блокує потік кліків.
+    """
+    def __init__(self, size=TELEMETRY_RING_SIZE, clock=SYSTEM_CLOCK):
+        self._size = size
+        self._clock = clock
+        self._stamps = array("q", [0]) * size  # perf_counter_ns пробудження
+        self._counts = array("l", [0]) * size  # кліків у групі
+        self._written = 0
+
+        self.clicks = 0
+        self.errors = 0
+        self.last_error = None
+
+    def record(self, now_ns, count):
+        """Фіксує групу з count кліків (викликається потоком двигуна)"""
+        slot = self._written % self._size
+        self._stamps[slot] = now_ns
+        self._counts[slot] = count
+        self._written += 1
+        self.clicks += count
+
+    def record_error(self, error):
+        """
+        Фіксує помилку кліку.
+
+        Returns:
+            bool: True якщо текст помилки новий (варто показати користувачу)
+        """
+        self.errors += 1
+        message = str(error)
+        if message == self.last_error:
+            return False
+        self.last_error = message
+        return True
+
+    def snapshot(self, window=TELEMETRY_WINDOW):
+        """
+        Ковзна статистика за останні window секунд.
+
+        Returns:
+            dict: cps, jitter_ms (стандартне відхилення інтервалів між
+            групами), clicks, errors, last_error
+        """
+        now = self._clock.now_ns()
+        horizon = now - int(window * 1e9)
+        written = self._written
+
+        stamps = []
+        clicks = 0
+        for i in range(min(written, self._size)):
+            slot = (written - 1 - i) % self._size
+            stamp = self._stamps[slot]
+            if stamp < horizon:
+                break
+            stamps.append(stamp)
+            clicks += self._counts[slot]
+
+        cps = 0.0
+        jitter_ms = 0.0
+        if len(stamps) > 1:
+            # Найстаріша група лише відкриває вікно - її кліки не рахуємо
+            clicks -= self._counts[(written - len(stamps)) % self._size]
+            cps = clicks * 1e9 / (stamps[0] - stamps[-1])
+
+            intervals = [a - b for a, b in zip(stamps, stamps[1:])]
+            mean = sum(intervals) / len(intervals)
+            variance = sum((x - mean) ** 2 for x in intervals) / len(intervals)
+            jitter_ms = math.sqrt(variance) / 1e6
+
+        return {
+            "cps": cps,
+            "jitter_ms": jitter_ms,
+            "clicks": self.clicks,
+            "errors": self.errors,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,103 @@
+import cProfile
+import csv
+import json
+from array import array
+from src.config import TRACE_RING_SIZE
+
+
+class ClickTrace:
+    """
+    Опційне трасування кожного кліку двигуна.
+
+    Для кожного кліку фіксуються три моменти perf_counter_ns: запланований
+    дедлайн, початок виклику бекенду та повернення з нього. Буфери - заздалегідь
+    виділені кільцеві array('q'), тож запис не виділяє пам'яті під структури.
+
+    Розрив між дедлайном і dispatch - час, втрачений у планувальнику/GIL,
+    між dispatch і return - у бекенді та системному стеку вводу.
+
+    profile=True додатково вмикає cProfile лише навколо викликів бекенду.
+    """
+    def __init__(self, size=TRACE_RING_SIZE, profile=False):
+        self._size = size
+        self._scheduled = array("q", [0]) * size
+        self._dispatched = array("q", [0]) * size
+        self._returned = array("q", [0]) * size
+        self._written = 0
+        self.profiler = cProfile.Profile() if profile else None
+
+    def record(self, scheduled, dispatched, returned):
+        """Фіксує один клік (викликається потоком двигуна)"""
+        slot = self._written % self._size
+        self._scheduled[slot] = scheduled
+        self._dispatched[slot] = dispatched
+        self._returned[slot] = returned
+        self._written += 1
+
+    def __len__(self):
+        return min(self._written, self._size)
+
+    def events(self):
+        """Записані кліки від найстарішого: список (scheduled, dispatched, returned)"""
+        count = len(self)
+        start = self._written - count
+        return [
+            (self._scheduled[i % self._size], self._dispatched[i % self._size],
+             self._returned[i % self._size])
+            for i in range(start, start + count)
+        ]
+
+    def summary(self):
+        """Середні та максимальні затримки планувальника і бекенду (мс)"""
+        events = self.events()
+        if not events:
+            return {"clicks": 0}
+        sched = [d - s for s, d, _ in events]
+        backend = [r - d for _, d, r in events]
+        return {
+            "clicks": len(events),
+            "sched_mean_ms": sum(sched) / len(sched) / 1e6,
+            "sched_max_ms": max(sched) / 1e6,
+            "backend_mean_ms": sum(backend) / len(backend) / 1e6,
+            "backend_max_ms": max(backend) / 1e6,
+        }
+
+    def export_csv(self, path):
+        """CSV: часи в нс відносно першого кліку + похідні затримки"""
+        events = self.events()
+        origin = events[0][0] if events else 0
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["index", "scheduled_ns", "dispatched_ns", "returned_ns",
+                             "sched_lateness_ns", "backend_ns"])
+            for i, (s, d, r) in enumerate(events):
+                writer.writerow([i, s - origin, d - origin, r - origin, d - s, r - d])
+
+    def export_chrome(self, path):
+        """
+        Chrome trace-event JSON (chrome://tracing, Perfetto): для кожного кліку
+        подія "lateness" (дедлайн -> dispatch) та "backend" (dispatch -> return).
+        """
+        events = self.events()
+        origin = events[0][0] if events else 0
+        trace = []
+        for i, (s, d, r) in enumerate(events):
+            trace.append({
+                "name": "lateness", "cat": "scheduler", "ph": "X", "pid": 1, "tid": 1,
+                "ts": (s - origin) / 1e3, "dur": (d - s) / 1e3, "args": {"click": i},
+            })
+            trace.append({
+                "name": "backend", "cat": "backend", "ph": "X", "pid": 1, "tid": 2,
+                "ts": (d - origin) / 1e3, "dur": (r - d) / 1e3, "args": {"click": i},
+            })
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+
+    def export(self, path):
+        """Експорт за розширенням: .csv - CSV, інакше Chrome JSON; .prof - поруч для cProfile"""
+        if path.endswith(".csv"):
+            self.export_csv(path)
+        else:
+            self.export_chrome(path)
+        if self.profiler is not None:
+            self.profiler.dump_stats(path.rsplit(".", 1)[0] + ".prof")
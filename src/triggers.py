@@ -0,0 +1,265 @@
+"""
+Клікання за станом екрана: пікселем, кольором області або шаблоном.
+
+Захоплюється лише мала область інтересу через швидкий грабер:
+mss (з'єднання з дисплеєм відкривається один раз у потоці, що захоплює)
+або Pillow ImageGrab як запасний варіант. Кожен кадр - новий буфер від
+грабера; для області в кілька пікселів це дешевше за саме захоплення.
+Перевірки векторизовані через NumPy, якщо він встановлений
+(np.frombuffer читає кадр без ще однієї копії), інакше - чистий Python
+по байтах (прийнятно для малих областей).
+"""
+import threading
+import time
+from src.config import TRIGGER_INTERVAL, TRIGGER_TOLERANCE
+from src.log import get_logger
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+log = get_logger("trigger")
+
+
+# --- Грабери ---
+
+class MSSGrabber:
+    """
+    Захоплення через mss (BGRA).
+
+    Екземпляр mss прив'язаний до потоку, що його створив (з'єднання X11,
+    контексти GDI), тому створюється ліниво - окремий на кожен потік,
+    що викликає grab(), при першому захопленні в ньому.
+    """
+    name = "mss"
+    channels = 4
+    order = (2, 1, 0)  # індекси R, G, B у пікселі
+
+    def __init__(self):
+        import mss
+        self._mss = mss.mss
+        self._local = threading.local()
+
+    @classmethod
+    def is_available(cls):
+        try:
+            import mss  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def grab(self, region):
+        """region = (x, y, w, h) -> сирі байти BGRA"""
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            sct = self._local.sct = self._mss()
+        x, y, w, h = region
+        return sct.grab({"left": x, "top": y, "width": w, "height": h}).raw
+
+    def close(self):
+        """Закриває mss поточного потоку (викликає потік, що захоплював)"""
+        sct = getattr(self._local, "sct", None)
+        if sct is not None:
+            self._local.sct = None
+            sct.close()
+
+
+class PillowGrabber:
+    """Запасний варіант через Pillow ImageGrab (RGB)"""
+    name = "pillow"
+    channels = 3
+    order = (0, 1, 2)
+
+    def __init__(self):
+        from PIL import ImageGrab
+        self._grab = ImageGrab.grab
+
+    @classmethod
+    def is_available(cls):
+        try:
+            from PIL import ImageGrab  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def grab(self, region):
+        x, y, w, h = region
+        return self._grab(bbox=(x, y, x + w, y + h)).convert("RGB").tobytes()
+
+    def close(self):
+        pass
+
+
+def create_grabber():
+    """Найшвидший доступний грабер"""
+    for cls in (MSSGrabber, PillowGrabber):
+        if cls.is_available():
+            return cls()
+    raise RuntimeError("Немає грабера екрана: потрібен mss або Pillow")
+
+
+# --- Умови ---
+
+class ColorCondition:
+    """
+    Частка пікселів області, що збігаються з кольором rgb (± tolerance
+    по кожному каналу), не менша за min_fraction. Піксель - область 1x1.
+    """
+    def __init__(self, region, rgb, tolerance=TRIGGER_TOLERANCE, min_fraction=1.0):
+        self.region = tuple(int(v) for v in region)
+        self.rgb = tuple(rgb)
+        self.tolerance = tolerance
+        self.min_fraction = min_fraction
+        self._pixels = self.region[2] * self.region[3]
+        self._bound = None
+
+    @classmethod
+    def pixel(cls, x, y, rgb, tolerance=TRIGGER_TOLERANCE):
+        return cls((x, y, 1, 1), rgb, tolerance)
+
+    def bind(self, grabber):
+        """Готує межі під розкладку каналів грабера (один раз, не на кожен кадр)"""
+        low = [0] * grabber.channels
+        high = [255] * grabber.channels
+        for value, index in zip(self.rgb, grabber.order):
+            low[index] = max(0, value - self.tolerance)
+            high[index] = min(255, value + self.tolerance)
+        if np is not None:
+            self._bound = (np.array(low, np.uint8), np.array(high, np.uint8), grabber.channels)
+        else:
+            self._bound = (low, high, grabber.channels)
+
+    def check(self, frame):
+        low, high, channels = self._bound
+        need = self.min_fraction * self._pixels
+        if np is not None:
+            pixels = np.frombuffer(frame, np.uint8).reshape(-1, channels)
+            matches = np.count_nonzero(((pixels >= low) & (pixels <= high)).all(axis=1))
+            return matches >= need
+
+        matches = 0
+        for offset in range(0, len(frame), channels):
+            for c in range(channels):
+                if not (low[c] <= frame[offset + c] <= high[c]):
+                    break
+            else:
+                matches += 1
+        return matches >= need
+
+
+class TemplateCondition:
+    """
+    Область збігається з раніше захопленим шаблоном: середня абсолютна
+    різниця каналів не більша за tolerance.
+    """
+    def __init__(self, region, template, tolerance=TRIGGER_TOLERANCE):
+        self.region = tuple(int(v) for v in region)
+        self.tolerance = tolerance
+        self._template = template
+
+    @classmethod
+    def capture(cls, grabber, region, tolerance=TRIGGER_TOLERANCE):
+        """Захоплює поточний вміст області як шаблон"""
+        return cls(region, bytes(grabber.grab(region)), tolerance)
+
+    def bind(self, grabber):
+        if np is not None:
+            self._template = np.frombuffer(self._template, np.uint8).astype(np.int16)
+
+    def check(self, frame):
+        if np is not None:
+            diff = np.abs(np.frombuffer(frame, np.uint8).astype(np.int16) - self._template)
+            return diff.mean() <= self.tolerance
+
+        total = sum(abs(a - b) for a, b in zip(frame, self._template))
+        return total <= self.tolerance * len(frame)
+
+
+def parse_trigger_spec(spec, tolerance=None):
+    """'X,Y=RRGGBB' (піксель) або 'X,Y,W,H=RRGGBB' (область) -> ColorCondition"""
+    try:
+        coords, color = spec.split("=")
+        numbers = [int(v) for v in coords.split(",")]
+        color = color.lstrip("#")
+        rgb = tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+    except ValueError:
+        raise ValueError(f"Некоректний тригер '{spec}': очікується X,Y[,W,H]=RRGGBB")
+    if len(color) != 6 or len(numbers) not in (2, 4):
+        raise ValueError(f"Некоректний тригер '{spec}': очікується X,Y[,W,H]=RRGGBB")
+    if len(numbers) == 2:
+        numbers += [1, 1]
+    if numbers[2] <= 0 or numbers[3] <= 0:
+        raise ValueError("Розмір області тригера має бути додатним")
+    if tolerance is None:
+        tolerance = TRIGGER_TOLERANCE
+    return ColorCondition(numbers, rgb, tolerance)
+
+
+# --- Тригер ---
+
+class ScreenTrigger(threading.Thread):
+    """
+    Потік, що перевіряє умову кожні interval секунд і керує двигуном.
+
+    Режими:
+        "gate" - клікати, поки умова істинна (старт/стоп на фронтах)
+        "fire" - лише запускати клікання, коли умова стає істинною
+    Двигун отримує команду лише при зміні стану, а не на кожен кадр.
+    """
+    def __init__(self, engine, condition, grabber=None, interval=TRIGGER_INTERVAL, mode="gate"):
+        super().__init__()
+        self.daemon = True
+        if mode not in ("gate", "fire"):
+            raise ValueError("Режим тригера має бути 'gate' або 'fire'")
+
+        self.engine = engine
+        self.condition = condition
+        self.grabber = grabber or create_grabber()
+        self.interval = interval
+        self.mode = mode
+        self.condition.bind(self.grabber)
+
+        self.checks = 0
+        self.check_total_ns = 0
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def check_latency_ms(self):
+        """Середній час захоплення + перевірки одного кадру"""
+        return self.check_total_ns / self.checks / 1e6 if self.checks else 0.0
+
+    def run(self):
+        log.info("Старт (%s, кожні %.1f мс)", self.grabber.name, self.interval * 1e3)
+        region = self.condition.region
+        grab = self.grabber.grab
+        check = self.condition.check
+        active = False
+
+        while not self._stop_event.is_set():
+            start = time.perf_counter_ns()
+            try:
+                matched = check(grab(region))
+            except Exception as e:
+                log.error("Помилка захоплення: %s", e)
+                self._stop_event.wait(self.interval * 10)
+                continue
+            self.check_total_ns += time.perf_counter_ns() - start
+            self.checks += 1
+
+            if matched and not active:
+                self.engine.start_clicking()
+                active = True
+            elif not matched and active:
+                if self.mode == "gate":
+                    self.engine.stop_clicking()
+                active = False
+
+            self._stop_event.wait(self.interval)
+
+        if active and self.mode == "gate":
+            self.engine.stop_clicking()
+        self.grabber.close()
+        log.info("Зупинено")
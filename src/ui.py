@@ -1,29 +1,40 @@
 import customtkinter as ctk
-from pynput import keyboard
-from src.engine import ClickerEngine
+from src.engine import ClickerEngine, NullBackend, create_backend
+from src.hotkeys import HotkeyDispatcher, parse_hotkey
+from src.log import get_logger
+from src.profiles import Profile, ProfileStore
 from src.config import (
-    DEFAULT_HOTKEY, WINDOW_TITLE, WINDOW_WIDTH, WINDOW_HEIGHT,
+    DEFAULT_HOTKEY, HOTKEY_BINDINGS, WINDOW_TITLE, WINDOW_WIDTH, WINDOW_HEIGHT,
     COLOR_STOP, COLOR_STOP_HOVER, COLOR_START, COLOR_START_HOVER,
-    GUI_MARSHAL_DELAY
+    GUI_FRAME_MS, CPS_MIN, CPS_MAX, TELEMETRY_POLL_MS
 )
 
+log = get_logger("ui")
+
 
 class AutoClickerApp(ctk.CTk):
     """
     Головне вікно програми. Відповідає за GUI та делегує команди ClickerEngine.
-    Thread-safe комунікація з engine через .after() для cross-thread GUI updates.
+
+    Усі оновлення вікна зведені в один кадр (_frame_tick, раз на GUI_FRAME_MS):
+    події слайдерів, гарячих клавіш і двигуна лише позначають стан, а кадр
+    застосовує останнє значення. Черга .after() не росте від спаму подій.
     """
     def __init__(self):
         super().__init__()
 
-        # Ініціалізація двигуна
-        self.engine = ClickerEngine()
+        # Ініціалізація двигуна. Справжній бекенд (pyautogui/pynput) підключається
+        # на першому кадрі, щоб його імпорт не затримував появу вікна
+        self.engine = ClickerEngine(backend=NullBackend(record=False))
         self.engine.start()
 
-        # Налаштування гарячої клавіші
+        # Профілі (читаються та валідуються один раз)
+        self.profiles = ProfileStore().load()
+
+        # Гарячі клавіші: pynput вантажиться на першому кадрі (_deferred_init)
         self.hotkey_char = DEFAULT_HOTKEY
-        self.listener = keyboard.Listener(on_press=self.on_hotkey_press)
-        self.listener.start()
+        self.hotkeys = None
+        self.listener = None
 
         # GUI налаштування
         self.title(WINDOW_TITLE)
@@ -36,10 +47,23 @@ class AutoClickerApp(ctk.CTk):
         self.button_var = ctk.StringVar(value=self.engine.settings["button"])
         self.hotkey_var = ctk.StringVar(value=self.hotkey_char.upper())
         self.status_var = ctk.StringVar(value="Статус: НЕАКТИВНО")
+        self.telemetry_var = ctk.StringVar(value="")
+        self.profile_var = ctk.StringVar(value="Профіль")
+
+        # Стан, що чекає на наступний кадр (пишуть обробники подій, читає лише кадр)
+        self._settings_dirty = False
+        self._pending_profile = None  # з потоку pynput - одне присвоєння
+        self._shown_active = None
+        self._frame = 0
+        self._initialized = False  # _deferred_init виконується рівно один раз
+        self._telemetry_every = max(1, TELEMETRY_POLL_MS // GUI_FRAME_MS)
 
         self._setup_ui()
         self.update_engine_settings()
 
+        # Єдиний періодичний кадр GUI (жодних Tk-викликів з інших потоків)
+        self._frame_job = self.after(GUI_FRAME_MS, self._frame_tick)
+
     def _setup_ui(self):
         """Створення та розміщення елементів інтерфейсу"""
         main_frame = ctk.CTkFrame(self)
@@ -63,11 +87,12 @@ class AutoClickerApp(ctk.CTk):
         )
         self.cps_value_label.pack(side="right", padx=(0, 10))
 
-        cps_slider = ctk.CTkSlider(
-            main_frame, from_=1, to=200, variable=self.cps_var, 
+        # Верхня межа - CPS_MAX, доки не відомий справжній бекенд (_sync_cps_range)
+        self.cps_slider = ctk.CTkSlider(
+            main_frame, from_=CPS_MIN, to=CPS_MAX, variable=self.cps_var, 
             command=self.on_cps_change
         )
-        cps_slider.pack(fill="x", padx=10, pady=(0, 10))
+        self.cps_slider.pack(fill="x", padx=10, pady=(0, 10))
 
         # --- Секція Рандомності (Олюднення) ---
         rand_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
@@ -102,6 +127,21 @@ class AutoClickerApp(ctk.CTk):
         )
         btn_option.pack(side="right")
 
+        # --- Секція Профілів ---
+        profile_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        profile_frame.pack(fill="x", pady=(0, 10), padx=10)
+
+        self.profile_option = ctk.CTkOptionMenu(
+            profile_frame, values=self.profiles.names() or ["—"],
+            variable=self.profile_var, command=self.on_profile_select
+        )
+        self.profile_option.pack(side="left")
+
+        profile_save_btn = ctk.CTkButton(
+            profile_frame, text="Зберегти як...", width=110, command=self.on_profile_save
+        )
+        profile_save_btn.pack(side="right")
+
         # --- Секція Гарячої клавіші ---
         hotkey_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
         hotkey_frame.pack(fill="x", pady=(10, 20), padx=10)
@@ -132,7 +172,14 @@ class AutoClickerApp(ctk.CTk):
             main_frame, textvariable=self.status_var, 
             font=ctk.CTkFont(size=12)
         )
-        self.status_label.pack(pady=(5, 10))
+        self.status_label.pack(pady=(5, 0))
+
+        # Телеметрія
+        self.telemetry_label = ctk.CTkLabel(
+            main_frame, textvariable=self.telemetry_var,
+            font=ctk.CTkFont(size=11), text_color="gray", justify="left"
+        )
+        self.telemetry_label.pack(pady=(0, 10))
 
         # Інфо
         info_label = ctk.CTkLabel(
@@ -143,32 +190,131 @@ class AutoClickerApp(ctk.CTk):
 
     # --- Callbacks ---
     def on_cps_change(self, value):
-        self.cps_value_label.configure(text=f"{value:.1f}")
-        self.update_engine_settings()
+        self._settings_dirty = True
 
     def on_random_change(self, value):
-        self.rand_value_label.configure(text=f"{value:.0f}%")
-        self.update_engine_settings()
+        self._settings_dirty = True
 
     def on_button_change(self, value):
-        self.update_engine_settings()
+        self._settings_dirty = True
 
     def on_hotkey_update(self):
-        """Оновлення гарячої клавіші"""
+        """Оновлення гарячої клавіші старт/стоп (буква, "f6", "ctrl+s"...)"""
         new_key = self.hotkey_var.get().lower().strip()
-        if len(new_key) == 1 and new_key.isalpha():
+        old_key = self.hotkey_char
+        try:
+            parse_hotkey(new_key)
             self.hotkey_char = new_key
-            print(f"[GUI] Гаряча клавіша змінена на '{new_key.upper()}'")
-        else:
-            self.hotkey_var.set(self.hotkey_char.upper())
-            print("[GUI] Помилка: введіть одну букву")
+            self._compile_hotkeys()
+        except ValueError as e:
+            self.hotkey_char = old_key
+            self.hotkey_var.set(old_key.upper())
+            log.error("Помилка: %s", e)
+            return
+        self.update_gui_state(self.engine.is_clicking())
+        log.info("Гаряча клавіша змінена на '%s'", new_key.upper())
+
+    def _deferred_init(self):
+        """
+        Важкі модулі - на першому кадрі, коли вікно вже показано.
+        Кроки незалежні: без бекенду чи pynput вікно все одно працює.
+        """
+        try:
+            self.engine.set_backend(create_backend())
+        except Exception:
+            log.exception("Бекенд кліків не ініціалізовано")
+        self._sync_cps_range()
+        try:
+            self._start_hotkeys()
+        except Exception:
+            log.exception("Гарячі клавіші недоступні")
+
+    def _sync_cps_range(self):
+        """Слайдер CPS не виходить за межу поточного бекенду (MAX_CPS)"""
+        max_cps = self.engine.backend.MAX_CPS
+        self.cps_slider.configure(to=max_cps)
+        if self.cps_var.get() > max_cps:
+            self.cps_var.set(max_cps)
+            self.update_engine_settings()
+
+    def _start_hotkeys(self):
+        """Створює таблицю гарячих клавіш і запускає слухача pynput"""
+        from pynput import keyboard
+
+        self.hotkeys = HotkeyDispatcher({
+            "toggle": self.on_hotkey_toggle,
+            "start": self.on_hotkey_start,
+            "stop": self.on_hotkey_stop,
+            "panic": self.on_hotkey_stop,
+            "profile": self.on_hotkey_profile,
+        }, key_class=keyboard.Key)
+        self._compile_hotkeys()
+        self.listener = keyboard.Listener(
+            on_press=self.hotkeys.on_press, on_release=self.hotkeys.on_release
+        )
+        self.listener.start()
+
+    def _compile_hotkeys(self):
+        """Перебудовує таблицю: HOTKEY_BINDINGS + клавіші профілів + клавіша старт/стоп"""
+        if self.hotkeys is None:
+            return  # скомпілюється при старті слухача
+        bindings = dict(HOTKEY_BINDINGS)
+        bindings.update(self.profiles.hotkey_bindings())
+        bindings[self.hotkey_char] = "toggle"  # старт/стоп важливіший за профіль
+        self.hotkeys.compile(bindings)
+
+    def on_profile_select(self, name):
+        """Перемикає двигун на профіль одним знімком та синхронізує GUI"""
+        if name not in self.profiles:
+            return
+        profile = self.profiles.get(name)
+        if not self.engine.apply_profile(profile):
+            return
+
+        settings = self.engine.settings
+        self.cps_var.set(settings["target_cps"])
+        self.random_var.set(settings["randomness_pct"])
+        self.button_var.set(settings["button"])
+        self.cps_value_label.configure(text=f"{settings['target_cps']:.1f}")
+        self.rand_value_label.configure(text=f"{settings['randomness_pct']:.0f}%")
+        self._sync_cps_range()
+        self.update_gui_state(self.engine.is_clicking())
+
+    def on_profile_save(self):
+        """Зберігає поточні налаштування як іменований профіль"""
+        dialog = ctk.CTkInputDialog(text="Назва профілю:", title="Зберегти профіль")
+        name = (dialog.get_input() or "").strip()
+        if not name:
+            return
+
+        settings = self.engine.settings.as_dict()
+        plan = settings.pop("plan")
+        # Клавіша перемикання на профіль зберігається при перезаписі
+        hotkey = self.profiles.get(name).hotkey if name in self.profiles else None
+        try:
+            profile = Profile(
+                name, settings, hotkey=hotkey,
+                backend=self.engine.backend.name, plan=plan
+            )
+        except ValueError as e:
+            log.error("Помилка: %s", e)
+            return
+
+        self.profiles.add(profile)
+        self.profiles.save()
+        self._compile_hotkeys()
+        self.profile_option.configure(values=self.profiles.names())
+        self.profile_var.set(name)
+        log.info("Профіль '%s' збережено", name)
 
     def update_engine_settings(self):
-        """Передає поточні значення з GUI у двигун з валідацією"""
-        success = True
-        success &= self.engine.update_settings("target_cps", self.cps_var.get())
-        success &= self.engine.update_settings("randomness_pct", self.random_var.get())
-        success &= self.engine.update_settings("button", self.button_var.get())
+        """Передає поточні значення з GUI у двигун з валідацією та оновлює підписи"""
+        # Один атомарний знімок замість трьох окремих оновлень
+        success = self.engine.update_settings_many({
+            "target_cps": self.cps_var.get(),
+            "randomness_pct": self.random_var.get(),
+            "button": self.button_var.get(),
+        })
         
         if not success:
             # Синхронізуємо GUI назад з engine
@@ -176,6 +322,9 @@ class AutoClickerApp(ctk.CTk):
             self.random_var.set(self.engine.settings["randomness_pct"])
             self.button_var.set(self.engine.settings["button"])
 
+        self.cps_value_label.configure(text=f"{self.cps_var.get():.1f}")
+        self.rand_value_label.configure(text=f"{self.random_var.get():.0f}%")
+
     def toggle_clicking_gui(self):
         """Викликається при натисканні кнопки в GUI або гарячої клавіші"""
         is_active = self.engine.toggle()
@@ -183,6 +332,7 @@ class AutoClickerApp(ctk.CTk):
 
     def update_gui_state(self, is_active):
         """Оновлює вигляд кнопки та статус"""
+        self._shown_active = is_active
         if is_active:
             self.toggle_btn.configure(
                 text=f"СТОП (HotKey: {self.hotkey_char.upper()})", 
@@ -196,21 +346,88 @@ class AutoClickerApp(ctk.CTk):
             )
             self.status_var.set("Статус: НЕАКТИВНО")
 
-    # --- Обробка гарячих клавіш ---
-    def on_hotkey_press(self, key):
+    def _frame_tick(self):
         """
-        Цей метод викликається з потоку pynput.
-        ВАЖЛИВО: Маршалюємо GUI-оновлення в головний потік через .after()
+        Один кадр GUI: застосовує лише останній стан, що накопичився
+        з попереднього кадру (налаштування, профіль, стан двигуна, телеметрія).
+        Помилка кадру логується, а наступний кадр планується завжди -
+        інакше GUI "замерзне" без жодного повідомлення.
         """
         try:
-            if key.char == self.hotkey_char:
-                self.after(GUI_MARSHAL_DELAY, self.toggle_clicking_gui)
-        except AttributeError:
-            pass
+            self._apply_frame()
+        except Exception:
+            log.exception("Помилка кадру GUI")
+        finally:
+            self._frame_job = self.after(GUI_FRAME_MS, self._frame_tick)
+
+    def _apply_frame(self):
+        if not self._initialized:
+            self._initialized = True
+            self._deferred_init()
+
+        name, self._pending_profile = self._pending_profile, None
+        if name is not None:
+            self.profile_var.set(name)
+            self.on_profile_select(name)
+
+        if self._settings_dirty:
+            self._settings_dirty = False
+            self.update_engine_settings()
+
+        # Стан двигуна змінюють гарячі клавіші, API та завершення серій -
+        # кнопку перемальовуємо лише коли він справді змінився
+        is_active = self.engine.is_clicking()
+        if is_active != self._shown_active:
+            self.update_gui_state(is_active)
+
+        self._frame += 1
+        if self._frame % self._telemetry_every == 0:
+            self.poll_telemetry()
+
+    def poll_telemetry(self):
+        """Відображає живі показники двигуна (викликається кадром GUI)"""
+        t = self.engine.get_telemetry()
+        self.telemetry_var.set(
+            f"CPS: {t['cps']:.1f}  |  Джитер: {t['jitter_ms']:.2f} мс\n"
+            f"Кліків: {t['clicks']}  |  Помилок: {t['errors']}  |  "
+            f"{t['backend']}: {t['backend_ms']:.3f} мс"
+            + (f"\nЦіль недосяжна: {t['unreachable']}" if t["unreachable"] else "")
+        )
+
+    # --- Обробка гарячих клавіш ---
+    def on_hotkey_toggle(self):
+        """
+        Обробники дій викликаються з потоку pynput.
+        Двигун thread-safe, тож команда йде в нього одразу; кнопку та статус
+        оновить найближчий кадр GUI - жодних .after() з цього потоку
+        """
+        self.engine.toggle()
+
+    def on_hotkey_start(self):
+        self.engine.start_clicking()
+
+    def on_hotkey_stop(self):
+        self.engine.stop_clicking()
+
+    def on_hotkey_profile(self, name):
+        # Профіль змінює Tk-змінні - застосує кадр GUI (остання назва перемагає)
+        self._pending_profile = name
 
     def on_closing(self):
         """Коректне завершення роботи при закритті вікна"""
-        print("Завершення роботи...")
+        log.info("Завершення роботи...")
+        self.after_cancel(self._frame_job)
         self.engine.stop_engine()
-        self.listener.stop()
+        if self.listener is not None:
+            self.listener.stop()
         self.destroy()
+
+
+def run_app():
+    """Налаштовує вигляд CustomTkinter та запускає головне вікно"""
+    ctk.set_appearance_mode("Dark")  # "System", "Dark", "Light"
+    ctk.set_default_color_theme("blue")  # "blue", "green", "dark-blue"
+
+    app = AutoClickerApp()
+    app.protocol("WM_DELETE_WINDOW", app.on_closing)
+    app.mainloop()